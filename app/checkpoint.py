@@ -0,0 +1,119 @@
+import os
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from .services.blobs import HANDLE_PREFIX
+
+
+# 직렬화된 체크포인트 바이트에서 블롭 핸들("blob:<sha256>")을 찾는 패턴
+_BLOB_HANDLE = re.compile(re.escape(HANDLE_PREFIX.encode()) + rb"([0-9a-f]{64})")
+
+# uuid6 타임스탬프(1582-10-15 기준 100ns 단위) → 유닉스 시간 변환 상수
+_GREGORIAN_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_timestamp(checkpoint_id: str) -> float:
+    """
+    LangGraph checkpoint_id(uuid6)에 들어 있는 생성 시각을 유닉스 시간으로 꺼냅니다.
+    체크포인트 본문을 역직렬화하지 않고도 스레드의 마지막 활동 시각을 알 수 있습니다.
+    """
+    value = uuid.UUID(checkpoint_id).int
+    ticks = ((value >> 96) << 28) | (((value >> 80) & 0xFFFF) << 12) | ((value >> 64) & 0x0FFF)
+    return (ticks - _GREGORIAN_OFFSET) / 1e7
+
+
+@asynccontextmanager
+async def open_sqlite_checkpointer(path: str) -> AsyncIterator[AsyncSqliteSaver]:
+    """SQLite 파일 체크포인터를 열고 테이블을 준비합니다. (이벤트 루프 안에서 호출)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        await saver.setup()
+        yield saver
+
+
+async def prune_checkpoints(
+    saver: AsyncSqliteSaver,
+    max_age: float,
+    max_threads: int,
+    keep_per_thread: int,
+    compact_after: float,
+    now: Optional[float] = None,
+) -> dict:
+    """
+    체크포인트 보존 정책을 적용합니다.
+
+    1. 마지막 활동이 max_age초보다 오래된 스레드 삭제
+    2. 최근 활동 순으로 max_threads개를 넘는 스레드 삭제
+    3. compact_after초 이상 멈춰 있는 스레드는 최신 keep_per_thread개만 남기고
+       중간 체크포인트를 정리 (최신 체크포인트만 있어도 조회/재개 가능)
+
+    반환: {"deleted_threads": n, "compacted_checkpoints": m}
+    """
+    now = now if now is not None else time.time()
+
+    async with saver.lock:
+        conn = saver.conn
+        async with conn.execute(
+            "SELECT thread_id, MAX(checkpoint_id) FROM checkpoints GROUP BY thread_id"
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        # checkpoint_id(uuid6)는 시간순으로 정렬되므로 MAX가 곧 마지막 활동
+        threads = sorted(
+            ((thread_id, checkpoint_timestamp(latest)) for thread_id, latest in rows),
+            key=lambda t: t[1],
+            reverse=True,
+        )
+        expired = {
+            thread_id
+            for rank, (thread_id, last_active) in enumerate(threads)
+            if now - last_active > max_age or rank >= max_threads
+        }
+        for thread_id in expired:
+            await conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            await conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+        compacted = 0
+        for thread_id, last_active in threads:
+            if thread_id in expired or now - last_active < compact_after:
+                continue
+            cursor = await conn.execute(
+                """DELETE FROM checkpoints
+                   WHERE thread_id = ? AND checkpoint_id NOT IN (
+                       SELECT checkpoint_id FROM checkpoints
+                       WHERE thread_id = ? ORDER BY checkpoint_id DESC LIMIT ?
+                   )""",
+                (thread_id, thread_id, keep_per_thread),
+            )
+            compacted += cursor.rowcount
+            await conn.execute(
+                """DELETE FROM writes
+                   WHERE thread_id = ? AND checkpoint_id NOT IN (
+                       SELECT checkpoint_id FROM checkpoints WHERE thread_id = ?
+                   )""",
+                (thread_id, thread_id),
+            )
+
+        await conn.commit()
+
+    return {"deleted_threads": len(expired), "compacted_checkpoints": compacted}
+
+
+async def referenced_blobs(saver: AsyncSqliteSaver) -> set[str]:
+    """
+    남아 있는 체크포인트·대기 쓰기가 참조하는 블롭 digest (블롭 정리의 mark 단계)
+    prune_checkpoints 뒤에 호출하며, 값을 역직렬화하지 않고 바이트에서 핸들만 찾습니다.
+    """
+    digests: set[str] = set()
+    async with saver.lock:
+        for query in ("SELECT checkpoint FROM checkpoints", "SELECT value FROM writes"):
+            async with saver.conn.execute(query) as cursor:
+                async for (value,) in cursor:
+                    if value is None:
+                        continue
+                    data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+                    digests.update(match.decode() for match in _BLOB_HANDLE.findall(data))
+    return digests
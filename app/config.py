@@ -6,15 +6,111 @@ class Settings(BaseSettings):
     google_api_key: str = ""
     gemini_model: str = "gemini-1.5-flash"   # 예: gemini-1.5-flash / gemini-1.5-pro
 
+    # LLM 응답 캐시 (plan / seo / critique / 검색 쿼리 생성)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".data/llm_cache.sqlite"
+    llm_cache_ttl: int = 7 * 24 * 3600      # 초
+    llm_cache_max_entries: int = 5000
+    llm_cache_max_temperature: float = 0.4  # 이 온도를 넘는 호출은 캐시하지 않음
+
+    # LLM 호출 조율 (프로세스 전역)
+    llm_rate_limit_enabled: bool = True
+    llm_requests_per_minute: float = 60     # Gemini RPM 쿼터
+    llm_tokens_per_minute: float = 1_000_000  # Gemini TPM 쿼터
+    llm_output_token_estimate: int = 1024   # 호출 전 TPM 예약에 쓰는 응답 토큰 추정치 (응답 후 실제값으로 보정)
+    llm_initial_concurrency: int = 4        # AIMD 동시 호출 상한 시작값
+    llm_max_concurrency: int = 16           # AIMD 동시 호출 상한 최대값
+    llm_latency_target: float = 30.0        # 응답이 이보다 느리면(초) 동시 호출 상한을 줄임
+    llm_max_retries: int = 4                # 429 재시도 횟수
+    llm_retry_backoff: float = 2.0          # 429 재시도 대기(초), 시도마다 2배
+
+    # RSS 수집
+    rss_concurrent_fetch: bool = True   # True면 모든 피드를 동시에 수집
+    rss_fetch_deadline: float = 15.0    # 전체 수집 마감 시간(초), 넘기면 늦은 피드는 제외
+    rss_feed_timeout: float = 10.0      # 피드 1개당 타임아웃(초)
+    feed_cache_enabled: bool = True     # ETag/Last-Modified 조건부 요청 캐시 사용
+    feed_cache_path: str = ".data/feed_cache.json"
+    rss_max_per_feed: int = 5           # 피드당 최대 아이템 수
+    rss_rank_enabled: bool = True       # True면 로컬 점수(최신성·관심사·출처·교차 피드)로 상위 k개만 프롬프트에 사용
+    rss_top_k: int = 12                 # 주제 선정 프롬프트에 넣을 후보 수
+    rss_recency_half_life: float = 24.0 # 최신성 반감기(시간)
+    rss_interest_keywords: list[str] = [
+        "LLM", "AI agent", "LangGraph", "LangChain", "RAG", "Python", "Gemini", "OpenAI",
+        "에이전트", "생성형 AI", "머신러닝", "개발자",
+    ]
+    rss_source_weights: dict[str, float] = {}   # 출처 이름별 가중치 (기본 1.0), 예: {"카카오 테크블로그": 1.2}
+    dedup_enabled: bool = True          # 이미 다룬 이야기(URL / 비슷한 제목)는 주제 후보에서 제외
+    dedup_path: str = ".data/covered.sqlite"
+    dedup_max_distance: int = 8         # 제목 SimHash 해밍 거리 (64비트 중, 작을수록 엄격)
+    dedup_retention_days: int = 30      # 이 기간이 지나면 같은 이야기도 다시 후보가 됨
+
     # 웹 검색
     tavily_api_key: str = ""
+    search_max_results: int = 3
+    search_cache_enabled: bool = True
+    search_cache_path: str = ".data/search_cache.sqlite"
+    search_cache_ttl: int = 24 * 3600       # 초 (같은 날 검색은 결과 공유)
+    search_cache_max_entries: int = 2000
+
+    # 기획
+    speculative_plan: bool = False  # True면 plan을 리서치 요약과 동시에 원본 검색 결과로 시작 (write 직전 합류)
+
+    # 본문 작성
+    parallel_write: bool = False    # True면 목차의 모든 섹션을 동시에 작성 (Send fan-out)
+    write_concurrency: int = 4      # 병렬 작성 시 동시 LLM 호출 상한
+
+    # 검토
+    critique_mode: str = "single"   # single: 초안 전체를 한 번에 / sectioned: 섹션별 동시 채점 후 합산
+    critique_concurrency: int = 4   # sectioned 모드 동시 LLM 호출 상한
+    critique_max_chars: int = 12000 # single 모드에서 초안이 이보다 길면 섹션별 검토로 전환 (프롬프트 크기 상한)
+    critique_gate: bool = False     # True면 LLM 검토 전에 로컬 규칙(헤딩·분량·키워드·코드 블록)으로 먼저 채점
+    gate_min_section_chars: int = 400
+    gate_fail_score: int = 5        # 로컬 점수가 이보다 낮으면 LLM 없이 바로 revise
+    gate_pass_score: int = 10       # 로컬 점수가 이 이상이면 LLM 검토 생략
+    gate_weight: float = 0.3        # 합산 점수에서 로컬 점수 비중
+
+    # 체크포인트 (세션 State 저장소)
+    checkpointer: str = "sqlite"                # sqlite | memory
+    checkpoint_path: str = ".data/checkpoints.sqlite"
+    checkpoint_max_age_days: float = 7          # 마지막 활동 후 보존 기간
+    checkpoint_max_threads: int = 500           # 보존할 최대 세션 수
+    checkpoint_keep_per_thread: int = 1         # 정리 후 세션당 남길 체크포인트 수
+    checkpoint_compact_after: int = 3600        # 이 시간(초) 이상 멈춘 세션의 중간 체크포인트 정리
+    checkpoint_prune_interval: int = 600        # 정리 주기(초)
+
+    # State 블롭 저장 (큰 텍스트는 파일로, State에는 핸들만)
+    state_blob_mode: bool = False               # True면 섹션·초안·RSS 아이템을 블롭 저장소에 보관
+    blob_path: str = ".data/blobs"
+    blob_min_size: int = 512                    # 이보다 짧은 텍스트는 State에 그대로 저장
+    blob_prune_grace: int = 3600                # 체크포인트가 참조하지 않아도 이 시간(초) 안에 쓰거나 읽은 블롭은 유지
+
+    # 작업 큐
+    job_workers: int = 2            # 동시에 실행되는 파이프라인 수
+    job_queue_size: int = 20        # 대기열 상한 (초과 시 429)
+    job_history_size: int = 200     # 메모리에 보관할 작업 기록 수
+    resume_max_retries: int = 2     # 스케줄러 작업 실패 시 체크포인트에서 자동 재개 횟수
+    resume_backoff: float = 5.0     # 재개 전 대기(초), 시도마다 2배
+
+    # 계측
+    metrics_window: int = 1000      # 노드별 p50/p95 계산에 쓰는 최근 실행 수
 
     # Velog
     velog_access_token: str = ""
+    velog_max_retries: int = 3          # 429 / 5xx / 네트워크 오류 재시도 횟수
+    velog_retry_backoff: float = 1.0    # 재시도 대기(초), 시도마다 2배
+    publish_log_path: str = ".data/publish_log.sqlite"   # 세션별 발행 시도 기록 (중복 발행 방지)
+    publish_outbox: bool = True         # True면 publish는 아웃박스에 적기만 하고 전송은 별도 워커가 처리
+    outbox_path: str = ".data/outbox.sqlite"
+    outbox_rate_per_minute: float = 10  # 분당 최대 전송 수
+    outbox_max_attempts: int = 5        # 이 횟수만큼 실패하면 failed (requeue로 재시도)
+    outbox_backoff: float = 30.0        # 전송 실패 후 재시도 대기(초), 시도마다 2배
+    outbox_poll_interval: float = 2.0   # 대기열이 비었을 때 확인 주기(초)
 
     # 스케줄러
     schedule_hour: int = 9
     schedule_minute: int = 0
+    schedule_batch_size: int = 1    # 1보다 크면 RSS를 한 번 수집해 주제 N개를 동시에 생성
+    batch_max_size: int = 10        # /generate/batch 한 번에 요청할 수 있는 최대 주제 수
     auto_publish: bool = False  # False면 초안만 저장, True면 Velog 자동 발행
 
     class Config:
@@ -0,0 +1,90 @@
+import difflib
+from typing import Optional, TypedDict
+from .services.blobs import astore_text, load_text
+
+
+# ── 구조화된 문서 모델 ───────────────────────────────────────────────────────
+#
+#  글은 State의 sections에 목차 순서대로 "섹션 레코드"로 저장됩니다.
+#  write / revise는 바뀐 섹션 레코드만 돌려주고(merge_sections 리듀서가 index 위치에 반영),
+#  전체 마크다운은 publish에서 render_markdown()으로 한 번만 만듭니다.
+#
+#  레코드에는 직전 본문(history)이 남아 있어 /history에서 섹션별 diff를 보여줄 수 있습니다.
+#  STATE_BLOB_MODE면 body / history는 블롭 핸들입니다.
+#  노드는 aload_sections()로 본문을 먼저 읽어 두고 아래 함수들을 호출합니다. (이벤트 루프에서 파일 I/O 없음)
+#
+class SectionRecord(TypedDict, total=False):
+    index: int
+    heading: str
+    body: str                   # 섹션 마크다운 (## 헤딩 포함)
+    version: int                # 1 = 최초 작성, 수정될 때마다 +1
+    updated_by: str             # write | write_section | revise
+    feedback: Optional[str]     # 마지막 수정에 반영한 critique 피드백
+    history: list[str]          # 직전 본문 (최대 1개)
+
+
+async def section_record(index: int, heading: str, body: str, updated_by: str, feedback: Optional[str] = None) -> dict:
+    """write / revise가 sections 업데이트로 돌려주는 레코드 (블롭 모드면 본문은 스레드에서 저장)"""
+    record = {"index": index, "heading": heading, "body": await astore_text(body), "updated_by": updated_by}
+    if feedback is not None:
+        record["feedback"] = feedback
+    return record
+
+
+def section_body(section) -> str:
+    """섹션 본문 (레코드 / 이전 형식의 문자열 / 블롭 핸들 모두 처리)"""
+    if isinstance(section, dict):
+        return load_text(section.get("body")) or ""
+    return load_text(section) or ""
+
+
+def render_markdown(
+    topic: str,
+    sections: list,
+    references: Optional[list[str]] = None,
+    footer: str = "",
+) -> str:
+    """섹션 레코드를 목차 순서대로 이어 최종 마크다운을 만듭니다. (publish에서 1회)"""
+    parts = [f"# {topic}\n\n", "\n\n---\n\n".join(section_body(s) for s in sections)]
+    if references:
+        parts.append("\n\n---\n\n## 참고\n" + "\n".join(f"- {url}" for url in references[:5]))
+    parts.append(footer)
+    return "".join(parts)
+
+
+def render_preview(topic: str, sections: list, limit: int) -> str:
+    """앞쪽 섹션만 읽어 limit자까지 미리보기 (전체 본문을 조합하지 않음)"""
+    preview = f"# {topic}\n\n"
+    for section in sections:
+        if len(preview) >= limit:
+            break
+        preview += section_body(section) + "\n\n"
+    return preview[:limit]
+
+
+def section_diffs(sections: list) -> list[dict]:
+    """/history용 섹션 요약 + 수정된 섹션의 직전 버전 대비 unified diff"""
+    summaries = []
+    for index, section in enumerate(sections):
+        if not isinstance(section, dict):
+            summaries.append({"index": index, "version": 1, "chars": len(section_body(section))})
+            continue
+        body = section_body(section)
+        history = section.get("history") or []
+        summary = {
+            "index":      index,
+            "heading":    section.get("heading"),
+            "version":    section.get("version", 1),
+            "updated_by": section.get("updated_by"),
+            "chars":      len(body),
+        }
+        if history:
+            summary["feedback"] = section.get("feedback")
+            summary["diff"] = "".join(difflib.unified_diff(
+                load_text(history[-1]).splitlines(keepends=True),
+                body.splitlines(keepends=True),
+                fromfile=f"v{summary['version'] - 1}",
+                tofile=f"v{summary['version']}",
+            ))
+        summaries.append(summary)
+    return summaries
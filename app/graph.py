@@ -1,9 +1,12 @@
+from typing import Optional
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from .state import BlogState
+from .config import settings
+from .metrics import instrument
 from .nodes import (
     collect_and_select_topic,
-    research, plan, write,
+    research, search_sources, summarize_research, reconcile, plan, write, write_section, fan_out_sections,
     seo_optimize, critique, revise, publish,
 )
 
@@ -23,6 +26,7 @@ def quality_router(state: BlogState) -> str:
     """
     품질 점수 7점 이상 또는 2회 수정 완료 → publish
     그 외 → revise
+    (CRITIQUE_GATE=true면 quality_score는 로컬 규칙 점수와 LLM 점수의 합산)
     """
     score = state.get("quality_score") or 0
     revision_count = state.get("revision_count") or 0
@@ -33,18 +37,35 @@ def quality_router(state: BlogState) -> str:
 
 # ── 그래프 구성 ──────────────────────────────────────────────────────────────
 
-def build_graph() -> StateGraph:
+def build_graph(parallel_write: Optional[bool] = None, speculative: Optional[bool] = None) -> StateGraph:
+    """
+    parallel_write=True면 write 루프 대신 섹션을 동시에 작성합니다.
+    speculative=True면 리서치 요약과 plan을 동시에 실행하고 write 직전에 합류합니다.
+    (None이면 PARALLEL_WRITE / SPECULATIVE_PLAN 설정을 따름)
+    """
+    if parallel_write is None:
+        parallel_write = settings.parallel_write
+    if speculative is None:
+        speculative = settings.speculative_plan
+
     graph = StateGraph(BlogState)
 
     # ── 노드 등록 ─────────────────────────────────────────────────
-    graph.add_node("collect",  collect_and_select_topic)
-    graph.add_node("research", research)
-    graph.add_node("plan",     plan)
-    graph.add_node("write",    write)
-    graph.add_node("seo",      seo_optimize)
-    graph.add_node("critique", critique)
-    graph.add_node("revise",   revise)
-    graph.add_node("publish",  publish)
+    graph.add_node("collect",  instrument("collect", collect_and_select_topic))
+    if speculative:
+        graph.add_node("research",  instrument("research", search_sources))
+        graph.add_node("summarize", instrument("summarize", summarize_research))
+        graph.add_node("reconcile", instrument("reconcile", reconcile))
+    else:
+        graph.add_node("research", instrument("research", research))
+    graph.add_node("plan",     instrument("plan", plan))
+    graph.add_node("write",    instrument("write", write))
+    graph.add_node("seo",      instrument("seo", seo_optimize))
+    graph.add_node("critique", instrument("critique", critique))
+    graph.add_node("revise",   instrument("revise", revise))
+    graph.add_node("publish",  instrument("publish", publish))
+    if parallel_write:
+        graph.add_node("write_section", instrument("write_section", write_section))
 
     # ── 엣지 연결 ─────────────────────────────────────────────────
     #
@@ -62,10 +83,25 @@ def build_graph() -> StateGraph:
     #
     graph.set_entry_point("collect")
     graph.add_edge("collect",  "research")
-    graph.add_edge("research", "plan")
-    graph.add_edge("plan",     "write")
 
-    # write 루프: 섹션 완성까지 반복
+    if speculative:
+        # 추측 실행: research(검색) → summarize / plan 동시 → 둘 다 끝나면 reconcile
+        graph.add_edge("research", "summarize")
+        graph.add_edge("research", "plan")
+        graph.add_edge(["summarize", "plan"], "reconcile")
+        before_write = "reconcile"
+    else:
+        graph.add_edge("research", "plan")
+        before_write = "plan"
+
+    if parallel_write:
+        # 병렬 작성: plan → write_section × N (동시) → write(조합) → seo
+        graph.add_conditional_edges(before_write, fan_out_sections, ["write_section", "write"])
+        graph.add_edge("write_section", "write")
+    else:
+        graph.add_edge(before_write, "write")
+
+    # write 루프: 섹션 완성까지 반복 (병렬 모드에서는 바로 seo로 진행)
     graph.add_conditional_edges(
         "write", writing_router,
         {"write_more": "write", "seo": "seo"}
@@ -88,5 +124,10 @@ def build_graph() -> StateGraph:
 
 # ── 컴파일 ───────────────────────────────────────────────────────────────────
 
+# 기본은 메모리 체크포인터. 서버 실행 시에는 lifespan에서 SQLite 체크포인터로 교체됩니다.
+# (CHECKPOINTER=sqlite, app/checkpoint.py)
 checkpointer = MemorySaver()
-agent_app = build_graph().compile(checkpointer=checkpointer)
+# max_concurrency: 한 스텝에서 동시에 실행되는 노드 수 상한 (병렬 섹션 작성 시 LLM 동시 호출 수)
+agent_app = build_graph().compile(checkpointer=checkpointer).with_config(
+    max_concurrency=settings.write_concurrency,
+)
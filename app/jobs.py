@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+
+# ── 우선순위 (작을수록 먼저 실행) ────────────────────────────────────────────
+PRIORITY_SCHEDULER = 0    # 스케줄러 작업
+PRIORITY_ADHOC = 10       # API로 들어온 임시 작업
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class Job:
+    """큐에 들어간 파이프라인 실행 1건"""
+    id: str
+    session_id: str
+    topic: Optional[str]
+    priority: int
+    topic_reason: Optional[str] = None  # 배치 생성에서 미리 선정한 주제의 선정 이유
+    source_item: Optional[dict] = None  # 배치 생성에서 주제의 원본 RSS 아이템
+    resume: bool = False                # True면 세션의 마지막 체크포인트부터 이어서 실행
+    max_retries: int = 0                # 실패 시 자동 재개 횟수
+    status: str = "queued"              # queued → running → done | failed
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[dict] = None       # 완료 시 최종 State
+    error: Optional[str] = None
+    events: list[dict] = field(default_factory=list)   # 진행 이벤트 (SSE로 전달)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _subscribers: list[asyncio.Queue] = field(default_factory=list, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def publish(self, event: dict, persist: bool = True) -> None:
+        """
+        진행 이벤트를 구독자에게 전달합니다.
+        persist=False(토큰 이벤트 등)면 기록하지 않고 지금 보고 있는 구독자에게만 보냅니다.
+        """
+        if persist:
+            self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def _finish(self) -> None:
+        self._done.set()
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    def summary(self) -> dict:
+        return {
+            "job_id":      self.id,
+            "session_id":  self.session_id,
+            "topic":       self.topic,
+            "status":      self.status,
+            "priority":    self.priority,
+            "resume":      self.resume,
+            "created_at":  self.created_at,
+            "started_at":  self.started_at,
+            "finished_at": self.finished_at,
+            "error":       self.error,
+        }
+
+
+class JobQueue:
+    """
+    인메모리 우선순위 큐 + 고정 크기 워커 풀
+
+    - 동시에 실행되는 파이프라인은 최대 workers개
+    - 대기열이 max_size를 넘으면 asyncio.QueueFull (API에서는 429로 응답)
+    - 스케줄러 작업(PRIORITY_SCHEDULER)은 임시 작업보다 먼저 꺼내짐
+    - 세션별 대기·실행 중인 작업을 기억 (같은 체크포인트 스레드에 그래프 실행이 겹치지 않도록)
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], Awaitable[dict]],
+        workers: int,
+        max_size: int,
+        history_size: int = 200,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.history_size = history_size
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=max_size)
+        self._seq = itertools.count()       # 같은 우선순위는 들어온 순서대로
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._active: dict[str, Job] = {}   # session_id → 대기·실행 중인 작업
+        self._tasks: list[asyncio.Task] = []
+
+    # ── 수명 주기 ─────────────────────────────────────────────────
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ── 제출 / 조회 ───────────────────────────────────────────────
+    async def submit(
+        self,
+        topic: Optional[str] = None,
+        session_id: Optional[str] = None,
+        priority: int = PRIORITY_ADHOC,
+        block: bool = False,
+        resume: bool = False,
+        max_retries: int = 0,
+        topic_reason: Optional[str] = None,
+        source_item: Optional[dict] = None,
+    ) -> Job:
+        """
+        작업을 큐에 넣습니다.
+        block=False면 큐가 가득 찼을 때 즉시 asyncio.QueueFull을 던지고,
+        block=True면 자리가 날 때까지 기다립니다. (스케줄러용)
+        """
+        job = Job(
+            id=str(uuid.uuid4()),
+            session_id=session_id or str(uuid.uuid4()),
+            topic=topic,
+            topic_reason=topic_reason,
+            source_item=source_item,
+            priority=priority,
+            resume=resume,
+            max_retries=max_retries,
+        )
+        item = (priority, next(self._seq), job)
+        if block:
+            await self._queue.put(item)
+        else:
+            self._queue.put_nowait(item)
+        self._remember(job)
+        self._active[job.session_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active(self, session_id: str) -> Optional[Job]:
+        """세션의 대기 중이거나 실행 중인 작업 (없으면 None)"""
+        return self._active.get(session_id)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def wait(self, job: Job) -> Job:
+        """작업이 끝날 때까지 기다립니다."""
+        await job._done.wait()
+        return job
+
+    async def watch(self, job: Job) -> AsyncIterator[dict]:
+        """지금까지 기록된 이벤트와 이후 새 이벤트를 작업이 끝날 때까지 순서대로 내보냅니다."""
+        backlog = list(job.events)
+        if job.finished:
+            for event in backlog:
+                yield event
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        job._subscribers.append(queue)
+        try:
+            for event in backlog:
+                yield event
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            job._subscribers.remove(queue)
+
+    # ── 내부 ──────────────────────────────────────────────────────
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        # 끝난 작업부터 오래된 순으로 정리해 메모리 사용량을 제한
+        while len(self._jobs) > self.history_size:
+            oldest = next((j for j in self._jobs.values() if j.finished), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.id]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = "running"
+            job.started_at = _now()
+            try:
+                job.result = await self.runner(job)
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = _now()
+                if self._active.get(job.session_id) is job:
+                    del self._active[job.session_id]
+                job._finish()
+                self._queue.task_done()
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Callable, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from .config import settings
+from .services.cache import SQLiteCache
+from .metrics import record_cache_hit, record_llm_call, record_retry
+from .ratelimit import LLMRateLimiter, is_rate_limited, is_transient
+
+
+# ── LLM 클라이언트 레지스트리 ────────────────────────────────────────────────
+#
+#  노드 모듈을 import할 때는 아무 것도 만들지 않고, 첫 호출 시점에 생성합니다.
+#  모델별로 클라이언트(=HTTP 커넥션 풀)는 하나만 만들고,
+#  temperature만 다른 인스턴스는 그 클라이언트를 공유하는 얕은 복사본입니다.
+#
+_base_clients: dict[str, BaseChatModel] = {}
+_clients: dict[tuple[str, float], BaseChatModel] = {}
+_lock = threading.Lock()
+
+
+def _build_client(model: str) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=settings.google_api_key or None,   # 비어 있으면 GOOGLE_API_KEY 환경변수 사용
+        # 호출 조율기를 쓰면 SDK 재시도를 끄고 _invoke()가 직접 재시도
+        # (429는 동시 호출 상한을 줄이고, 5xx·타임아웃은 상한을 그대로 두고 백오프)
+        max_retries=0 if settings.llm_rate_limit_enabled else 6,
+    )
+
+
+_factory: Callable[[str], BaseChatModel] = _build_client
+
+
+def set_llm_factory(factory: Optional[Callable[[str], BaseChatModel]] = None) -> None:
+    """
+    모델 이름 → 클라이언트를 만드는 함수를 교체합니다. (벤치마크 / 오프라인 테스트용)
+    None이면 기본 Gemini 클라이언트로 되돌립니다.
+    """
+    global _factory
+    _factory = factory or _build_client
+    reset_llms()
+
+
+def get_llm(temperature: float, model: Optional[str] = None) -> BaseChatModel:
+    """(model, temperature)별 LLM 인스턴스를 반환합니다. 없으면 이때 생성합니다."""
+    model = model or settings.gemini_model
+    key = (model, temperature)
+
+    llm = _clients.get(key)
+    if llm is not None:
+        return llm
+
+    with _lock:
+        if key not in _clients:
+            if model not in _base_clients:
+                _base_clients[model] = _factory(model)
+            _clients[key] = _base_clients[model].model_copy(update={"temperature": temperature})
+        return _clients[key]
+
+
+def reset_llms() -> None:
+    """레지스트리를 비웁니다. (설정 변경 후 재생성 / 테스트용)"""
+    with _lock:
+        _base_clients.clear()
+        _clients.clear()
+
+
+# ── 응답 캐시 ────────────────────────────────────────────────────────────────
+#
+#  같은 (model, temperature, prompt)면 같은 결과를 기대하는 단계(plan, seo, critique,
+#  research 쿼리 생성)의 응답을 저장해 재실행 시 Gemini 호출을 건너뜁니다.
+#  LLM_CACHE_MAX_TEMPERATURE보다 높은 온도(창작 단계)는 항상 새로 호출합니다.
+#
+llm_cache = SQLiteCache(
+    settings.llm_cache_path,
+    ttl=settings.llm_cache_ttl,
+    max_entries=settings.llm_cache_max_entries,
+) if settings.llm_cache_enabled else None
+
+
+# ── 호출 조율 (RPM / TPM 토큰 버킷 + AIMD 동시 호출 상한) ────────────────────
+rate_limiter = LLMRateLimiter(
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    initial_concurrency=settings.llm_initial_concurrency,
+    max_concurrency=settings.llm_max_concurrency,
+    latency_target=settings.llm_latency_target,
+) if settings.llm_rate_limit_enabled else None
+
+
+def _estimate_tokens(prompt: str) -> int:
+    # 한국어·영어가 섞인 프롬프트는 대략 3글자당 1토큰
+    return len(prompt) // 3 + settings.llm_output_token_estimate
+
+
+async def _invoke(llm: BaseChatModel, prompt: str, config: Optional[dict]):
+    """
+    rate_limiter 자리를 받아 호출합니다.
+    429와 일시적 오류(5xx·타임아웃)는 백오프 후 다시 줄을 섭니다. (상한 축소는 429만)
+    """
+    if rate_limiter is None:
+        return await llm.ainvoke([HumanMessage(content=prompt)], config=config)
+
+    estimate = _estimate_tokens(prompt)
+    attempt = 0
+    while True:
+        started = await rate_limiter.acquire(estimate)
+        try:
+            response = await llm.ainvoke([HumanMessage(content=prompt)], config=config)
+        except asyncio.CancelledError:
+            await rate_limiter.release(started, estimate, failed=True)
+            raise
+        except Exception as e:
+            throttled = is_rate_limited(e)
+            transient = not throttled and is_transient(e)
+            await rate_limiter.release(started, estimate, throttled=throttled, failed=not throttled)
+            if not (throttled or transient) or attempt >= settings.llm_max_retries:
+                raise
+            attempt += 1
+            record_retry()
+            await asyncio.sleep(settings.llm_retry_backoff * 2 ** (attempt - 1))
+            continue
+
+        usage = getattr(response, "usage_metadata", None)
+        used = usage.get("total_tokens") if isinstance(usage, dict) else None
+        await rate_limiter.release(started, estimate, used_tokens=used)
+        return response
+
+
+def _cache_key(model: str, temperature: float, prompt: str) -> str:
+    raw = json.dumps([model, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def complete(
+    prompt: str,
+    temperature: float,
+    model: Optional[str] = None,
+    cache: bool = False,
+    metadata: Optional[dict] = None,
+) -> str:
+    """
+    프롬프트 1개를 LLM에 보내고 응답 텍스트를 반환합니다.
+    cache=True면 응답 캐시를 먼저 확인합니다. (온도가 상한을 넘으면 무시)
+    metadata는 스트리밍 토큰 이벤트에 함께 실립니다. (예: section_index)
+    """
+    model = model or settings.gemini_model
+    use_cache = (
+        cache
+        and llm_cache is not None
+        and temperature <= settings.llm_cache_max_temperature
+    )
+
+    if use_cache:
+        key = _cache_key(model, temperature, prompt)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            record_cache_hit()
+            return cached
+
+    config = {"metadata": metadata} if metadata else None
+    response = await _invoke(get_llm(temperature, model), prompt, config)
+    content = response.content
+    record_llm_call(getattr(response, "usage_metadata", None))
+
+    if use_cache:
+        llm_cache.set(key, content)
+    return content
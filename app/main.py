@@ -1,15 +1,26 @@
+import asyncio
 import uuid
 import json
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from pydantic import BaseModel
 from typing import Optional
 
 from .graph import agent_app
 from .config import settings
+from .llm import llm_cache, rate_limiter as llm_rate_limiter
+from .metrics import registry as metrics_registry
+from .checkpoint import open_sqlite_checkpointer, prune_checkpoints, referenced_blobs
+from .jobs import Job, JobQueue, PRIORITY_ADHOC, PRIORITY_SCHEDULER
+from .nodes.n1_collect import gather_rss_items, select_topics
+from .services.velog import publisher as velog_publisher
+from .services.outbox import OutboxDelivery, outbox
+from .services.blobs import blob_store, resolve_state
+from .document import section_diffs
 
 
 # ── 스케줄러 ─────────────────────────────────────────────────────────────────
@@ -23,54 +34,266 @@ def get_initial_state(topic: Optional[str] = None) -> dict:
         "rss_items":        [],
         "topic":            topic or "",      # 빈 문자열이면 RSS에서 자동 선정
         "topic_reason":     "",
+        "source_item":      None,
         "research_results": [],
         "references":       [],
+        "search_hits":      [],
         "outline":          [],
         "seo_keywords":     [],
         "sections":         [],
-        "draft":            None,
         "seo_title":        None,
         "meta_description": None,
         "velog_tags":       [],
         "critique":         None,
+        "section_feedback": [],
         "quality_score":    None,
         "revision_count":   0,
         "final_draft":      None,
         "velog_url":        None,
         "is_published":     False,
+        "outbox_id":        None,
         "logs":             [],
+        "spans":            [],
     }
 
 
+# 토큰 단위로 본문을 스트리밍하는 노드 (나머지는 JSON 응답이라 토큰을 보내지 않음)
+TOKEN_STREAM_NODES = {"write", "write_section", "revise"}
+
+
+def _token_event(message, metadata: dict) -> Optional[dict]:
+    """LLM 토큰 청크 → SSE token 이벤트 (본문 노드가 아니거나 빈 청크면 None)"""
+    node_name = metadata.get("langgraph_node")
+    if node_name not in TOKEN_STREAM_NODES or not message.content:
+        return None
+    return {
+        "event":         "token",
+        "node":          node_name,
+        "section_index": metadata.get("section_index"),
+        "content":       message.content,
+    }
+
+
+def _node_event(node_name: str, output: dict) -> dict:
+    """노드 완료 이벤트 (SSE / 작업 상태 조회 공통 형식)"""
+    output = output or {}
+    payload = {
+        "event": "node_complete",
+        "node":  node_name,
+        "logs":  output.get("logs") or [],
+    }
+    if node_name == "publish":
+        payload["velog_url"]   = output.get("velog_url")
+        payload["is_published"] = output.get("is_published")
+    return payload
+
+
+async def run_pipeline(job: Job) -> dict:
+    """
+    워커가 작업 1건을 실행합니다. 노드가 끝날 때마다 작업 이벤트를 남깁니다.
+
+    - job.resume=True면 처음부터가 아니라 마지막 체크포인트부터 이어서 실행
+    - 노드가 실패하면 job.max_retries번까지 마지막 체크포인트에서 자동 재개
+      (이미 끝난 노드는 다시 실행하지 않으므로 실패한 노드 비용만 다시 듬)
+    """
+    config = {"configurable": {"thread_id": job.session_id}}
+    graph_input = None if job.resume else get_initial_state(job.topic)
+    if graph_input is not None:
+        if job.topic_reason:
+            graph_input["topic_reason"] = job.topic_reason     # 배치에서 미리 선정한 주제
+        if job.source_item:
+            graph_input["source_item"] = job.source_item       # 전달 후 "다룬 이야기"로 기록할 원본
+    attempt = 0
+
+    while True:
+        try:
+            async for mode, chunk in agent_app.astream(
+                graph_input, config=config, stream_mode=["updates", "messages"],
+            ):
+                if mode == "messages":
+                    # 토큰은 기록하지 않고 지금 보고 있는 클라이언트에게만 전달
+                    event = _token_event(*chunk)
+                    if event:
+                        job.publish(event, persist=False)
+                    continue
+                for node_name, output in chunk.items():
+                    job.publish(_node_event(node_name, output))
+            break
+        except Exception as e:
+            if attempt >= job.max_retries:
+                raise
+            attempt += 1
+            state = await agent_app.aget_state(config)
+            for node_name in state.next:
+                metrics_registry.inc("resumes", node_name)
+            job.publish({
+                "event":   "resume",
+                "attempt": attempt,
+                "next":    list(state.next),
+                "error":   str(e),
+            })
+            await asyncio.sleep(settings.resume_backoff * 2 ** (attempt - 1))
+            graph_input = None
+
+    state = await agent_app.aget_state(config)
+    return state.values
+
+
+# 동시에 도는 파이프라인 수를 워커 수로 제한 (Gemini 쿼터 / 메모리 보호)
+job_queue = JobQueue(
+    run_pipeline,
+    workers=settings.job_workers,
+    max_size=settings.job_queue_size,
+    history_size=settings.job_history_size,
+)
+
+
+# 아웃박스 전송 워커 (생성 파이프라인과 별개로 Velog에 발행)
+outbox_delivery = OutboxDelivery(
+    outbox,
+    velog_publisher,
+    rate_per_minute=settings.outbox_rate_per_minute,
+    max_attempts=settings.outbox_max_attempts,
+    backoff=settings.outbox_backoff,
+    poll_interval=settings.outbox_poll_interval,
+)
+
+
+async def _submit(topic: Optional[str], session_id: Optional[str], resume: bool = False) -> Job:
+    """임시 작업 제출. 대기열이 가득 차면 429"""
+    try:
+        return await job_queue.submit(
+            topic=topic, session_id=session_id, priority=PRIORITY_ADHOC, resume=resume,
+        )
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요.")
+
+
+async def submit_batch(count: int, priority: int = PRIORITY_ADHOC, block: bool = False, max_retries: int = 0) -> list[Job]:
+    """
+    배치 생성: RSS를 한 번만 수집하고 LLM 호출 1번으로 서로 다른 주제 count개를 골라
+    각각을 작업으로 제출합니다.
+
+    - 동시 실행은 작업 큐 워커 수(JOB_WORKERS)로 함께 제한
+    - 겹치는 검색 쿼리는 검색 캐시 / 진행 중 검색 공유로 한 번만 호출
+    - block=False면 대기열이 모자랄 때 asyncio.QueueFull (이미 제출된 작업은 그대로 진행)
+    """
+    rss_items, late_logs = await gather_rss_items()
+    for log in late_logs:
+        print(log)
+    topics = await select_topics(rss_items, count)
+    print(f"📰 [Batch] RSS {len(rss_items)}개 수집 → 주제 {len(topics)}개 선정")
+
+    jobs = []
+    for picked in topics:
+        jobs.append(await job_queue.submit(
+            topic=picked["topic"],
+            topic_reason=picked["reason"],
+            source_item=picked["source"],
+            session_id=f"batch-{uuid.uuid4()}",
+            priority=priority,
+            block=block,
+            max_retries=max_retries,
+        ))
+    return jobs
+
+
 async def run_daily_job():
     """APScheduler가 매일 자동 실행하는 태스크"""
     print("🕘 [Scheduler] 일일 블로그 자동 생성 시작")
-    session_id = f"daily-{uuid.uuid4()}"
-    config = {"configurable": {"thread_id": session_id}}
-    try:
-        # topic을 비워두면 RSS에서 자동 선정
-        result = agent_app.invoke(get_initial_state(), config=config)
-        url = result.get("velog_url") or "초안 저장됨"
+    if settings.schedule_batch_size > 1:
+        await run_daily_batch()
+        return
+    # topic을 비워두면 RSS에서 자동 선정. 스케줄러 작업은 우선순위가 높고 대기열이 차도 버려지지 않음
+    job = await job_queue.submit(
+        session_id=f"daily-{uuid.uuid4()}",
+        priority=PRIORITY_SCHEDULER,
+        block=True,
+        max_retries=settings.resume_max_retries,
+    )
+    await job_queue.wait(job)
+    if job.status == "done":
+        url = job.result.get("velog_url") or "초안 저장됨"
         print(f"✅ [Scheduler] 완료 → {url}")
+    else:
+        print(f"❌ [Scheduler] 실패: {job.error}")
+
+
+async def run_daily_batch():
+    """SCHEDULE_BATCH_SIZE개의 글을 한 번의 RSS 수집으로 생성"""
+    jobs = await submit_batch(
+        settings.schedule_batch_size,
+        priority=PRIORITY_SCHEDULER,
+        block=True,
+        max_retries=settings.resume_max_retries,
+    )
+    for job in jobs:
+        await job_queue.wait(job)
+        if job.status == "done":
+            url = job.result.get("velog_url") or "초안 저장됨"
+            print(f"✅ [Scheduler] '{job.topic}' 완료 → {url}")
+        else:
+            print(f"❌ [Scheduler] '{job.topic}' 실패: {job.error}")
+
+
+async def run_checkpoint_maintenance(saver):
+    """오래된 세션 삭제 + 중간 체크포인트 정리 (주기 실행)"""
+    try:
+        result = await prune_checkpoints(
+            saver,
+            max_age=settings.checkpoint_max_age_days * 24 * 3600,
+            max_threads=settings.checkpoint_max_threads,
+            keep_per_thread=settings.checkpoint_keep_per_thread,
+            compact_after=settings.checkpoint_compact_after,
+        )
+        if result["deleted_threads"] or result["compacted_checkpoints"]:
+            print(f"🧹 [Checkpoint] 세션 {result['deleted_threads']}개 삭제, "
+                  f"체크포인트 {result['compacted_checkpoints']}개 정리")
+        # 블롭은 남은 체크포인트가 하나도 참조하지 않을 때만 삭제 (mark & sweep)
+        # → 중단·재개 대기 세션이나 /history가 읽는 블롭은 세션이 살아 있는 동안 유지
+        if settings.state_blob_mode:
+            referenced = await referenced_blobs(saver)
+            removed = await asyncio.to_thread(blob_store.prune, referenced, settings.blob_prune_grace)
+            if removed:
+                print(f"🧹 [Blob] 오래된 블롭 {removed}개 삭제")
     except Exception as e:
-        print(f"❌ [Scheduler] 실패: {e}")
+        print(f"❌ [Checkpoint] 정리 실패: {e}")
 
 
 # ── FastAPI 앱 ───────────────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 서버 시작 시 스케줄러 등록
-    scheduler.add_job(
-        run_daily_job,
-        CronTrigger(hour=settings.schedule_hour, minute=settings.schedule_minute),
-        id="daily_blog_job",
-        replace_existing=True,
-    )
-    scheduler.start()
-    print(f"⏰ 스케줄러 시작: 매일 {settings.schedule_hour:02d}:{settings.schedule_minute:02d} 자동 실행")
-    yield
-    scheduler.shutdown()
+    async with AsyncExitStack() as stack:
+        # 체크포인터: sqlite면 재시작 후에도 세션 유지 (memory는 프로세스 메모리에만 보관)
+        if settings.checkpointer == "sqlite":
+            saver = await stack.enter_async_context(open_sqlite_checkpointer(settings.checkpoint_path))
+            agent_app.checkpointer = saver
+            scheduler.add_job(
+                run_checkpoint_maintenance,
+                IntervalTrigger(seconds=settings.checkpoint_prune_interval),
+                args=[saver],
+                id="checkpoint_maintenance",
+                replace_existing=True,
+            )
+
+        # 서버 시작 시 스케줄러 등록
+        scheduler.add_job(
+            run_daily_job,
+            CronTrigger(hour=settings.schedule_hour, minute=settings.schedule_minute),
+            id="daily_blog_job",
+            replace_existing=True,
+        )
+        scheduler.start()
+        job_queue.start()
+        if settings.auto_publish and settings.publish_outbox:
+            outbox_delivery.start()
+        print(f"⏰ 스케줄러 시작: 매일 {settings.schedule_hour:02d}:{settings.schedule_minute:02d} 자동 실행")
+        yield
+        scheduler.shutdown()
+        await job_queue.stop()
+        await outbox_delivery.stop()
+        await velog_publisher.aclose()
 
 
 app = FastAPI(
@@ -88,6 +311,10 @@ class GenerateRequest(BaseModel):
     session_id: Optional[str] = None
 
 
+class BatchRequest(BaseModel):
+    count: int = 3                # 생성할 글 수 (최대 BATCH_MAX_SIZE)
+
+
 class GenerateResponse(BaseModel):
     session_id: str
     topic: str
@@ -101,6 +328,50 @@ class GenerateResponse(BaseModel):
     logs: list[str]
 
 
+async def _to_response(session_id: str, result: dict) -> GenerateResponse:
+    # 블롭 모드에서는 핸들을 원래 내용으로 바꿔서 응답 (파일 읽기는 스레드에서)
+    result = await asyncio.to_thread(resolve_state, result)
+    return GenerateResponse(
+        session_id=session_id,
+        topic=result.get("topic", ""),
+        seo_title=result.get("seo_title") or result.get("topic", ""),
+        velog_tags=result.get("velog_tags") or [],
+        quality_score=result.get("quality_score") or 0,
+        revision_count=result.get("revision_count") or 0,
+        velog_url=result.get("velog_url"),
+        is_published=result.get("is_published", False),
+        final_draft=result.get("final_draft") or "",
+        logs=result.get("logs") or [],
+    )
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def _job_event_stream(job: Job):
+    """작업 이벤트를 SSE로 흘려보냅니다. (/stream, /jobs/{job_id}/stream 공통)"""
+    yield _sse({"event": "start", "session_id": job.session_id, "job_id": job.id})
+    async for event in job_queue.watch(job):
+        yield _sse(event)
+    if job.status == "done":
+        yield _sse({"event": "done"})
+    else:
+        yield _sse({"event": "error", "message": job.error})
+
+
+async def _outbox_delivery(session_id: str) -> Optional[dict]:
+    # PUBLISH_OUTBOX=false면 조회만으로 아웃박스 파일을 만들지 않음
+    if not settings.publish_outbox:
+        return None
+    return await asyncio.to_thread(outbox.get_by_session, session_id)
+
+
+def _require_outbox() -> None:
+    if not settings.publish_outbox:
+        raise HTTPException(status_code=404, detail="아웃박스를 사용하지 않습니다. (PUBLISH_OUTBOX=false)")
+
+
 # ── 엔드포인트 ────────────────────────────────────────────────────────────────
 
 @app.get("/health", tags=["System"])
@@ -109,6 +380,9 @@ async def health():
         "status": "ok",
         "gemini_model":  settings.gemini_model,
         "auto_publish":  settings.auto_publish,
+        "queued_jobs":   job_queue.pending,
+        "llm_cache":     llm_cache.stats() if llm_cache else None,
+        "llm_limiter":   llm_rate_limiter.stats() if llm_rate_limiter else None,
         "schedule":      f"매일 {settings.schedule_hour:02d}:{settings.schedule_minute:02d}",
     }
 
@@ -120,56 +394,74 @@ async def generate(req: GenerateRequest):
     - topic 미입력 → RSS에서 오늘의 트렌드 주제 자동 선정
     - topic 입력   → 해당 주제로 생성
     """
-    session_id = req.session_id or str(uuid.uuid4())
-    config = {"configurable": {"thread_id": session_id}}
+    job = await _submit(req.topic, req.session_id)
+    await job_queue.wait(job)
+    if job.status != "done":
+        raise HTTPException(status_code=500, detail=job.error)
 
-    try:
-        result = agent_app.invoke(get_initial_state(req.topic), config=config)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _to_response(job.session_id, job.result)
 
-    return GenerateResponse(
-        session_id=session_id,
-        topic=result.get("topic", ""),
-        seo_title=result.get("seo_title") or result.get("topic", ""),
-        velog_tags=result.get("velog_tags") or [],
-        quality_score=result.get("quality_score") or 0,
-        revision_count=result.get("revision_count") or 0,
-        velog_url=result.get("velog_url"),
-        is_published=result.get("is_published", False),
-        final_draft=result.get("final_draft") or "",
-        logs=result.get("logs") or [],
-    )
+
+@app.post("/generate/batch", status_code=202, tags=["Agent"])
+async def generate_batch(req: BatchRequest):
+    """
+    RSS를 한 번 수집해 서로 다른 주제 count개를 선정하고 각각 작업으로 제출합니다.
+    진행 상황은 /jobs/{job_id}, /jobs/{job_id}/stream으로 확인합니다.
+    """
+    if not 1 <= req.count <= settings.batch_max_size:
+        raise HTTPException(status_code=422, detail=f"count는 1~{settings.batch_max_size} 사이여야 합니다.")
+    if job_queue.pending + req.count > settings.job_queue_size:
+        raise HTTPException(status_code=429, detail="대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요.")
+
+    try:
+        jobs = await submit_batch(req.count)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요.")
+    return {"jobs": [job.summary() for job in jobs]}
 
 
 @app.post("/stream", tags=["Agent"])
 async def stream(req: GenerateRequest):
     """
     생성 과정을 SSE로 실시간 스트리밍합니다.
-    각 노드 완료 시마다 이벤트를 전송합니다.
+    - node_complete: 각 노드 완료 시
+    - token:         write / revise 본문이 생성되는 대로 (section_index 포함)
     """
-    session_id = req.session_id or str(uuid.uuid4())
-    config = {"configurable": {"thread_id": session_id}}
+    job = await _submit(req.topic, req.session_id)
+    return StreamingResponse(_job_event_stream(job), media_type="text/event-stream")
 
-    def event_stream():
-        yield f"data: {json.dumps({'event': 'start', 'session_id': session_id}, ensure_ascii=False)}\n\n"
-        try:
-            for event in agent_app.stream(get_initial_state(req.topic), config=config):
-                for node_name, output in event.items():
-                    payload = {
-                        "event": "node_complete",
-                        "node":  node_name,
-                        "logs":  output.get("logs") or [],
-                    }
-                    if node_name == "publish":
-                        payload["velog_url"]   = output.get("velog_url")
-                        payload["is_published"] = output.get("is_published")
-                    yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
-            yield f"data: {json.dumps({'event': 'done'}, ensure_ascii=False)}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'event': 'error', 'message': str(e)}, ensure_ascii=False)}\n\n"
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+# ── 작업 큐 ──────────────────────────────────────────────────────────────────
+
+@app.post("/jobs", status_code=202, tags=["Jobs"])
+async def submit_job(req: GenerateRequest):
+    """
+    생성 작업을 큐에 넣고 바로 job_id를 반환합니다.
+    진행 상황은 /jobs/{job_id} 또는 /jobs/{job_id}/stream으로 확인합니다.
+    """
+    job = await _submit(req.topic, req.session_id)
+    return {**job.summary(), "queued_jobs": job_queue.pending}   # 이 작업을 포함한 전체 대기 작업 수 (순번 아님)
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str):
+    """작업 상태를 조회합니다. 완료된 작업은 결과를 함께 반환합니다."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    body = {**job.summary(), "events": job.events}
+    if job.status == "done":
+        body["result"] = (await _to_response(job.session_id, job.result)).model_dump()
+    return body
+
+
+@app.get("/jobs/{job_id}/stream", tags=["Jobs"])
+async def stream_job(job_id: str):
+    """작업 진행 이벤트를 SSE로 스트리밍합니다. (이미 지난 이벤트부터 다시 전송)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return StreamingResponse(_job_event_stream(job), media_type="text/event-stream")
 
 
 @app.get("/history/{session_id}", tags=["Agent"])
@@ -177,10 +469,10 @@ async def history(session_id: str):
     """이전 생성 세션의 State를 조회합니다."""
     config = {"configurable": {"thread_id": session_id}}
     try:
-        state = agent_app.get_state(config)
+        state = await agent_app.aget_state(config)
         if not state.values:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-        v = state.values
+        v = await asyncio.to_thread(resolve_state, state.values)
         return {
             "session_id":     session_id,
             "topic":          v.get("topic"),
@@ -190,7 +482,11 @@ async def history(session_id: str):
             "revision_count": v.get("revision_count"),
             "velog_url":      v.get("velog_url"),
             "is_published":   v.get("is_published"),
+            "delivery":       await _outbox_delivery(session_id),
+            "sections":       section_diffs(v.get("sections") or []),   # 섹션별 버전 / 직전 버전 대비 diff
             "logs":           v.get("logs"),
+            "next":           list(state.next),     # 비어 있지 않으면 중단된 세션 (/resume 가능)
+            "spans":          v.get("spans"),
         }
     except HTTPException:
         raise
@@ -198,6 +494,83 @@ async def history(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/resume/{session_id}", response_model=GenerateResponse, tags=["Agent"])
+async def resume(session_id: str):
+    """
+    실패로 중단된 세션을 마지막 체크포인트부터 이어서 실행합니다.
+    이미 끝난 노드(리서치, 기획, 작성된 섹션 등)는 다시 실행하지 않습니다.
+    대기 중이거나 실행 중인 세션은 409와 함께 그 작업을 돌려줍니다. (/jobs/{job_id}로 확인)
+    """
+    active = job_queue.active(session_id)
+    if active is not None:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "이미 대기 중이거나 실행 중인 세션입니다.", **active.summary()},
+        )
+
+    state = await agent_app.aget_state({"configurable": {"thread_id": session_id}})
+    if not state.values:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    if not state.next:
+        raise HTTPException(status_code=409, detail="이미 완료된 세션입니다.")
+
+    job = await _submit(None, session_id, resume=True)
+    await job_queue.wait(job)
+    if job.status != "done":
+        raise HTTPException(status_code=500, detail=job.error)
+
+    return await _to_response(job.session_id, job.result)
+
+
+@app.get("/outbox", tags=["Outbox"])
+async def list_outbox(status: Optional[str] = None, limit: int = 50):
+    """아웃박스 항목을 조회합니다. (status: queued | sending | delivered | failed)"""
+    _require_outbox()
+    return {
+        "counts":  await asyncio.to_thread(outbox.counts),
+        "entries": await asyncio.to_thread(outbox.list, status, min(limit, 500)),
+    }
+
+
+@app.post("/outbox/{entry_id}/requeue", tags=["Outbox"])
+async def requeue_outbox(entry_id: str):
+    """실패한 전송을 시도 횟수를 초기화해 즉시 다시 보냅니다."""
+    _require_outbox()
+    entry = await asyncio.to_thread(outbox.get, entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="아웃박스 항목을 찾을 수 없습니다.")
+    if entry["status"] in ("delivered", "sending"):
+        raise HTTPException(status_code=409, detail=f"이미 {entry['status']} 상태입니다.")
+
+    entry = await asyncio.to_thread(outbox.requeue, entry_id)
+    outbox_delivery.notify()
+    return entry
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+async def metrics():
+    """노드별 지연(히스토그램, p50/p95), LLM 호출·토큰·캐시·재시도 카운터 (Prometheus 포맷)"""
+    body = metrics_registry.render()
+    body += (
+        "# TYPE velog_job_queue_pending gauge\n"
+        f"velog_job_queue_pending {job_queue.pending}\n"
+    )
+    if settings.publish_outbox:
+        body += "# TYPE velog_outbox_entries gauge\n"
+        for status, count in sorted((await asyncio.to_thread(outbox.counts)).items()):
+            body += f'velog_outbox_entries{{status="{status}"}} {count}\n'
+    if llm_rate_limiter is not None:
+        stats = llm_rate_limiter.stats()
+        body += (
+            "# TYPE velog_llm_concurrency_limit gauge\n"
+            f"velog_llm_concurrency_limit {stats['concurrency_limit']}\n"
+            "# TYPE velog_llm_waiting gauge\n"
+            f"velog_llm_waiting {stats['waiting']}\n"
+        )
+
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
 @app.post("/schedule/trigger", tags=["System"])
 async def manual_trigger():
     """스케줄러를 수동으로 즉시 실행합니다."""
@@ -0,0 +1,187 @@
+import contextvars
+import functools
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Optional
+from .config import settings
+
+
+# ── 노드 실행 구간(span) ─────────────────────────────────────────────────────
+#
+#  instrument()로 감싼 노드가 실행되는 동안 현재 span을 contextvar에 두고,
+#  LLM 호출 / 캐시 / 재시도 기록 함수가 그 span에 값을 더합니다.
+#  노드가 끝나면 span은 State의 spans 목록과 프로세스 전역 레지스트리에 함께 기록됩니다.
+#
+_current_span: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("current_span", default=None)
+
+DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _new_span(node: str) -> dict:
+    return {
+        "node":              node,
+        "wall_time":         0.0,
+        "llm_calls":         0,
+        "prompt_tokens":     0,
+        "completion_tokens": 0,
+        "cache_hits":        0,
+        "retries":           0,
+        "error":             None,
+    }
+
+
+def record_llm_call(usage: Optional[dict] = None) -> None:
+    """LLM 호출 1회 (usage: AIMessage.usage_metadata)"""
+    span = _current_span.get()
+    usage = usage or {}
+    if span is not None:
+        span["llm_calls"] += 1
+        span["prompt_tokens"] += usage.get("input_tokens", 0)
+        span["completion_tokens"] += usage.get("output_tokens", 0)
+    registry.record_llm_call(span["node"] if span else "unknown", usage)
+
+
+def record_cache_hit() -> None:
+    span = _current_span.get()
+    if span is not None:
+        span["cache_hits"] += 1
+    registry.inc("cache_hits", span["node"] if span else "unknown")
+
+
+def record_retry() -> None:
+    span = _current_span.get()
+    if span is not None:
+        span["retries"] += 1
+    registry.inc("retries", span["node"] if span else "unknown")
+
+
+def instrument(node: str, fn: Callable[[dict], Awaitable[dict]]) -> Callable[[dict], Awaitable[dict]]:
+    """노드 함수를 감싸 실행 시간·LLM 사용량을 span으로 기록합니다."""
+
+    @functools.wraps(fn)
+    async def wrapper(state: dict) -> dict:
+        span = _new_span(node)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            result = await fn(state)
+        except Exception as e:
+            span["error"] = str(e)
+            raise
+        finally:
+            span["wall_time"] = round(time.perf_counter() - started, 4)
+            _current_span.reset(token)
+            registry.observe_span(span)
+
+        result = dict(result or {})
+        result["spans"] = [span]
+        return result
+
+    return wrapper
+
+
+# ── 프로세스 전역 레지스트리 (/metrics) ──────────────────────────────────────
+
+def _quantile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """
+    노드별 히스토그램 + 최근 window개 실행 기준 p50/p95 + 카운터
+    Prometheus 텍스트 포맷으로 내보냅니다.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._buckets: dict[str, list[int]] = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self._sum: dict[str, float] = defaultdict(float)
+        self._count: dict[str, int] = defaultdict(int)
+        self._recent: dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counters: dict[tuple[str, str], float] = defaultdict(float)
+
+    def inc(self, name: str, node: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[(name, node)] += value
+
+    def record_llm_call(self, node: str, usage: dict) -> None:
+        with self._lock:
+            self._counters[("llm_calls", node)] += 1
+            self._counters[("prompt_tokens", node)] += usage.get("input_tokens", 0)
+            self._counters[("completion_tokens", node)] += usage.get("output_tokens", 0)
+
+    def observe_span(self, span: dict) -> None:
+        node, duration = span["node"], span["wall_time"]
+        with self._lock:
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    self._buckets[node][i] += 1
+            self._sum[node] += duration
+            self._count[node] += 1
+            self._recent[node].append(duration)
+            if span.get("error"):
+                self._counters[("node_errors", node)] += 1
+
+    def quantiles(self, node: str) -> dict:
+        with self._lock:
+            recent = list(self._recent[node])
+        return {"p50": _quantile(recent, 0.5), "p95": _quantile(recent, 0.95)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._sum.clear()
+            self._count.clear()
+            self._recent.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷 (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            nodes = sorted(self._count)
+
+            lines += [
+                "# HELP velog_node_duration_seconds Node wall time.",
+                "# TYPE velog_node_duration_seconds histogram",
+            ]
+            for node in nodes:
+                for bound, count in zip(DURATION_BUCKETS, self._buckets[node]):
+                    lines.append(f"velog_node_duration_seconds_bucket{_labels(node=node, le=str(bound))} {count}")
+                lines.append(f"velog_node_duration_seconds_bucket{_labels(node=node, le='+Inf')} {self._count[node]}")
+                lines.append(f"velog_node_duration_seconds_sum{_labels(node=node)} {self._sum[node]:.4f}")
+                lines.append(f"velog_node_duration_seconds_count{_labels(node=node)} {self._count[node]}")
+
+            lines += [
+                f"# HELP velog_node_latency_seconds Node wall time quantiles over the last {self.window} runs.",
+                "# TYPE velog_node_latency_seconds summary",
+            ]
+            for node in nodes:
+                recent = list(self._recent[node])
+                for q in (0.5, 0.95):
+                    lines.append(f"velog_node_latency_seconds{_labels(node=node, quantile=str(q))} {_quantile(recent, q):.4f}")
+                lines.append(f"velog_node_latency_seconds_sum{_labels(node=node)} {sum(recent):.4f}")
+                lines.append(f"velog_node_latency_seconds_count{_labels(node=node)} {len(recent)}")
+
+            by_name: dict[str, list[tuple[str, float]]] = defaultdict(list)
+            for (name, node), value in sorted(self._counters.items()):
+                by_name[name].append((node, value))
+            for name, values in by_name.items():
+                lines += [f"# TYPE velog_{name}_total counter"]
+                for node, value in values:
+                    lines.append(f"velog_{name}_total{_labels(node=node)} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(window=settings.metrics_window)
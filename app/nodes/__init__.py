@@ -1,15 +1,20 @@
 from .n1_collect import collect_and_select_topic
-from .n2_research import research
+from .n2_research import research, search_sources, summarize_research, reconcile
 from .n3_plan import plan
-from .n4_write import write
+from .n4_write import write, write_section, fan_out_sections
 from .n5_seo import seo_optimize
 from .n6_n7_n8 import critique, revise, publish
 
 __all__ = [
     "collect_and_select_topic",
     "research",
+    "search_sources",
+    "summarize_research",
+    "reconcile",
     "plan",
     "write",
+    "write_section",
+    "fan_out_sections",
     "seo_optimize",
     "critique",
     "revise",
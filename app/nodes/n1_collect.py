@@ -1,22 +1,141 @@
+import asyncio
 import json
 import re
-import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+from typing import Optional
 from ..state import BlogState
-from ..services.rss import fetch_rss_items
+from ..services.rss import fetch_rss_items, fetch_rss_items_async
+from ..services import dedup
+from ..services.ranking import rank_items
+from ..services.blobs import astore_json
 from ..config import settings
+from ..llm import complete
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
 
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.3,
-)
+FALLBACK_TOPIC = "2025년 AI 에이전트 트렌드와 LangGraph 실전 활용"
 
 
-def collect_and_select_topic(state: BlogState) -> dict:
+async def gather_rss_items() -> tuple[list[dict], list[str]]:
+    """
+    RSS 수집 (동시 수집 모드면 마감 시간을 넘긴 피드는 제외)
+    이전 실행에서 이미 다룬 이야기는 LLM 프롬프트에 넣기 전에 걸러내고,
+    남은 아이템은 로컬 점수로 정렬해 상위 RSS_TOP_K개만 남깁니다.
+    반환: (아이템 목록, 로그)  — 배치 생성에서는 한 번 수집한 결과를 여러 주제가 공유
+    """
+    late_feeds = []
+    if settings.rss_concurrent_fetch:
+        rss_items, late_feeds = await fetch_rss_items_async(max_per_feed=settings.rss_max_per_feed)
+    else:
+        rss_items = await asyncio.to_thread(fetch_rss_items, settings.rss_max_per_feed)
+    logs = [f"⏱️ [RSS] 시간 초과로 제외된 피드: {', '.join(late_feeds)}"] if late_feeds else []
+
+    if dedup.covered_index is not None and rss_items:
+        rss_items, covered = await asyncio.to_thread(dedup.covered_index.filter_new, rss_items)
+        if covered:
+            logs.append(f"♻️ [RSS] 이미 다룬 이야기 {len(covered)}개 제외")
+
+    if settings.rss_rank_enabled and rss_items:
+        collected = len(rss_items)
+        rss_items = rank_items(
+            rss_items,
+            top_k=settings.rss_top_k,
+            interests=settings.rss_interest_keywords,
+            source_weights=settings.rss_source_weights,
+            half_life_hours=settings.rss_recency_half_life,
+            cluster_distance=settings.dedup_max_distance,
+        )
+        logs.append(f"📊 [RSS] {collected}개 중 상위 {len(rss_items)}개 후보 선정")
+    return rss_items, logs
+
+
+def _source_item(rss_items: list[dict], source_index) -> Optional[dict]:
+    """LLM이 고른 source_index(1부터) → 원본 아이템 (다룬 이야기 기록용)"""
+    try:
+        index = int(source_index) - 1
+    except (TypeError, ValueError):
+        return None
+    return rss_items[index] if 0 <= index < min(len(rss_items), 20) else None
+
+
+def _items_summary(rss_items: list[dict]) -> str:
+    """RSS 아이템 요약 (LLM 컨텍스트 절약)"""
+    return "\n".join([
+        f"[{i+1}] {item['source']} | {item['title']}"
+        + (f" (외 {len(item['also_in'])}곳 보도)" if item.get("also_in") else "")
+        for i, item in enumerate(rss_items[:20])
+    ])
+
+
+async def select_topics(rss_items: list[dict], count: int) -> list[dict]:
+    """
+    수집된 아이템에서 서로 겹치지 않는 주제 count개를 LLM 호출 1번으로 선정합니다. (배치 생성용)
+    반환: [{"topic": ..., "reason": ..., "source": 원본 아이템 | None}, ...]  (응답이 부족하면 count개보다 적을 수 있음)
+    """
+    if not rss_items:
+        return [{"topic": FALLBACK_TOPIC, "reason": "RSS 수집 실패로 기본 주제 사용", "source": None}]
+
+    prompt = f"""당신은 기술 블로그 편집장입니다.
+아래는 오늘 수집된 AI/Tech 최신 뉴스 목록입니다.
+
+{_items_summary(rss_items)}
+
+한국 개발자 독자를 위한 Velog 기술 블로그 포스팅 주제를 {count}개 선정해주세요.
+
+선정 기준:
+- 한국 개발자들이 실용적으로 활용할 수 있는 주제
+- 최신 트렌드를 반영한 주제
+- 너무 광범위하지 않고 하나의 포스팅으로 깊게 다룰 수 있는 주제
+- 한국어 블로그에 적합한 주제
+- 주제끼리 내용이 겹치지 않을 것 (가능하면 서로 다른 뉴스에서 선정)
+
+반드시 아래 JSON 형식으로만 응답하세요:
+{{
+  "topics": [
+    {{"topic": "선정된 블로그 주제 (한국어, 구체적으로)", "reason": "선정 이유 (1~2문장)", "source_index": 3}}
+  ]
+}}"""
+
+    response = await complete(prompt, temperature=0.3)
+
+    try:
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
+        candidates = json.loads(content).get("topics") or []
+    except Exception:
+        # 파싱 실패 시 앞쪽 아이템 제목 사용
+        candidates = _title_candidates(rss_items, count, "자동 파싱 실패로 아이템 제목 사용")
+
+    topics = _valid_topics(rss_items, candidates, count)
+    if not topics:
+        # 응답에 쓸 수 있는 주제가 하나도 없으면 작업을 0개 제출하지 않도록 상위 아이템 제목 사용
+        topics = _valid_topics(rss_items, _title_candidates(rss_items, count, "유효한 주제가 없어 아이템 제목 사용"), count)
+    return topics
+
+
+def _title_candidates(rss_items: list[dict], count: int, reason: str) -> list[dict]:
+    """순위가 높은 아이템 count개의 제목을 주제 후보로 (LLM 응답을 쓸 수 없을 때)"""
+    return [
+        {"topic": item["title"], "reason": reason, "source_index": i + 1}
+        for i, item in enumerate(rss_items[:count])
+    ]
+
+
+def _valid_topics(rss_items: list[dict], candidates, count: int) -> list[dict]:
+    """후보 중 dict이고 주제가 비어 있지 않은 것만, 중복 없이 count개까지"""
+    topics, seen = [], set()
+    for candidate in candidates if isinstance(candidates, list) else []:
+        if not isinstance(candidate, dict):
+            continue
+        topic = str(candidate.get("topic") or "").strip()
+        if topic and topic.lower() not in seen:
+            seen.add(topic.lower())
+            topics.append({
+                "topic":  topic,
+                "reason": str(candidate.get("reason") or ""),
+                "source": _source_item(rss_items, candidate.get("source_index")),
+            })
+    return topics[:count]
+
+
+async def collect_and_select_topic(state: BlogState) -> dict:
     """
     [Node 1] RSS 피드 수집 → 트렌딩 주제 선정
     
@@ -25,33 +144,28 @@ def collect_and_select_topic(state: BlogState) -> dict:
     2. LLM이 아이템 분석 → 가장 블로그 가치 있는 주제 선정
     3. 선정 이유와 함께 반환
     """
-    # 사용자가 topic을 직접 입력한 경우 RSS 없이 그대로 사용
+    # 사용자가 topic을 직접 입력한 경우 RSS 없이 그대로 사용 (배치 생성은 선정 이유도 미리 채워 둠)
     user_topic = (state.get("topic") or "").strip()
     if user_topic:
         return {
             "rss_items":    [],
             "topic":        user_topic,
-            "topic_reason": "사용자 입력 주제 사용",
+            "topic_reason": state.get("topic_reason") or "사용자 입력 주제 사용",
             "logs":         [f"📝 [Topic] 사용자 입력 주제 사용: '{user_topic}'"],
         }
 
-    # RSS 수집
-    rss_items = fetch_rss_items(max_per_feed=5)
+    rss_items, rss_logs = await gather_rss_items()
 
     if not rss_items:
         # RSS 수집 실패 시 폴백 주제 사용
         return {
             "rss_items":    [],
-            "topic":        "2025년 AI 에이전트 트렌드와 LangGraph 실전 활용",
+            "topic":        FALLBACK_TOPIC,
             "topic_reason": "RSS 수집 실패로 기본 주제 사용",
-            "logs":         ["⚠️ [RSS] 수집 실패, 기본 주제로 진행"],
+            "logs":         rss_logs + ["⚠️ [RSS] 수집 실패, 기본 주제로 진행"],
         }
 
-    # RSS 아이템 요약 (LLM 컨텍스트 절약)
-    items_summary = "\n".join([
-        f"[{i+1}] {item['source']} | {item['title']}"
-        for i, item in enumerate(rss_items[:20])
-    ])
+    items_summary = _items_summary(rss_items)
 
     prompt = f"""당신은 기술 블로그 편집장입니다.
 아래는 오늘 수집된 AI/Tech 최신 뉴스 목록입니다.
@@ -73,21 +187,24 @@ def collect_and_select_topic(state: BlogState) -> dict:
   "source_index": 3
 }}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await complete(prompt, temperature=0.3)
 
     try:
-        content = re.sub(r"```(?:json)?|```", "", response.content).strip()
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
         data = json.loads(content)
         topic = data.get("topic", "")
         reason = data.get("reason", "")
+        source_item = _source_item(rss_items, data.get("source_index"))
     except Exception:
         # 파싱 실패 시 첫 번째 아이템 제목 사용
         topic = rss_items[0]["title"]
         reason = "자동 파싱 실패로 첫 번째 아이템 사용"
+        source_item = rss_items[0]
 
     return {
-        "rss_items":    rss_items,
+        "rss_items":    await astore_json(rss_items),
         "topic":        topic,
         "topic_reason": reason,
-        "logs":         [f"📰 [RSS] {len(rss_items)}개 수집 → 주제 선정: '{topic}'"],
+        "source_item":  source_item,
+        "logs":         rss_logs + [f"📰 [RSS] {len(rss_items)}개 수집 → 주제 선정: '{topic}'"],
     }
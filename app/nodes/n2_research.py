@@ -1,30 +1,13 @@
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+import asyncio
 from ..state import BlogState
-from ..config import settings
-import json, re, os
+from ..llm import complete
+from ..services.search import search
+from ..services.blobs import aload_json, astore_json
+import json, re
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
-
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.3,
-)
-
-
-def research(state: BlogState) -> dict:
-    """
-    [Node 2] Tavily로 주제 관련 최신 정보 웹 검색
-    
-    흐름:
-    1. LLM이 주제를 분석해서 검색 쿼리 3개 생성
-    2. 각 쿼리로 Tavily 검색 실행
-    3. 검색 결과 요약 + 참고 URL 추출
-    """
-    topic = state["topic"]
 
+async def _search_hits(topic: str) -> tuple[list[str], list[dict], list[str]]:
+    """검색 쿼리 생성 + Tavily 검색 → (쿼리, 원본 검색 결과, 참고 URL)"""
     # ── Step 1: 검색 쿼리 생성 ────────────────────────────────────
     query_prompt = f"""블로그 주제: "{topic}"
 
@@ -37,54 +20,119 @@ def research(state: BlogState) -> dict:
 JSON 형식으로만 응답:
 {{"queries": ["query1", "query2", "query3"]}}"""
 
-    response = llm.invoke([HumanMessage(content=query_prompt)])
+    response = await complete(query_prompt, temperature=0.3, cache=True)
 
     try:
-        content = re.sub(r"```(?:json)?|```", "", response.content).strip()
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
         queries = json.loads(content).get("queries", [topic])
     except Exception:
         queries = [topic, f"{topic} tutorial", f"{topic} best practices"]
 
-    # ── Step 2: Tavily 검색 실행 ──────────────────────────────────
-    os.environ["TAVILY_API_KEY"] = settings.tavily_api_key
-
-    search_tool = TavilySearchResults(max_results=3)
+    # ── Step 2: Tavily 검색 실행 (동시) ───────────────────────────
+    queries = queries[:3]
+    outcomes = await asyncio.gather(*(search(q) for q in queries), return_exceptions=True)
     raw_results = []
     references = []
 
-    for query in queries[:3]:
-        try:
-            results = search_tool.invoke(query)
-            for r in results:
-                raw_results.append({
-                    "query":   query,
-                    "title":   r.get("title", ""),
-                    "content": r.get("content", "")[:500],  # 500자 제한
-                    "url":     r.get("url", ""),
-                })
-                if r.get("url"):
-                    references.append(r["url"])
-        except Exception as e:
-            raw_results.append({"query": query, "error": str(e)})
-
-    # ── Step 3: 결과 요약 ─────────────────────────────────────────
-    results_text = "\n\n".join([
+    for query, results in zip(queries, outcomes):
+        if isinstance(results, Exception):
+            raw_results.append({"query": query, "error": str(results)})
+            continue
+        for r in results:
+            raw_results.append({
+                "query":   query,
+                "title":   r.get("title", ""),
+                "content": r.get("content", "")[:500],  # 500자 제한
+                "url":     r.get("url", ""),
+            })
+            if r.get("url"):
+                references.append(r["url"])
+
+    return queries, raw_results, references
+
+
+def hits_text(raw_results: list[dict]) -> str:
+    """원본 검색 결과를 프롬프트용 텍스트로 (요약 / 추측 기획 공용)"""
+    return "\n\n".join([
         f"[검색: {r['query']}]\n제목: {r.get('title','')}\n내용: {r.get('content','')}"
         for r in raw_results if "error" not in r
     ])
 
+
+async def _summarize(raw_results: list[dict]) -> str:
+    # ── Step 3: 결과 요약 ─────────────────────────────────────────
     summary_prompt = f"""다음 검색 결과를 한국어로 핵심만 요약해주세요.
 블로그 작성에 활용할 핵심 정보, 통계, 사례를 중심으로 정리하세요.
 
 검색 결과:
-{results_text[:3000]}
+{hits_text(raw_results)[:3000]}
 
 요약 (500자 이내):"""
 
-    summary_response = llm.invoke([HumanMessage(content=summary_prompt)])
+    summary_response = await complete(summary_prompt, temperature=0.3)
+    return summary_response.strip()
+
+
+async def research(state: BlogState) -> dict:
+    """
+    [Node 2] Tavily로 주제 관련 최신 정보 웹 검색
+    
+    흐름:
+    1. LLM이 주제를 분석해서 검색 쿼리 3개 생성
+    2. 모든 쿼리로 Tavily 검색 동시 실행 (캐시 우선)
+    3. 검색 결과 요약 + 참고 URL 추출
+    """
+    queries, raw_results, references = await _search_hits(state["topic"])
+    summary = await _summarize(raw_results)
 
     return {
-        "research_results": [summary_response.content.strip()],
+        "research_results": [summary],
         "references":       list(set(references)),  # 중복 제거
         "logs":             [f"🔍 [Research] 쿼리 {len(queries)}개, 결과 {len(raw_results)}개 수집 완료"],
     }
+
+
+# ── 추측 실행 모드 (SPECULATIVE_PLAN=true) ────────────────────────────────────
+#
+#  research를 검색(search_sources)과 요약(summarize_research)으로 나누고,
+#  plan은 요약을 기다리지 않고 원본 검색 결과로 바로 시작합니다.
+#
+#      research(검색) ─┬─ summarize ─┐
+#                      └─ plan ──────┴─ reconcile → write
+#
+#  요약 LLM 호출과 기획 LLM 호출이 겹쳐 매 실행의 임계 경로에서 왕복 1회가 빠집니다.
+#
+async def search_sources(state: BlogState) -> dict:
+    """[Node 2-a] 검색 쿼리 생성 + Tavily 검색까지만 (원본 결과는 search_hits로)"""
+    queries, raw_results, references = await _search_hits(state["topic"])
+
+    return {
+        "search_hits": await astore_json(raw_results),
+        "references":  list(set(references)),  # 중복 제거
+        "logs":        [f"🔍 [Research] 쿼리 {len(queries)}개, 결과 {len(raw_results)}개 수집 완료 (요약·기획 동시 진행)"],
+    }
+
+
+async def summarize_research(state: BlogState) -> dict:
+    """[Node 2-b] 원본 검색 결과 요약 (plan과 동시에 실행)"""
+    summary = await _summarize(await aload_json(state.get("search_hits")) or [])
+
+    return {
+        "research_results": [summary],
+        "logs":             [f"📝 [Research] 검색 결과 요약 완료 ({len(summary)}자)"],
+    }
+
+
+async def reconcile(state: BlogState) -> dict:
+    """
+    [Node 2-c] 요약과 기획이 모두 끝나면 합류 (write 직전)
+    요약이 비어 있으면(실패) write가 참고할 리서치를 원본 검색 결과로 채웁니다.
+    """
+    if any((r or "").strip() for r in state.get("research_results") or []):
+        return {"logs": [f"🔀 [Reconcile] 요약 + 목차 {len(state.get('outline') or [])}개 합류"]}
+
+    fallback = hits_text(await aload_json(state.get("search_hits")) or [])[:1500]
+    return {
+        "research_results": [fallback] if fallback else [],
+        "logs":             ["⚠️ [Reconcile] 요약이 비어 원본 검색 결과로 작성"],
+    }
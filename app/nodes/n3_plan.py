@@ -1,29 +1,22 @@
-import json, re, os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+import json, re
 from ..state import BlogState
-from ..config import settings
+from ..llm import complete
+from ..services.blobs import aload_json
+from .n2_research import hits_text
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
 
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.4,
-)
-
-
-def plan(state: BlogState) -> dict:
+async def plan(state: BlogState) -> dict:
     """
     [Node 3] SEO 키워드 분석 + 블로그 목차 기획
     
     흐름:
     1. 주제 + 리서치 결과 분석
+       (SPECULATIVE_PLAN=true면 요약을 기다리지 않고 원본 검색 결과로 기획)
     2. SEO 키워드 5~7개 추출
     3. 키워드를 반영한 목차 설계
     """
     topic = state["topic"]
-    research = "\n".join(state.get("research_results") or [])
+    research = "\n".join(state.get("research_results") or []) or hits_text(await aload_json(state.get("search_hits")) or [])
 
     prompt = f"""당신은 SEO 전문 기술 블로그 편집장입니다.
 
@@ -53,16 +46,16 @@ JSON 형식으로만 응답:
   ]
 }}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await complete(prompt, temperature=0.4, cache=True)
 
     try:
-        content = re.sub(r"```(?:json)?|```", "", response.content).strip()
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
         data = json.loads(content)
         seo_keywords = data.get("seo_keywords", [])
         outline = data.get("outline", [])
     except Exception:
         seo_keywords = [topic]
-        lines = [l.strip().lstrip("-•*0123456789. ") for l in response.content.splitlines() if l.strip()]
+        lines = [l.strip().lstrip("-•*0123456789. ") for l in response.splitlines() if l.strip()]
         outline = [l for l in lines if len(l) > 2][:7]
 
     return {
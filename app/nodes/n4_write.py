@@ -1,45 +1,16 @@
-import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+from langgraph.types import Send
 from ..state import BlogState
-from ..config import settings
+from ..llm import complete
+from ..document import section_record
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
 
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.7,
-)
-
-
-def write(state: BlogState) -> dict:
-    """
-    [Node 4] 목차의 섹션을 하나씩 작성 (루프 노드)
-    
-    - 매 호출마다 아직 작성 안 된 섹션 1개를 작성
-    - writing_router가 모든 섹션 완료 여부를 체크
-    - 모두 작성되면 sections를 합쳐 draft 생성
-    """
+def _section_prompt(state: BlogState, index: int) -> str:
+    """index번째 섹션 작성 프롬프트 (목차·리서치·키워드에만 의존)"""
     outline = state.get("outline") or []
-    sections = state.get("sections") or []
-    written_count = len(sections)
-
-    # 모든 섹션 작성 완료 → draft 조합
-    if written_count >= len(outline):
-        full_draft = f"# {state['topic']}\n\n"
-        full_draft += "\n\n---\n\n".join(sections)
-        return {
-            "draft": full_draft,
-            "logs":  ["✍️ [Write] 전체 초안 조합 완료"],
-        }
-
-    # 현재 작성할 섹션
-    current_section = outline[written_count]
     research = "\n".join(state.get("research_results") or [])
     keywords = ", ".join(state.get("seo_keywords") or [])
 
-    prompt = f"""당신은 한국의 전문 기술 블로그 작가입니다.
+    return f"""당신은 한국의 전문 기술 블로그 작가입니다.
 한국어로 작성하세요.
 
 블로그 주제: {state['topic']}
@@ -47,7 +18,7 @@ SEO 키워드: {keywords}
 전체 목차: {' → '.join(outline)}
 참고 리서치: {research[:1500]}
 
-지금 작성할 섹션: **{current_section}** ({written_count + 1}/{len(outline)})
+지금 작성할 섹션: **{outline[index]}** ({index + 1}/{len(outline)})
 
 작성 요구사항:
 - 마크다운 형식 (## 헤딩으로 시작)
@@ -57,9 +28,72 @@ SEO 키워드: {keywords}
 - 독자가 실제로 도움받을 수 있는 실용적인 내용
 - 첫 번째 섹션(들어가며)이면 독자의 관심을 끄는 훅으로 시작"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+
+async def write(state: BlogState) -> dict:
+    """
+    [Node 4] 목차의 섹션을 하나씩 작성 (루프 노드)
+    
+    - 매 호출마다 아직 작성 안 된 섹션 1개를 작성 (섹션 레코드로 sections에 추가)
+    - writing_router가 모든 섹션 완료 여부를 체크
+    - 전체 마크다운은 여기서 만들지 않고 publish에서 한 번만 렌더링
+    - 병렬 모드에서는 write_section 결과가 모두 모였는지 확인하는 join 역할만 함
+    """
+    outline = state.get("outline") or []
+    sections = state.get("sections") or []
+    written_count = len(sections)
+
+    # 모든 섹션 작성 완료
+    if written_count >= len(outline):
+        return {"logs": [f"✍️ [Write] 섹션 {written_count}개 작성 완료"]}
+
+    # 현재 작성할 섹션
+    current_section = outline[written_count]
+    response = await complete(
+        _section_prompt(state, written_count),
+        temperature=0.7,
+        metadata={"section_index": written_count},
+    )
 
     return {
-        "sections": [response.content.strip()],
+        "sections": [await section_record(written_count, current_section, response.strip(), "write")],
         "logs":     [f"✍️ [Write] '{current_section}' 작성 완료 ({written_count + 1}/{len(outline)})"],
     }
+
+
+# ── 병렬 작성 모드 (PARALLEL_WRITE=true) ──────────────────────────────────────
+
+def fan_out_sections(state: BlogState) -> list:
+    """
+    plan 이후 목차의 모든 섹션을 write_section으로 동시에 보냅니다. (Send fan-out)
+    동시 실행 수는 그래프의 max_concurrency(WRITE_CONCURRENCY)로 제한됩니다.
+    """
+    outline = state.get("outline") or []
+    if not outline:
+        return ["write"]
+
+    payload = {
+        "topic":            state["topic"],
+        "outline":          outline,
+        "research_results": state.get("research_results") or [],
+        "seo_keywords":     state.get("seo_keywords") or [],
+    }
+    return [Send("write_section", {**payload, "section_index": i}) for i in range(len(outline))]
+
+
+async def write_section(state: dict) -> dict:
+    """
+    [Node 4-1] fan-out된 섹션 1개 작성
+    결과는 section_index 위치의 섹션 레코드로 저장되어, 완료 순서와 무관하게 목차 순서가 유지됩니다.
+    """
+    index = state["section_index"]
+    outline = state["outline"]
+    response = await complete(
+        _section_prompt(state, index),
+        temperature=0.7,
+        metadata={"section_index": index},
+    )
+
+    return {
+        "sections": [await section_record(index, outline[index], response.strip(), "write_section")],
+        "logs":     [f"✍️ [Write] '{outline[index]}' 작성 완료 ({index + 1}/{len(outline)})"],
+    }
@@ -1,19 +1,11 @@
-import json, re, os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+import json, re
 from ..state import BlogState
-from ..config import settings
+from ..llm import complete
+from ..document import render_preview
+from ..services.blobs import aload_sections
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
 
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.4,
-)
-
-
-def seo_optimize(state: BlogState) -> dict:
+async def seo_optimize(state: BlogState) -> dict:
     """
     [Node 5] SEO 최적화
     
@@ -23,7 +15,7 @@ def seo_optimize(state: BlogState) -> dict:
     """
     topic = state["topic"]
     keywords = ", ".join(state.get("seo_keywords") or [])
-    draft_preview = (state.get("draft") or "")[:500]
+    draft_preview = render_preview(topic, await aload_sections(state.get("sections") or []), 500)
 
     prompt = f"""당신은 기술 블로그 SEO 전문가입니다.
 
@@ -54,10 +46,10 @@ JSON 형식으로만 응답:
   "velog_tags": ["태그1", "태그2", "태그3", "태그4", "태그5"]
 }}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await complete(prompt, temperature=0.4, cache=True)
 
     try:
-        content = re.sub(r"```(?:json)?|```", "", response.content).strip()
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
         data = json.loads(content)
         seo_title = data.get("seo_title", topic)
         meta_desc = data.get("meta_description", "")[:160]
@@ -1,26 +1,46 @@
-import json, re, os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+import asyncio
+import uuid
+import json, re
+from typing import Optional
+from langgraph.config import get_config
 from ..state import BlogState
 from ..config import settings
+from ..llm import complete
+from ..document import render_markdown, section_body, section_record
+from ..quality import combine_feedback, heuristic_check
 from ..services.velog import publish_to_velog, save_draft_to_file
+from ..services import dedup
+from ..services.outbox import outbox
+from ..services.blobs import aload_sections, astore_text
 
-if settings.google_api_key:
-    os.environ["GOOGLE_API_KEY"] = settings.google_api_key
 
-llm = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.2,
-)
-llm_writer = ChatGoogleGenerativeAI(
-    model=settings.gemini_model,
-    temperature=0.7,
-)
+# ── Node 6: Critique ──────────────────────────────────────────────────────────
 
+def _labeled_sections(state: BlogState) -> str:
+    """섹션마다 번호를 붙인 검토용 본문"""
+    sections = state.get("sections") or []
+    return "\n\n".join(f"[섹션 {i + 1}]\n{section_body(section)}" for i, section in enumerate(sections))
 
-# ── Node 6: Critique ──────────────────────────────────────────────────────────
 
-def critique(state: BlogState) -> dict:
+def _parse_section_feedback(items: list, section_count: int) -> list[dict]:
+    """[{"section": 1(1부터), "feedback": ...}] → [{"index": 0, "feedback": ...}] (범위 밖·중복 제외)"""
+    feedback: dict[int, str] = {}
+    for item in items or []:
+        try:
+            index = int(item.get("section")) - 1
+        except (AttributeError, TypeError, ValueError):
+            continue
+        text = str(item.get("feedback") or "").strip()
+        if 0 <= index < section_count and text and index not in feedback:
+            feedback[index] = text
+    return [{"index": i, "feedback": feedback[i]} for i in sorted(feedback)]
+
+
+# 섹션 점수가 이보다 낮으면 revise 대상 (quality_router 기준과 동일)
+SECTION_PASS_SCORE = 7
+
+
+async def critique(state: BlogState) -> dict:
     """
     [Node 6] 초안 품질 + SEO 검토
     
@@ -29,8 +49,75 @@ def critique(state: BlogState) -> dict:
     - SEO 키워드 자연스러운 포함 여부
     - 독자 친화성 및 가독성
     - 실용적 가치
+
+    전체 점수와 함께 수정이 필요한 섹션별 피드백(section_feedback)을 남겨
+    revise가 해당 섹션만 다시 쓰도록 합니다.
+    CRITIQUE_MODE=sectioned면 섹션별로 나눠 채점합니다. (긴 초안용)
+    single 모드라도 초안이 CRITIQUE_MAX_CHARS보다 길면 프롬프트가 커지지 않도록 섹션별로 채점합니다.
+    CRITIQUE_GATE=true면 로컬 규칙 채점(app/quality.py)을 먼저 해서
+    확실히 부족하면 LLM 없이 바로 revise로, 확실히 괜찮으면 LLM 검토를 생략합니다.
     """
-    draft = state.get("draft") or ""
+    # 섹션 본문을 한 번에 읽어 둔 사본으로 채점 (블롭 파일 I/O는 스레드에서)
+    state = {**state, "sections": await aload_sections(state.get("sections") or [])}
+
+    gate = None
+    if settings.critique_gate:
+        gate = heuristic_check(
+            state.get("sections") or [],
+            state.get("seo_keywords") or [],
+            min_chars=settings.gate_min_section_chars,
+        )
+        if gate["score"] < settings.gate_fail_score or gate["score"] >= settings.gate_pass_score:
+            return _gate_result(gate)
+
+    labeled = _labeled_sections(state)
+    too_long = len(labeled) > settings.critique_max_chars
+    if state.get("sections") and (settings.critique_mode == "sectioned" or too_long):
+        result = await _critique_by_section(state)
+    else:
+        result = await _critique_whole(state, labeled)
+    return _combine_with_gate(result, gate) if gate else result
+
+
+def _gate_result(gate: dict) -> dict:
+    """로컬 채점만으로 결론이 난 경우 (LLM 호출 없음)"""
+    passed = gate["score"] >= settings.gate_pass_score
+    summary = "규칙 검사 통과" if passed else ", ".join(gate["issues"])
+    critique_text = f"총평: 로컬 검사 {gate['score']}점 ({summary})"
+    if gate["section_feedback"]:
+        critique_text += "\n섹션별:\n" + "\n".join(
+            f"- [{f['index'] + 1}] {f['feedback']}" for f in gate["section_feedback"]
+        )
+    verdict = "LLM 검토 생략" if passed else "LLM 검토 없이 수정"
+    return {
+        "critique":         critique_text,
+        "section_feedback": gate["section_feedback"],
+        "quality_score":    gate["score"],
+        "logs":             [f"🚦 [Critique] 로컬 점수: {gate['score']}/10 → {verdict} | {summary}"],
+    }
+
+
+def _combine_with_gate(result: dict, gate: dict) -> dict:
+    """LLM 점수와 로컬 점수를 GATE_WEIGHT 비중으로 합산 (quality_router는 합산 점수로 분기)"""
+    weight = settings.gate_weight
+    score = round((1 - weight) * result["quality_score"] + weight * gate["score"])
+    critique_text = result["critique"]
+    if gate["issues"]:
+        critique_text += "\n로컬 검사: " + ", ".join(gate["issues"])
+    return {
+        **result,
+        "critique":         critique_text,
+        "section_feedback": combine_feedback(result["section_feedback"], gate["section_feedback"]),
+        "quality_score":    score,
+        "logs":             result["logs"] + [
+            f"🚦 [Critique] 합산 점수: {score}/10 (LLM {result['quality_score']} / 로컬 {gate['score']})"
+        ],
+    }
+
+
+async def _critique_whole(state: BlogState, labeled: str) -> dict:
+    """초안 전체를 프롬프트 하나로 검토 (labeled: 번호 붙인 본문, CRITIQUE_MAX_CHARS 이하)"""
+    sections = state.get("sections") or []
     keywords = ", ".join(state.get("seo_keywords") or [])
 
     prompt = f"""당신은 기술 블로그 에디터입니다. 아래 초안을 검토해주세요.
@@ -38,7 +125,7 @@ def critique(state: BlogState) -> dict:
 SEO 키워드: {keywords}
 
 --- 초안 ---
-{draft[:3000]}
+{labeled}
 --- 끝 ---
 
 평가 기준:
@@ -48,98 +135,215 @@ SEO 키워드: {keywords}
 4. 실용적 가치 (독자가 실제로 도움받을 수 있는가)
 5. 도입부 훅 (첫 문장이 독자를 잡아당기는가)
 
+수정이 필요한 섹션만 "sections"에 번호와 구체적인 피드백을 적어주세요. (괜찮은 섹션은 제외)
+
 JSON 형식으로만 응답:
 {{
   "score": 7,
   "strengths": ["강점1", "강점2"],
   "improvements": ["개선점1", "개선점2"],
+  "sections": [{{"section": 2, "feedback": "이 섹션의 구체적인 개선점"}}],
   "summary": "한 줄 총평"
 }}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await complete(prompt, temperature=0.2, cache=True)
 
+    summary = ""
+    section_feedback = []
     try:
-        content = re.sub(r"```(?:json)?|```", "", response.content).strip()
+        content = re.sub(r"```(?:json)?|```", "", response).strip()
         data = json.loads(content)
         score = int(data.get("score", 5))
         improvements = data.get("improvements", [])
         summary = data.get("summary", "")
+        section_feedback = _parse_section_feedback(data.get("sections"), len(sections))
         critique_text = f"총평: {summary}\n개선점:\n" + "\n".join(f"- {i}" for i in improvements)
+        if section_feedback:
+            critique_text += "\n섹션별:\n" + "\n".join(
+                f"- [{f['index'] + 1}] {f['feedback']}" for f in section_feedback
+            )
     except Exception:
         score = 5
-        critique_text = response.content.strip()
+        critique_text = response.strip()
 
     return {
-        "critique":      critique_text,
-        "quality_score": score,
-        "logs":          [f"🔎 [Critique] 점수: {score}/10 | {summary if 'summary' in dir() else ''}"],
+        "critique":         critique_text,
+        "section_feedback": section_feedback,
+        "quality_score":    score,
+        "logs":             [f"🔎 [Critique] 점수: {score}/10 | 수정 대상 섹션 {len(section_feedback)}개 | {summary}"],
     }
 
 
-# ── Node 7: Revise ────────────────────────────────────────────────────────────
+def _section_critique_prompt(state: BlogState, index: int) -> str:
+    outline = state.get("outline") or []
+    keywords = ", ".join(state.get("seo_keywords") or [])
+    sections = state["sections"]
+
+    return f"""당신은 기술 블로그 에디터입니다. 아래 글의 한 섹션만 검토해주세요.
+
+블로그 주제: {state.get('topic') or ''}
+전체 목차: {' → '.join(outline)}
+SEO 키워드: {keywords}
+
+--- 섹션 {index + 1}/{len(sections)} ---
+{section_body(sections[index])}
+--- 끝 ---
 
-def revise(state: BlogState) -> dict:
+평가 기준:
+1. 내용의 깊이와 정확성 (최신 정보 반영 여부)
+2. SEO 키워드 자연스러운 포함 (억지스럽지 않은지)
+3. 가독성 (마크다운 구조, 단락 길이)
+4. 실용적 가치 (독자가 실제로 도움받을 수 있는가)
+5. 첫 번째 섹션이면 도입부 훅 (첫 문장이 독자를 잡아당기는가)
+
+JSON 형식으로만 응답:
+{{
+  "score": 7,
+  "feedback": "이 섹션의 구체적인 개선점 (없으면 빈 문자열)"
+}}"""
+
+
+async def _critique_by_section(state: BlogState) -> dict:
     """
-    [Node 7] 피드백 반영 재작성
-    
-    critique 노드의 개선점을 반영해 초안을 개선합니다.
-    최대 2회 반복 (무한 루프 방지)
+    섹션별 채점(map)을 동시에 실행하고 결과를 하나로 합칩니다(reduce).
+
+    - 지연 시간은 섹션 수가 아니라 가장 느린 섹션 하나에 가깝게 유지 (CRITIQUE_CONCURRENCY 상한)
+    - 전체 점수 = 섹션 길이 가중 평균 → 짧은 맺음말이 긴 본문 점수를 끌어내리지 않음
+    - 프롬프트가 섹션 단위라 응답 캐시가 걸리므로, 수정 후 재검토 때는 바뀐 섹션만 다시 호출
     """
-    draft = state.get("draft") or ""
-    critique_text = state.get("critique") or ""
+    sections = [section_body(section) for section in state["sections"]]
+    limiter = asyncio.Semaphore(max(1, settings.critique_concurrency))
+
+    async def score_one(index: int) -> dict:
+        async with limiter:
+            response = await complete(_section_critique_prompt(state, index), temperature=0.2, cache=True)
+        try:
+            data = json.loads(re.sub(r"```(?:json)?|```", "", response).strip())
+            return {"score": int(data.get("score", 5)), "feedback": str(data.get("feedback") or "").strip()}
+        except Exception:
+            return {"score": 5, "feedback": response.strip()[:300]}
+
+    results = await asyncio.gather(*(score_one(i) for i in range(len(sections))))
+
+    weights = [max(len(content), 1) for content in sections]
+    score = round(sum(r["score"] * w for r, w in zip(results, weights)) / sum(weights))
+    section_feedback = [
+        {"index": i, "feedback": r["feedback"] or "섹션 품질 개선"}
+        for i, r in enumerate(results)
+        if r["score"] < SECTION_PASS_SCORE
+    ]
+
+    summary = f"섹션 {len(sections)}개 가중 평균 {score}점 (최저 {min(r['score'] for r in results)}점)"
+    critique_text = f"총평: {summary}\n섹션별:\n" + "\n".join(
+        f"- [{i + 1}] {r['score']}점 {r['feedback']}".rstrip() for i, r in enumerate(results)
+    )
+
+    return {
+        "critique":         critique_text,
+        "section_feedback": section_feedback,
+        "quality_score":    score,
+        "logs":             [f"🔎 [Critique] 점수: {score}/10 | 수정 대상 섹션 {len(section_feedback)}개 | {summary}"],
+    }
+
+
+# ── Node 7: Revise ────────────────────────────────────────────────────────────
+
+def _revise_prompt(state: BlogState, index: int, feedback: str) -> str:
+    """index번째 섹션 하나만 고쳐 쓰는 프롬프트 (다른 섹션 본문은 보내지 않음)"""
+    outline = state.get("outline") or []
     keywords = ", ".join(state.get("seo_keywords") or [])
-    revision_count = state.get("revision_count") or 0
+    heading = outline[index] if index < len(outline) else f"섹션 {index + 1}"
 
-    prompt = f"""당신은 전문 기술 블로그 작가입니다. 한국어로 작성하세요.
+    return f"""당신은 전문 기술 블로그 작가입니다. 한국어로 작성하세요.
 
-피드백을 반영해 아래 초안을 개선해주세요.
+피드백을 반영해 아래 섹션 하나만 개선해주세요.
 
+블로그 주제: {state.get('topic') or ''}
+전체 목차: {' → '.join(outline)}
 SEO 키워드 (자연스럽게 포함): {keywords}
 
-피드백:
-{critique_text}
+전체 피드백:
+{state.get('critique') or ''}
+
+이 섹션 피드백:
+{feedback}
 
-현재 초안:
-{draft[:3000]}
+수정할 섹션: **{heading}** ({index + 1}/{max(len(outline), index + 1)})
+{section_body(state['sections'][index])}
 
 개선 요구사항:
 - 피드백의 개선점을 모두 반영할 것
 - 기존 좋은 부분은 유지할 것
 - SEO 키워드를 더 자연스럽게 녹여낼 것
-- 마크다운 형식 유지
-- 전체 초안을 완성된 형태로 작성"""
+- 마크다운 형식 유지 (## 헤딩으로 시작)
+- 이 섹션만 완성된 형태로 작성"""
 
-    response = llm_writer.invoke([HumanMessage(content=prompt)])
+
+async def revise(state: BlogState) -> dict:
+    """
+    [Node 7] 피드백 반영 재작성
+    
+    critique가 지적한 섹션만 동시에 다시 써서 해당 섹션 레코드만 갱신합니다. (다른 섹션·전체 본문은 건드리지 않음)
+    (섹션별 피드백이 없으면 전체 피드백으로 모든 섹션을 수정)
+    최대 2회 반복 (무한 루프 방지)
+    """
+    state = {**state, "sections": await aload_sections(state.get("sections") or [])}
+    sections = state["sections"]
+    revision_count = state.get("revision_count") or 0
+
+    if not sections:
+        return {
+            "revision_count": revision_count + 1,
+            "logs":           ["🔄 [Revise] 수정할 섹션 없음"],
+        }
+
+    targets = state.get("section_feedback") or [
+        {"index": i, "feedback": "전체 피드백을 반영"} for i in range(len(sections))
+    ]
+
+    outline = state.get("outline") or []
+
+    async def revise_one(target: dict) -> dict:
+        index = target["index"]
+        response = await complete(
+            _revise_prompt(state, index, target["feedback"]),
+            temperature=0.7,
+            metadata={"section_index": index},
+        )
+        heading = outline[index] if index < len(outline) else f"섹션 {index + 1}"
+        return await section_record(index, heading, response.strip(), "revise", feedback=target["feedback"])
+
+    updates = list(await asyncio.gather(*(revise_one(t) for t in targets)))
 
     return {
-        "draft":          response.content.strip(),
+        "sections":       updates,
         "revision_count": revision_count + 1,
-        "logs":           [f"🔄 [Revise] {revision_count + 1}차 수정 완료"],
+        "logs":           [f"🔄 [Revise] {revision_count + 1}차 수정 완료 (섹션 {len(updates)}/{len(sections)}개)"],
     }
 
 
 # ── Node 8: Publish ───────────────────────────────────────────────────────────
 
-def publish(state: BlogState) -> dict:
+def _session_id() -> Optional[str]:
+    """현재 그래프 실행의 thread_id (그래프 밖에서 호출되면 None)"""
+    try:
+        return get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:
+        return None
+
+
+async def publish(state: BlogState) -> dict:
     """
     [Node 8] Velog 발행 (또는 파일 저장)
     
     AUTO_PUBLISH=true  → Velog GraphQL API로 실제 발행
+                         (PUBLISH_OUTBOX=true면 아웃박스에 넣고 전송은 OutboxDelivery 워커가 담당)
     AUTO_PUBLISH=false → drafts/ 폴더에 마크다운 파일로 저장
     """
-    draft = state.get("draft") or ""
     seo_title = state.get("seo_title") or state.get("topic") or "블로그 초안"
     tags = state.get("velog_tags") or []
     meta_desc = state.get("meta_description") or ""
 
-    # 참고 문헌 섹션 추가
-    references = state.get("references") or []
-    if references:
-        ref_section = "\n\n---\n\n## 참고\n" + "\n".join(f"- {url}" for url in references[:5])
-        final_content = draft + ref_section
-    else:
-        final_content = draft
-
     # 메타 정보 푸터
     footer = (
         f"\n\n---\n"
@@ -147,20 +351,47 @@ def publish(state: BlogState) -> dict:
         f"*품질 점수: {state.get('quality_score', 0)}/10 | "
         f"수정 횟수: {state.get('revision_count', 0)}회*"
     )
-    final_content += footer
+    # 섹션 레코드 + 참고 문헌 + 푸터를 여기서 한 번만 마크다운으로 렌더링
+    final_content = render_markdown(
+        state.get("topic") or seo_title,
+        await aload_sections(state.get("sections") or []),
+        references=state.get("references") or [],
+        footer=footer,
+    )
 
+    outbox_id = None
     try:
-        if settings.auto_publish:
-            result = publish_to_velog(
+        if settings.auto_publish and settings.publish_outbox:
+            # Velog 장애·레이트 리밋이 생성 파이프라인을 막지 않도록 대기열에만 기록
+            outbox_id = await asyncio.to_thread(
+                outbox.enqueue,
+                session_id=_session_id() or str(uuid.uuid4()),
+                title=seo_title,
+                body=final_content,
+                tags=tags,
+                meta_description=meta_desc,
+                topic=state.get("topic") or seo_title,
+                source_item=state.get("source_item"),
+            )
+            result = {"success": True, "url": None, "queued": True}
+            log_msg = f"📮 [Publish] 발행 대기열에 추가: {outbox_id}"
+        elif settings.auto_publish:
+            # 세션 ID로 발행 시도를 기록해 재개/재시도 때 같은 글을 두 번 올리지 않음
+            result = await publish_to_velog(
                 title=seo_title,
                 body=final_content,
                 tags=tags,
                 meta_description=meta_desc,
                 is_temp=False,
+                session_id=_session_id(),
             )
-            log_msg = f"🚀 [Publish] Velog 발행 완료: {result['url']}"
+            if result.get("existing"):
+                log_msg = f"♻️ [Publish] 이미 발행된 글 재사용: {result['url']}"
+            else:
+                log_msg = f"🚀 [Publish] Velog 발행 완료: {result['url']}"
         else:
-            result = save_draft_to_file(
+            result = await asyncio.to_thread(
+                save_draft_to_file,
                 title=seo_title,
                 body=final_content,
                 tags=tags,
@@ -172,9 +403,14 @@ def publish(state: BlogState) -> dict:
         result = {"success": False, "url": None}
         log_msg = f"❌ [Publish] 발행 실패: {e}"
 
+    # 다음 실행에서 같은 이야기를 다시 고르지 않도록 기록 (아웃박스 경로는 전달 완료 후 워커가 기록)
+    if result.get("success") and not result.get("queued") and dedup.covered_index is not None:
+        await asyncio.to_thread(dedup.covered_index.record, state.get("topic") or seo_title, state.get("source_item"))
+
     return {
-        "final_draft":  final_content,
+        "final_draft":  await astore_text(final_content),
         "velog_url":    result.get("url"),
-        "is_published": result.get("success", False) and settings.auto_publish,
+        "is_published": result.get("success", False) and settings.auto_publish and not result.get("queued"),
+        "outbox_id":    outbox_id,
         "logs":         [log_msg],
     }
@@ -0,0 +1,84 @@
+import re
+from .document import section_body
+
+
+# ── 로컬 품질 게이트 ─────────────────────────────────────────────────────────
+#
+#  LLM 검토 전에 규칙만으로 초안을 채점합니다. (LLM 호출 없음, 결정적)
+#   - 섹션마다 ## 헤딩이 있는가
+#   - 섹션 본문이 min_chars 이상인가
+#   - SEO 키워드가 본문 어딘가에 모두 들어 있는가
+#   - 코드 블록이 하나 이상 있는가
+#
+#  10점에서 문제마다 감점하고, 문제가 있는 섹션에는 revise가 바로 쓸 수 있는 피드백을 남깁니다.
+#
+HEADING_PENALTY = 1         # 섹션당 (최대 3)
+SHORT_PENALTY = 1           # 섹션당 (최대 3)
+KEYWORD_PENALTY = 1         # 누락 키워드당 (최대 3)
+CODE_PENALTY = 2
+MAX_PER_RULE = 3
+
+
+def heuristic_check(sections: list, seo_keywords: list[str], min_chars: int = 400) -> dict:
+    """
+    {"score": 1~10, "issues": [문제 요약], "section_feedback": [{"index", "feedback"}]}
+    """
+    bodies = [section_body(section) for section in sections]
+    feedback: dict[int, list[str]] = {}
+    issues: list[str] = []
+
+    if not bodies:
+        return {"score": 1, "issues": ["작성된 섹션 없음"], "section_feedback": []}
+
+    missing_heading = [i for i, body in enumerate(bodies) if not re.search(r"^##\s+\S", body, re.MULTILINE)]
+    for i in missing_heading:
+        feedback.setdefault(i, []).append("## 헤딩으로 섹션을 시작할 것")
+    if missing_heading:
+        issues.append(f"헤딩 없는 섹션 {len(missing_heading)}개")
+
+    short = [i for i, body in enumerate(bodies) if len(body) < min_chars]
+    for i in short:
+        feedback.setdefault(i, []).append(
+            f"본문이 {len(bodies[i])}자로 짧음 → {min_chars}자 이상으로 구체적인 예시·수치를 보강할 것"
+        )
+    if short:
+        issues.append(f"{min_chars}자 미만 섹션 {len(short)}개")
+
+    text = "\n".join(bodies).lower()
+    missing_keywords = [k for k in seo_keywords if k.strip() and k.lower() not in text]
+    if missing_keywords:
+        # 키워드가 가장 적게 들어간 섹션에 보강 요청 (동점이면 앞 섹션)
+        hits = [sum(body.lower().count(k.lower()) for k in seo_keywords) for body in bodies]
+        target = hits.index(min(hits))
+        feedback.setdefault(target, []).append(
+            "SEO 키워드 누락: " + ", ".join(missing_keywords) + " → 자연스럽게 포함할 것"
+        )
+        issues.append(f"SEO 키워드 {len(missing_keywords)}개 누락")
+
+    has_code = "```" in text
+    if not has_code:
+        # 도입·맺음말을 제외한 가장 긴 본문 섹션에 코드 예시 요청
+        candidates = range(1, len(bodies) - 1) if len(bodies) > 2 else range(len(bodies))
+        target = max(candidates, key=lambda i: len(bodies[i]))
+        feedback.setdefault(target, []).append("코드 블록 없음 → 실행 가능한 코드 예시를 추가할 것")
+        issues.append("코드 블록 없음")
+
+    penalty = (
+        HEADING_PENALTY * min(len(missing_heading), MAX_PER_RULE)
+        + SHORT_PENALTY * min(len(short), MAX_PER_RULE)
+        + KEYWORD_PENALTY * min(len(missing_keywords), MAX_PER_RULE)
+        + (0 if has_code else CODE_PENALTY)
+    )
+    return {
+        "score":            max(1, 10 - penalty),
+        "issues":           issues,
+        "section_feedback": [{"index": i, "feedback": " / ".join(feedback[i])} for i in sorted(feedback)],
+    }
+
+
+def combine_feedback(llm_feedback: list[dict], local_feedback: list[dict]) -> list[dict]:
+    """LLM 섹션 피드백과 로컬 피드백을 섹션별로 합칩니다."""
+    merged: dict[int, list[str]] = {}
+    for item in [*llm_feedback, *local_feedback]:
+        merged.setdefault(item["index"], []).append(item["feedback"])
+    return [{"index": i, "feedback": " / ".join(merged[i])} for i in sorted(merged)]
@@ -0,0 +1,224 @@
+import asyncio
+import re
+import time
+from typing import Optional
+
+
+# ── Gemini 호출 조율 ─────────────────────────────────────────────────────────
+#
+#  여러 세션의 노드가 동시에 LLM을 부르면 쿼터(RPM / TPM)를 넘어 429가 쏟아집니다.
+#  complete()는 모든 호출 전에 LLMRateLimiter.acquire()로 자리를 받습니다.
+#
+#  1. 토큰 버킷 2개 (요청/분, 토큰/분): 쿼터를 넘지 않도록 호출 시작 시점을 늦춤
+#  2. AIMD 동시 실행 상한: 성공하면 조금씩(+1/limit) 늘리고,
+#     429면 절반으로, 응답이 목표 지연보다 느리면 10%씩 줄임
+#
+#  자리가 없으면 실패시키지 않고 들어온 순서대로 기다리게 합니다.
+#
+class TokenBucket:
+    """분당 capacity만큼 채워지는 토큰 버킷 (잔량이 음수가 되면 그만큼 더 기다림)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 꺼내려면 몇 초 기다려야 하는지 (0이면 바로 가능)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """예상치와 실제 사용량의 차이를 반영 (음수 잔량 허용)"""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def drain(self) -> None:
+        """429를 받으면 잔량을 비워 다른 호출도 잠시 멈추게 함"""
+        self.tokens = min(self.tokens, 0.0)
+
+
+class LLMRateLimiter:
+    """프로세스 전역 LLM 호출 조율기 (토큰 버킷 + AIMD 동시 실행 상한)"""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        initial_concurrency: float = 4,
+        min_concurrency: float = 1,
+        max_concurrency: float = 16,
+        latency_target: float = 30.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = float(min_concurrency)
+        self.max_concurrency = float(max_concurrency)
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.waiting = 0
+        self.throttled = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._turn: Optional[asyncio.Lock] = None          # 대기열 맨 앞 1명만 자리를 기다림 (FIFO)
+        self._released: Optional[asyncio.Condition] = None
+
+    def _bind_loop(self) -> None:
+        # asyncio 동기화 객체는 이벤트 루프에 묶이므로 루프가 바뀌면(테스트 / 벤치마크) 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._turn = asyncio.Lock()
+            self._released = asyncio.Condition()
+            self.in_flight = 0
+            self.waiting = 0
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """
+        호출 자리를 받을 때까지 기다립니다. 반환값(시작 시각)은 release()에 넘깁니다.
+        """
+        self._bind_loop()
+        self.waiting += 1
+        holding = False
+        try:
+            async with self._turn:
+                # 1) 동시 실행 상한
+                async with self._released:
+                    await self._released.wait_for(lambda: self.in_flight < int(self.limit))
+                    self.in_flight += 1
+                    holding = True
+                # 2) 쿼터 (기다리는 동안에도 자리는 잡아 둠 → 뒤 호출이 추월하지 못함)
+                while True:
+                    now = time.monotonic()
+                    wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(estimated_tokens, now))
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                self.requests.take(1)
+                self.tokens.take(estimated_tokens)
+        except BaseException:
+            if holding:
+                await self._release_slot()
+            raise
+        finally:
+            self.waiting -= 1
+        return time.monotonic()
+
+    async def release(
+        self,
+        started: float,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        throttled: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """
+        호출이 끝나면 결과(성공 지연 / 429)로 동시 실행 상한을 조정하고 자리를 돌려줍니다.
+        failed=True(5xx·타임아웃·취소)면 쿼터와 무관한 실패라 상한은 그대로 두고 자리만 돌려줍니다.
+        """
+        if throttled:
+            self.throttled += 1
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self.requests.drain()
+        elif not failed:
+            latency = time.monotonic() - started
+            if latency > self.latency_target:
+                self.limit = max(self.min_concurrency, self.limit * 0.9)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            if used_tokens is not None:
+                self.tokens.adjust(used_tokens - estimated_tokens)
+        await self._release_slot()
+
+    async def _release_slot(self) -> None:
+        async with self._released:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._released.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight":         self.in_flight,
+            "waiting":           self.waiting,
+            "throttled":         self.throttled,
+        }
+
+
+# ── 오류 분류 ────────────────────────────────────────────────────────────────
+#
+#  SDK마다 예외 타입이 달라(google-genai / langchain-google-genai / google-api-core)
+#  상태 코드 → gRPC 상태 이름 → 예외 타입 이름 순으로 판별합니다.
+#  메시지는 429 / RESOURCE_EXHAUSTED가 단어로 들어 있을 때만 봅니다. (오류 문구의 숫자·단어에 걸리지 않도록)
+#
+TRANSIENT_STATUS = {500, 502, 503, 504}
+RATE_LIMITED_NAMES = {"RESOURCE_EXHAUSTED"}
+TRANSIENT_NAMES = {"UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL"}
+RATE_LIMITED_TYPES = {"ModelRateLimitError", "ResourceExhausted", "TooManyRequests", "RateLimitError"}
+TRANSIENT_TYPES = {
+    "ModelAPIError", "ServiceUnavailable", "InternalServerError",
+    "GatewayTimeout", "DeadlineExceeded", "BadGateway",
+}
+_RATE_LIMITED_MESSAGE = re.compile(r"\b429\b|\bRESOURCE_EXHAUSTED\b")
+
+
+def _status_codes(error: Exception) -> set[int]:
+    codes = set()
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        value = _safe_call(value) if callable(value) else value
+        if isinstance(value, int) and not isinstance(value, bool):
+            codes.add(value)
+    return codes
+
+
+def _status_names(error: Exception) -> set[str]:
+    """gRPC 상태 이름 (google-genai의 .status 문자열, grpc의 .code() StatusCode)"""
+    names = set()
+    status = getattr(error, "status", None)
+    if isinstance(status, str):
+        names.add(status)
+    code = getattr(error, "code", None)
+    code = _safe_call(code) if callable(code) else code
+    if isinstance(getattr(code, "name", None), str):
+        names.add(code.name)
+    return names
+
+
+def _type_names(error: Exception) -> set[str]:
+    return {cls.__name__ for cls in type(error).__mro__}
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Gemini 429 / RESOURCE_EXHAUSTED 여부"""
+    if 429 in _status_codes(error) or _status_names(error) & RATE_LIMITED_NAMES:
+        return True
+    if _type_names(error) & RATE_LIMITED_TYPES:
+        return True
+    return bool(_RATE_LIMITED_MESSAGE.search(str(error)))
+
+
+def is_transient(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 서버 오류(5xx) / 타임아웃 여부 (429 제외)"""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)) or "Timeout" in type(error).__name__:
+        return True
+    codes = _status_codes(error)
+    if codes:
+        return bool(codes & TRANSIENT_STATUS)
+    if _status_names(error) & TRANSIENT_NAMES:
+        return True
+    return bool(_type_names(error) & TRANSIENT_TYPES)
+
+
+def _safe_call(fn) -> Optional[int]:
+    try:
+        return fn()
+    except Exception:
+        return None
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from ..config import settings
+
+
+# ── 내용 주소 기반 블롭 저장소 ────────────────────────────────────────────────
+#
+#  STATE_BLOB_MODE=true면 섹션 본문·최종 초안·RSS 아이템 같은 큰 값은 파일로 저장하고
+#  State에는 "blob:<sha256>" 핸들만 남깁니다.
+#  체크포인터는 노드마다 State 전체를 스냅샷하므로, 글 본문을 매번 복사하는 대신
+#  70바이트 남짓한 핸들만 직렬화하게 됩니다. 같은 내용은 한 번만 저장됩니다.
+#
+HANDLE_PREFIX = "blob:"
+
+
+def is_handle(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(HANDLE_PREFIX) and len(value) == len(HANDLE_PREFIX) + 64
+
+
+class BlobStore:
+    """
+    파일 기반 블롭 저장소 (root/ab/abcdef... 형태, 최근 사용 블롭은 메모리에 보관)
+    """
+
+    def __init__(self, root: str, memory_entries: int = 256):
+        self.root = root
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _remember(self, digest: str, text: str) -> None:
+        with self._lock:
+            self._memory[digest] = text
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def put(self, text: str) -> str:
+        """텍스트를 저장하고 핸들을 반환합니다. (이미 있으면 쓰지 않고 수정 시각만 갱신)"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        self._remember(digest, text)
+        return HANDLE_PREFIX + digest
+
+    def get(self, handle: str) -> str:
+        """핸들의 내용을 반환합니다. (읽을 때도 수정 시각을 갱신해 prune 대상에서 빠짐)"""
+        digest = handle[len(HANDLE_PREFIX):]
+        path = self._path(digest)
+        with self._lock:
+            text = self._memory.get(digest)
+            if text is not None:
+                self._memory.move_to_end(digest)
+        if text is not None:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass    # 이미 prune된 블롭 (메모리 사본은 그대로 사용)
+            return text
+        os.utime(path)
+        with open(path, "rb") as f:
+            text = f.read().decode("utf-8")
+        self._remember(digest, text)
+        return text
+
+    def prune(self, referenced: set[str], grace: float, now: Optional[float] = None) -> int:
+        """
+        남은 체크포인트가 참조하지 않는 블롭을 삭제합니다. (mark & sweep의 sweep, referenced가 mark 결과)
+        체크포인트에 아직 기록되지 않은 블롭(실행 중인 노드가 방금 저장)을 지우지 않도록
+        grace초 안에 쓰이거나 읽힌 블롭은 남깁니다.
+        """
+        now = now if now is not None else time.time()
+        removed = 0
+        if not os.path.isdir(self.root):
+            return 0
+        for shard in os.listdir(self.root):
+            shard_path = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                path = os.path.join(shard_path, name)
+                if name in referenced:
+                    continue
+                if now - os.path.getmtime(path) > grace:
+                    os.remove(path)
+                    removed += 1
+                    with self._lock:
+                        self._memory.pop(name, None)
+        return removed
+
+
+blob_store = BlobStore(settings.blob_path)
+
+
+# ── State 값 저장 / 복원 ─────────────────────────────────────────────────────
+#
+#  노드는 큰 값을 State에 넣을 때 store_*, 읽을 때 load_*를 거칩니다.
+#  STATE_BLOB_MODE=false거나 값이 작으면 그대로 통과하므로 두 모드를 같은 코드로 처리합니다.
+#
+def store_text(text: Optional[str]) -> Optional[str]:
+    if not settings.state_blob_mode or text is None or len(text) < settings.blob_min_size:
+        return text
+    return blob_store.put(text)
+
+
+def load_text(value: Optional[str]) -> Optional[str]:
+    return blob_store.get(value) if is_handle(value) else value
+
+
+def store_json(value: Any) -> Any:
+    if not settings.state_blob_mode or not value:
+        return value
+    return blob_store.put(json.dumps(value, ensure_ascii=False))
+
+
+def load_json(value: Any) -> Any:
+    return json.loads(blob_store.get(value)) if is_handle(value) else value
+
+
+# ── 비동기 노드용 ────────────────────────────────────────────────────────────
+#
+#  노드는 이벤트 루프에서 돌기 때문에 블롭 파일 읽기·쓰기는 스레드에서 처리합니다.
+#  디스크를 건드릴 일이 없으면(블롭 모드 꺼짐·작은 값·핸들 아님) 스레드를 거치지 않습니다.
+#
+async def astore_text(text: Optional[str]) -> Optional[str]:
+    if not settings.state_blob_mode or text is None or len(text) < settings.blob_min_size:
+        return text
+    return await asyncio.to_thread(blob_store.put, text)
+
+
+async def astore_json(value: Any) -> Any:
+    if not settings.state_blob_mode or not value:
+        return value
+    return await asyncio.to_thread(store_json, value)
+
+
+async def aload_json(value: Any) -> Any:
+    return await asyncio.to_thread(load_json, value) if is_handle(value) else value
+
+
+def _section_handle(section: Any) -> Any:
+    return section.get("body") if isinstance(section, dict) else section
+
+
+def load_sections(sections: list) -> list:
+    """섹션 본문 핸들을 원래 내용으로 바꾼 사본 (history는 그대로)"""
+    return [
+        {**section, "body": load_text(section.get("body"))} if isinstance(section, dict) else load_text(section)
+        for section in sections
+    ]
+
+
+async def aload_sections(sections: list) -> list:
+    """
+    노드 시작 시 섹션 본문을 한 번에 읽어 둡니다.
+    반환된 사본에는 핸들이 없으므로 이후 section_body / render_* 는 디스크를 읽지 않습니다.
+    """
+    if not any(is_handle(_section_handle(section)) for section in sections):
+        return list(sections)
+    return await asyncio.to_thread(load_sections, sections)
+
+
+def _resolve_section(section: Any) -> Any:
+    if not isinstance(section, dict):
+        return load_text(section)
+    return {
+        **section,
+        "body":    load_text(section.get("body")),
+        "history": [load_text(body) for body in section.get("history") or []],
+    }
+
+
+def resolve_state(values: dict) -> dict:
+    """API 응답용: 핸들로 저장된 값을 원래 내용으로 바꾼 State 사본"""
+    resolved = dict(values)
+    if "final_draft" in resolved:
+        resolved["final_draft"] = load_text(resolved["final_draft"])
+    if "sections" in resolved:
+        resolved["sections"] = [_resolve_section(s) for s in resolved["sections"] or []]
+    for key in ("rss_items", "search_hits"):
+        if key in resolved:
+            resolved[key] = load_json(resolved[key])
+    return resolved
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import time
+from typing import Any, Optional
+from .sqlite_store import SQLiteStore
+
+
+class SQLiteCache(SQLiteStore):
+    """
+    SQLite 기반 영속 키-값 캐시
+
+    - ttl:         저장 후 ttl초가 지나면 만료
+    - max_entries: 개수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+    - 값은 JSON으로 직렬화해서 저장
+    - hits / misses 카운터 제공
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache (
+            key         TEXT PRIMARY KEY,
+            value       TEXT NOT NULL,
+            created_at  REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at);
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl,))
+        (size,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = size - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
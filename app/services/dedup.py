@@ -0,0 +1,131 @@
+import hashlib
+import re
+import sqlite3
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from ..config import settings
+from .sqlite_store import SQLiteStore
+
+
+# ── 제목 SimHash ─────────────────────────────────────────────────────────────
+#
+#  제목을 정규화한 뒤 글자 3-gram(shingle)마다 64비트 해시를 더해 만든 지문입니다.
+#  대소문자·구두점·단어 몇 개 차이 정도는 해밍 거리가 작게 나와
+#  피드마다 조금씩 다른 같은 기사 제목을 같은 이야기로 볼 수 있습니다.
+#
+SIMHASH_BITS = 64
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    text = normalize_title(text)
+    if not text:
+        return 0
+    grams = [text[i:i + shingle] for i in range(max(1, len(text) - shingle + 1))]
+
+    weights = [0] * SIMHASH_BITS
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def normalize_url(url: str) -> str:
+    """추적 파라미터(utm_* 등)·fragment·끝 슬래시 차이를 무시한 URL"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query) if not (k.lower().startswith("utm_") or k.lower() == "ref")]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", parts.netloc.lower().removeprefix("www."), path, urlencode(query), ""))
+
+
+class CoveredIndex(SQLiteStore):
+    """
+    이미 다룬 이야기 인덱스 (SQLite)
+
+    - 발행(또는 초안 저장)까지 끝난 글의 주제와 원본 RSS 아이템(URL, 제목 SimHash)을 기록
+    - 다음 실행의 collect에서 같은 URL이거나 제목이 비슷한(해밍 거리 ≤ max_distance) 아이템을
+      LLM 프롬프트에 넣기 전에 걸러냄
+    - retention_days가 지난 기록은 다시 다룰 수 있도록 삭제
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS covered (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind        TEXT NOT NULL,      -- item | topic
+            url         TEXT,
+            title       TEXT NOT NULL,
+            simhash     TEXT NOT NULL,      -- 16자리 hex (SQLite INTEGER는 부호 있는 64비트)
+            recorded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_covered_url ON covered(url);
+    """
+
+    def __init__(self, path: str, max_distance: int = 8, retention_days: float = 30):
+        super().__init__(path)
+        self.max_distance = max_distance
+        self.retention = retention_days * 24 * 3600
+
+    def _fingerprints(self, conn: sqlite3.Connection, now: float) -> tuple[set[str], list[int]]:
+        conn.execute("DELETE FROM covered WHERE recorded_at < ?", (now - self.retention,))
+        rows = conn.execute("SELECT url, simhash FROM covered").fetchall()
+        urls = {url for url, _ in rows if url}
+        hashes = [int(h, 16) for _, h in rows]
+        return urls, hashes
+
+    def filter_new(self, items: list[dict]) -> tuple[list[dict], list[dict]]:
+        """아이템을 (새 아이템, 이미 다룬 아이템)으로 나눕니다."""
+        with self._lock:
+            conn = self._connect()
+            urls, hashes = self._fingerprints(conn, time.time())
+            conn.commit()
+
+        fresh, covered = [], []
+        for item in items:
+            url = normalize_url(item.get("url", ""))
+            h = simhash(item.get("title", ""))
+            if (url and url in urls) or (h and any(hamming(h, seen) <= self.max_distance for seen in hashes)):
+                covered.append(item)
+            else:
+                fresh.append(item)
+        return fresh, covered
+
+    def record(self, topic: str, source_item: Optional[dict] = None) -> None:
+        """발행한 글의 주제와 원본 아이템을 기록합니다."""
+        now = time.time()
+        rows = [("topic", None, topic, f"{simhash(topic):016x}", now)]
+        if source_item:
+            title = source_item.get("title", "")
+            rows.append(("item", normalize_url(source_item.get("url", "")) or None, title, f"{simhash(title):016x}", now))
+
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO covered (kind, url, title, simhash, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._connect().execute("SELECT kind, COUNT(*) FROM covered GROUP BY kind").fetchall()
+        return {kind: count for kind, count in rows}
+
+
+# 프로세스 전역 인덱스 (DEDUP_ENABLED=false면 걸러내지 않음)
+covered_index = CoveredIndex(
+    settings.dedup_path,
+    max_distance=settings.dedup_max_distance,
+    retention_days=settings.dedup_retention_days,
+) if settings.dedup_enabled else None
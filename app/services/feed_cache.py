@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class FeedCache:
+    """
+    피드 URL 단위 조건부 요청(ETag / Last-Modified) 캐시.
+
+    저장 형식 (JSON 파일):
+    {
+        "https://...": {
+            "etag": "\\"abc\\"",
+            "last_modified": "Wed, 19 Feb 2025 09:00:00 GMT",
+            "items": [...],            # 파싱이 끝난 아이템
+            "fetched_at": "2025-02-19T09:00:00+00:00"
+        },
+        ...
+    }
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[dict] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            return self._load().get(url)
+
+    def conditional_headers(self, url: str) -> dict:
+        """저장된 검증자로 조건부 요청 헤더를 만듭니다."""
+        entry = self.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], items: list[dict]) -> None:
+        with self._lock:
+            self._load()[url] = {
+                "etag":          etag,
+                "last_modified": last_modified,
+                "items":         items,
+                "fetched_at":    datetime.now(timezone.utc).isoformat(),
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """임시 파일에 쓴 뒤 교체해 중간에 끊겨도 캐시 파일이 깨지지 않게 합니다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from typing import Optional
+from ..config import settings
+from . import dedup
+from .sqlite_store import SQLiteStore
+
+
+# ── 발행 아웃박스 ─────────────────────────────────────────────────────────────
+#
+#  publish 노드는 완성된 글을 여기에 적기만 하고 바로 끝납니다.
+#  실제 Velog 전송은 OutboxDelivery 워커가 따로 처리하므로
+#  Velog 장애·레이트 리밋이 글 생성 파이프라인을 막거나 실패시키지 않습니다.
+#
+#  상태: queued → sending → delivered
+#                         ↘ queued (재시도 대기, next_attempt_at 이후)
+#                         ↘ failed (max_attempts 초과, /outbox/{id}/requeue로 재시도)
+#
+class Outbox(SQLiteStore):
+    """SQLite 기반 영속 발행 대기열 (세션당 1건)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id               TEXT PRIMARY KEY,
+            session_id       TEXT NOT NULL UNIQUE,
+            title            TEXT NOT NULL,
+            body             TEXT NOT NULL,
+            tags             TEXT NOT NULL,      -- JSON 배열
+            meta_description TEXT NOT NULL,
+            topic            TEXT,               -- 전달 완료 후 "다룬 이야기"로 기록할 주제
+            source_item      TEXT,               -- 원본 RSS 아이템(JSON)
+            status           TEXT NOT NULL,      -- queued | sending | delivered | failed
+            attempts         INTEGER NOT NULL DEFAULT 0,
+            last_error       TEXT,
+            result           TEXT,               -- 발행 결과(JSON)
+            next_attempt_at  REAL NOT NULL,
+            created_at       REAL NOT NULL,
+            updated_at       REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+    """
+    ROW_FACTORY = sqlite3.Row
+
+    def enqueue(
+        self,
+        session_id: str,
+        title: str,
+        body: str,
+        tags: list[str],
+        meta_description: str = "",
+        topic: Optional[str] = None,
+        source_item: Optional[dict] = None,
+    ) -> str:
+        """
+        글을 대기열에 넣고 id를 반환합니다.
+        같은 세션이 다시 들어오면(재개·재시도) 새로 만들지 않고 기존 id를 돌려줍니다.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                """INSERT OR IGNORE INTO outbox
+                   (id, session_id, title, body, tags, meta_description, topic, source_item,
+                    status, next_attempt_at, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'queued', ?, ?, ?)""",
+                (str(uuid.uuid4()), session_id, title, body, json.dumps(tags, ensure_ascii=False),
+                 meta_description, topic, json.dumps(source_item, ensure_ascii=False) if source_item else None,
+                 now, now, now),
+            )
+            conn.commit()
+            (entry_id,) = conn.execute("SELECT id FROM outbox WHERE session_id = ?", (session_id,)).fetchone()
+        return entry_id
+
+    def claim_due(self, now: Optional[float] = None) -> Optional[dict]:
+        """전송할 차례가 된 가장 오래된 글 1건을 sending으로 바꾸고 반환합니다."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT * FROM outbox WHERE status = 'queued' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at, created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
+            conn.commit()
+        entry = self._to_dict(row, with_body=True)
+        entry["attempts"] += 1
+        return entry
+
+    def mark_delivered(self, entry_id: str, result: dict) -> None:
+        self._update(entry_id, status="delivered", result=json.dumps(result, ensure_ascii=False), last_error=None)
+
+    def mark_failed(self, entry_id: str, error: str, retry_at: Optional[float] = None) -> None:
+        """retry_at이 있으면 그때 다시 시도(queued), 없으면 failed로 멈춤"""
+        if retry_at is None:
+            self._update(entry_id, status="failed", last_error=error)
+        else:
+            self._update(entry_id, status="queued", last_error=error, next_attempt_at=retry_at)
+
+    def requeue(self, entry_id: str) -> Optional[dict]:
+        """실패한 글을 시도 횟수를 초기화해 즉시 다시 보냅니다. (없으면 None)"""
+        entry = self.get(entry_id)
+        if entry is None:
+            return None
+        if entry["status"] in ("failed", "queued"):
+            self._update(entry_id, status="queued", attempts=0, next_attempt_at=time.time())
+        return self.get(entry_id)
+
+    def recover(self) -> int:
+        """프로세스가 전송 중에 죽어 sending으로 남은 글을 다시 대기열로 돌립니다. (시작 시 호출)"""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE outbox SET status = 'queued', updated_at = ? WHERE status = 'sending'", (time.time(),)
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def get(self, entry_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def get_by_session(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM outbox WHERE session_id = ?", (session_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> list[dict]:
+        with self._lock:
+            conn = self._connect()
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM outbox WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM outbox ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # ── 내부 ──────────────────────────────────────────────────────
+    def _update(self, entry_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"UPDATE outbox SET {assignments} WHERE id = ?", (*fields.values(), entry_id))
+            conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, with_body: bool = False) -> dict:
+        entry = {
+            "id":              row["id"],
+            "session_id":      row["session_id"],
+            "title":           row["title"],
+            "status":          row["status"],
+            "attempts":        row["attempts"],
+            "last_error":      row["last_error"],
+            "result":          json.loads(row["result"]) if row["result"] else None,
+            "next_attempt_at": row["next_attempt_at"],
+            "created_at":      row["created_at"],
+            "updated_at":      row["updated_at"],
+        }
+        if with_body:
+            entry["body"] = row["body"]
+            entry["tags"] = json.loads(row["tags"])
+            entry["meta_description"] = row["meta_description"]
+            entry["topic"] = row["topic"]
+            entry["source_item"] = json.loads(row["source_item"]) if row["source_item"] else None
+        return entry
+
+
+class OutboxDelivery:
+    """
+    아웃박스를 비우는 백그라운드 워커 (1개 태스크)
+
+    - 전송 간격을 60 / rate_per_minute초 이상으로 유지 (Velog 레이트 리밋 보호)
+    - 실패하면 backoff × 2^(시도-1)초 뒤 재시도, max_attempts번 실패하면 failed
+    - publisher.publish는 세션 단위로 멱등이라 재시도해도 중복 발행되지 않음
+    - 전달이 끝난 글만 "다룬 이야기"로 기록 (failed로 끝난 이야기는 다음 실행에서 다시 후보)
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        publisher,
+        rate_per_minute: float = 10,
+        max_attempts: int = 5,
+        backoff: float = 30.0,
+        poll_interval: float = 2.0,
+    ):
+        self.outbox = outbox
+        self.publisher = publisher
+        self.min_interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_sent = 0.0
+
+    # ── 수명 주기 ─────────────────────────────────────────────────
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        """새 글이 들어왔거나 재시도를 요청했을 때 대기 중인 워커를 깨웁니다."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ── 전송 ──────────────────────────────────────────────────────
+    async def deliver_once(self) -> Optional[dict]:
+        """차례가 된 글 1건을 전송합니다. 보낼 글이 없으면 None"""
+        entry = await asyncio.to_thread(self.outbox.claim_due)
+        if entry is None:
+            return None
+
+        wait = self._last_sent + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_sent = time.monotonic()
+
+        try:
+            result = await self.publisher.publish(
+                title=entry["title"],
+                body=entry["body"],
+                tags=entry["tags"],
+                meta_description=entry["meta_description"],
+                session_id=entry["session_id"],
+            )
+        except Exception as e:
+            retry_at = None
+            if entry["attempts"] < self.max_attempts:
+                retry_at = time.time() + self.backoff * 2 ** (entry["attempts"] - 1)
+            await asyncio.to_thread(self.outbox.mark_failed, entry["id"], str(e), retry_at)
+            print(f"❌ [Outbox] '{entry['title']}' 전송 실패 ({entry['attempts']}회): {e}")
+        else:
+            await asyncio.to_thread(self.outbox.mark_delivered, entry["id"], result)
+            print(f"🚀 [Outbox] Velog 발행 완료: {result.get('url')}")
+            if dedup.covered_index is not None:
+                await asyncio.to_thread(
+                    dedup.covered_index.record, entry["topic"] or entry["title"], entry["source_item"],
+                )
+        return await asyncio.to_thread(self.outbox.get, entry["id"])
+
+    async def _run(self) -> None:
+        await asyncio.to_thread(self.outbox.recover)
+        while True:
+            delivered = await self.deliver_once()
+            if delivered is not None:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# 프로세스 전역 아웃박스 (PUBLISH_OUTBOX=false면 publish 노드가 직접 발행)
+outbox = Outbox(settings.outbox_path)
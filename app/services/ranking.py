@@ -0,0 +1,121 @@
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+from .dedup import hamming, simhash
+
+
+# ── RSS 아이템 로컬 랭킹 ─────────────────────────────────────────────────────
+#
+#  주제 선정 프롬프트에 넣기 전에 LLM 없이 아이템을 점수화해 상위 k개만 남깁니다.
+#
+#  점수 = (최신성 + 관심사 관련도 + 교차 피드 보너스) × 출처 가중치
+#   - 최신성:     published 기준 반감기(half_life_hours)로 감소 (날짜 없으면 중간값)
+#   - 관련도:     관심사 키워드와 아이템(제목 + 요약)의 TF-IDF 코사인 유사도
+#   - 교차 피드:  제목 SimHash가 비슷한 아이템은 같은 이야기로 묶고, 여러 피드에 실린 만큼 가산
+#
+RECENCY_WEIGHT = 1.0
+RELEVANCE_WEIGHT = 2.0
+CLUSTER_WEIGHT = 0.5
+UNKNOWN_RECENCY = 0.5
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in re.findall(r"\w+", text.lower()) if len(t) > 1]
+
+
+def _recency(published: str, now: datetime, half_life_hours: float) -> float:
+    if not published:
+        return UNKNOWN_RECENCY
+    try:
+        when = datetime.fromisoformat(published)
+    except ValueError:
+        return UNKNOWN_RECENCY
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    age_hours = max(0.0, (now - when).total_seconds() / 3600)
+    return 0.5 ** (age_hours / half_life_hours)
+
+
+def _tfidf(docs: list[list[str]]) -> tuple[list[dict[str, float]], dict[str, float]]:
+    """문서별 TF-IDF 벡터와 IDF 표 (관심사 벡터도 같은 IDF로 만들기 위해 함께 반환)"""
+    df = Counter(token for doc in docs for token in set(doc))
+    n = len(docs)
+    idf = {token: math.log((1 + n) / (1 + count)) + 1 for token, count in df.items()}
+    vectors = []
+    for doc in docs:
+        tf = Counter(doc)
+        vectors.append({token: count * idf[token] for token, count in tf.items()})
+    return vectors, idf
+
+
+def _cosine(a: dict[str, float], b: dict[str, float]) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(weight * b.get(token, 0.0) for token, weight in a.items())
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def rank_items(
+    items: list[dict],
+    top_k: int,
+    interests: list[str],
+    source_weights: Optional[dict[str, float]] = None,
+    half_life_hours: float = 24.0,
+    cluster_distance: int = 8,
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """
+    아이템을 점수 순으로 정렬해 상위 top_k개를 반환합니다.
+    같은 이야기로 묶인 아이템은 대표 1개만 남기고, 대표에는 "also_in"(다른 출처 목록)을 붙입니다.
+    """
+    if not items:
+        return []
+    now = now or datetime.now(timezone.utc)
+    source_weights = source_weights or {}
+
+    docs = [_tokens(f"{item.get('title', '')} {item.get('summary', '')}") for item in items]
+    vectors, idf = _tfidf(docs)
+    profile = Counter(token for keyword in interests for token in _tokens(keyword))
+    # 코퍼스에 없는 관심사 단어는 어차피 유사도에 기여하지 않음
+    profile_vector = {token: count * idf[token] for token, count in profile.items() if token in idf}
+
+    # 교차 피드 클러스터링 (제목 SimHash, 먼저 나온 아이템이 클러스터 기준)
+    hashes = [simhash(item.get("title", "")) for item in items]
+    cluster_of: list[int] = []
+    for i, h in enumerate(hashes):
+        cluster = next(
+            (cluster_of[j] for j in range(i) if h and hamming(h, hashes[j]) <= cluster_distance),
+            i,
+        )
+        cluster_of.append(cluster)
+
+    members: dict[int, list[int]] = {}
+    for i, cluster in enumerate(cluster_of):
+        members.setdefault(cluster, []).append(i)
+
+    scored = []
+    for indices in members.values():
+        sources = {items[i].get("source", "") for i in indices}
+        best_score, best = -1.0, indices[0]
+        for i in indices:
+            item = items[i]
+            score = (
+                RECENCY_WEIGHT * _recency(item.get("published", ""), now, half_life_hours)
+                + RELEVANCE_WEIGHT * _cosine(vectors[i], profile_vector)
+                + CLUSTER_WEIGHT * math.log(len(sources))
+            ) * source_weights.get(item.get("source", ""), 1.0)
+            if score > best_score:
+                best_score, best = score, i
+
+        representative = dict(items[best])
+        others = sorted(sources - {representative.get("source", "")})
+        if others:
+            representative["also_in"] = others
+        scored.append((best_score, best, representative))
+
+    # 점수가 같으면 원래 순서 유지
+    scored.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [representative for _, _, representative in scored[:top_k]]
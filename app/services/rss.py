@@ -1,7 +1,11 @@
+import asyncio
+import re
 import feedparser
 import httpx
 from datetime import datetime, timezone
 from typing import Optional
+from ..config import settings
+from .feed_cache import FeedCache
 
 
 # ── AI/Tech RSS 피드 목록 ────────────────────────────────────────────────────
@@ -17,8 +21,73 @@ RSS_FEEDS = [
     {"name": "당근 테크블로그",     "url": "https://medium.com/feed/daangn"},
 ]
 
+# 동시 수집에 쓰는 HTTP 트랜스포트 (None이면 실제 네트워크, 벤치마크에서 로컬 피드로 교체)
+transport: Optional[httpx.AsyncBaseTransport] = None
 
-def fetch_rss_items(max_per_feed: int = 5) -> list[dict]:
+# 조건부 요청 캐시 (FEED_CACHE_ENABLED=false면 매번 전체 다운로드)
+feed_cache = FeedCache(settings.feed_cache_path) if settings.feed_cache_enabled else None
+
+
+def _parse_feed(text: str, feed_info: dict, max_per_feed: Optional[int]) -> list[dict]:
+    """피드 본문을 파싱해 아이템 리스트로 변환합니다."""
+    feed = feedparser.parse(text)
+    items = []
+
+    for entry in feed.entries[:max_per_feed]:
+        # 날짜 파싱
+        published = ""
+        if hasattr(entry, "published_parsed") and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+
+        # 요약 추출 (summary 또는 content)
+        summary = ""
+        if hasattr(entry, "summary"):
+            # HTML 태그 간단 제거
+            summary = re.sub(r"<[^>]+>", "", entry.summary)[:300]
+
+        items.append({
+            "title":     entry.get("title", ""),
+            "summary":   summary,
+            "url":       entry.get("link", ""),
+            "source":    feed_info["name"],
+            "published": published,
+        })
+
+    return items
+
+
+def _request_headers(url: str, cache: Optional[FeedCache]) -> dict:
+    return cache.conditional_headers(url) if cache is not None else {}
+
+
+def _items_from_response(
+    response: httpx.Response,
+    feed_info: dict,
+    max_per_feed: int,
+    cache: Optional[FeedCache],
+) -> list[dict]:
+    """
+    응답을 아이템으로 변환합니다.
+    304면 캐시된 파싱 결과를 그대로 쓰고, 새 응답이면 파싱해서 검증자와 함께 저장합니다.
+    """
+    if cache is None:
+        return _parse_feed(response.text, feed_info, max_per_feed)
+
+    url = feed_info["url"]
+    if response.status_code == 304:
+        cached = cache.get(url)
+        return cached["items"][:max_per_feed] if cached else []
+
+    # 캐시에는 잘리지 않은 전체 아이템을 저장 (max_per_feed가 바뀌어도 재사용 가능)
+    items = _parse_feed(response.text, feed_info, None)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        cache.store(url, etag, last_modified, items)
+    return items[:max_per_feed]
+
+
+def fetch_rss_items(max_per_feed: int = 5, cache: Optional[FeedCache] = None) -> list[dict]:
     """
     등록된 RSS 피드들을 모두 수집하여 아이템 리스트로 반환합니다.
     
@@ -34,38 +103,83 @@ def fetch_rss_items(max_per_feed: int = 5) -> list[dict]:
         ...
     ]
     """
+    cache = cache or feed_cache
     items = []
 
     with httpx.Client(timeout=10.0) as client:
         for feed_info in RSS_FEEDS:
             try:
-                response = client.get(feed_info["url"])
-                feed = feedparser.parse(response.text)
-
-                for entry in feed.entries[:max_per_feed]:
-                    # 날짜 파싱
-                    published = ""
-                    if hasattr(entry, "published_parsed") and entry.published_parsed:
-                        published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
-
-                    # 요약 추출 (summary 또는 content)
-                    summary = ""
-                    if hasattr(entry, "summary"):
-                        # HTML 태그 간단 제거
-                        import re
-                        summary = re.sub(r"<[^>]+>", "", entry.summary)[:300]
-
-                    items.append({
-                        "title":     entry.get("title", ""),
-                        "summary":   summary,
-                        "url":       entry.get("link", ""),
-                        "source":    feed_info["name"],
-                        "published": published,
-                    })
+                response = client.get(feed_info["url"], headers=_request_headers(feed_info["url"], cache))
+                items.extend(_items_from_response(response, feed_info, max_per_feed, cache))
 
             except Exception as e:
                 # 하나의 피드 실패가 전체를 막지 않도록
                 print(f"⚠️ RSS 수집 실패 [{feed_info['name']}]: {e}")
                 continue
 
+    if cache is not None:
+        cache.save()
     return items
+
+
+async def fetch_rss_items_async(
+    max_per_feed: int = 5,
+    deadline: Optional[float] = None,
+    feed_timeout: Optional[float] = None,
+    feeds: Optional[list[dict]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[FeedCache] = None,
+) -> tuple[list[dict], list[str]]:
+    """
+    모든 RSS 피드를 하나의 AsyncClient로 동시에 수집합니다.
+
+    - feed_timeout: 피드 1개당 허용 시간 (초과 시 해당 피드만 제외)
+    - deadline:     전체 수집 마감 시간 (마감까지 끝나지 않은 피드는 제외)
+
+    반환: (아이템 리스트, 시간 내에 끝나지 않아 제외된 피드 이름 리스트)
+    아이템 순서는 완료 순서와 무관하게 RSS_FEEDS 순서를 따릅니다.
+    """
+    feeds = feeds if feeds is not None else RSS_FEEDS
+    deadline = deadline if deadline is not None else settings.rss_fetch_deadline
+    feed_timeout = feed_timeout if feed_timeout is not None else settings.rss_feed_timeout
+    cache = cache or feed_cache
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=feed_timeout, transport=transport)
+
+    async def _fetch_one(feed_info: dict) -> list[dict]:
+        headers = _request_headers(feed_info["url"], cache)
+        response = await asyncio.wait_for(client.get(feed_info["url"], headers=headers), timeout=feed_timeout)
+        return _items_from_response(response, feed_info, max_per_feed, cache)
+
+    try:
+        tasks = [asyncio.create_task(_fetch_one(feed_info)) for feed_info in feeds]
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    items = []
+    late_feeds = []
+    for feed_info, task in zip(feeds, tasks):
+        if task.cancelled():
+            late_feeds.append(feed_info["name"])
+            continue
+        error = task.exception()
+        if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+            late_feeds.append(feed_info["name"])
+        elif error is not None:
+            # 하나의 피드 실패가 전체를 막지 않도록
+            print(f"⚠️ RSS 수집 실패 [{feed_info['name']}]: {error}")
+        else:
+            items.extend(task.result())
+
+    if cache is not None:
+        cache.save()
+    return items, late_feeds
+
@@ -0,0 +1,91 @@
+import asyncio
+import re
+import threading
+from typing import Optional
+from ..config import settings
+from .cache import SQLiteCache
+from ..metrics import record_cache_hit
+
+
+# 같은 날 비슷한 주제의 검색은 결과를 공유 (SEARCH_CACHE_ENABLED=false면 매번 호출)
+search_cache = SQLiteCache(
+    settings.search_cache_path,
+    ttl=settings.search_cache_ttl,
+    max_entries=settings.search_cache_max_entries,
+) if settings.search_cache_enabled else None
+
+_search_tool = None
+_lock = threading.Lock()
+
+# 진행 중인 검색 (같은 쿼리가 동시에 들어오면 API는 한 번만 호출하고 결과를 나눠 씀)
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _get_search_tool():
+    """Tavily 도구는 첫 검색 때 한 번만 만들어 재사용합니다."""
+    global _search_tool
+    if _search_tool is None:
+        with _lock:
+            if _search_tool is None:
+                from langchain_community.tools.tavily_search import TavilySearchResults
+                from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper
+
+                _search_tool = TavilySearchResults(
+                    max_results=settings.search_max_results,
+                    api_wrapper=TavilySearchAPIWrapper(tavily_api_key=settings.tavily_api_key),
+                )
+    return _search_tool
+
+
+def set_search_tool(tool) -> None:
+    """검색 도구를 교체합니다. (벤치마크 / 오프라인 테스트용, None이면 다음 검색 때 Tavily로 재생성)"""
+    global _search_tool
+    _search_tool = tool
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+    대소문자·구두점·공백·단어 순서 차이를 무시합니다.
+    예) "LangGraph  Tutorial!" == "tutorial langgraph"
+    """
+    tokens = re.sub(r"[^\w\s]", " ", query.lower()).split()
+    return " ".join(sorted(set(tokens)))
+
+
+async def search(query: str, cache: Optional[SQLiteCache] = None) -> list[dict]:
+    """
+    Tavily 검색 1회. 캐시에 있거나 같은 쿼리를 이미 검색 중이면 API를 호출하지 않습니다.
+    (배치 생성처럼 여러 파이프라인이 동시에 겹치는 쿼리를 보낼 때 캐시 저장 전 중복 호출 방지)
+
+    반환: [{"title": ..., "content": ..., "url": ...}, ...]
+    """
+    cache = cache or search_cache
+    key = f"{settings.search_max_results}:{normalize_query(query)}"
+
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            record_cache_hit()
+            return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(query, key, cache))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        record_cache_hit()
+    # 먼저 요청한 쪽이 취소돼도 다른 대기자의 검색은 계속 진행
+    return await asyncio.shield(task)
+
+
+async def _fetch(query: str, key: str, cache: Optional[SQLiteCache]) -> list[dict]:
+    results = await _get_search_tool().ainvoke(query)
+    if not isinstance(results, list):
+        # Tavily 오류는 예외 대신 문자열로 돌아오는 경우가 있어 캐시하지 않음
+        raise RuntimeError(str(results))
+
+    if cache is not None:
+        cache.set(key, results)
+    return results
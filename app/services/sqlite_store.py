@@ -0,0 +1,34 @@
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SQLiteStore:
+    """
+    SQLite 파일 하나를 쓰는 저장소의 공통 부분 (캐시·다룬 이야기 인덱스·발행 기록·아웃박스)
+
+    - 첫 사용 시점에 파일을 엽니다. (import만으로는 디스크를 건드리지 않음)
+    - 연결 하나를 여러 스레드(asyncio.to_thread)가 공유하므로 쓰는 쪽은 self._lock 안에서 사용
+    - 하위 클래스는 SCHEMA(CREATE 문)와 필요하면 ROW_FACTORY를 정함
+    """
+
+    SCHEMA = ""
+    ROW_FACTORY = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.ROW_FACTORY is not None:
+                conn.row_factory = self.ROW_FACTORY
+            conn.executescript(self.SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
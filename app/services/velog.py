@@ -1,10 +1,21 @@
+import asyncio
 import httpx
+import json
 import re
+import time
 from typing import Optional
 from ..config import settings
+from ..metrics import record_retry
+from .sqlite_store import SQLiteStore
 
 VELOG_GRAPHQL_URL = "https://v2.velog.io/graphql"
 
+# HTTP 트랜스포트 (None이면 실제 네트워크, 벤치마크에서 로컬 Velog로 교체)
+transport: Optional[httpx.AsyncBaseTransport] = None
+
+# 다시 시도해도 되는 응답 (레이트 리밋 / 일시적 서버 오류)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
 
 def _make_url_slug(title: str) -> str:
     """제목을 Velog URL slug로 변환합니다."""
@@ -15,16 +26,312 @@ def _make_url_slug(title: str) -> str:
     return slug
 
 
-def publish_to_velog(
+# ── GraphQL 문서 ─────────────────────────────────────────────────────────────
+
+WRITE_POST_MUTATION = """
+mutation WritePost($input: WritePostInput!) {
+  writePost(input: $input) {
+    id
+    title
+    url_slug
+    user {
+      username
+    }
+  }
+}
+"""
+
+CURRENT_USER_QUERY = """
+query CurrentUser {
+  currentUser {
+    username
+  }
+}
+"""
+
+POST_QUERY = """
+query Post($username: String, $url_slug: String) {
+  post(username: $username, url_slug: $url_slug) {
+    id
+    url_slug
+    user {
+      username
+    }
+  }
+}
+"""
+
+
+class VelogAPIError(Exception):
+    """GraphQL 응답에 errors가 있거나 재시도할 수 없는 HTTP 오류"""
+
+
+class _RetryableError(Exception):
+    """429 / 5xx / 네트워크 오류 (원래 예외와 Retry-After를 함께 전달)"""
+
+    def __init__(self, error: Exception, retry_after: Optional[str] = None):
+        super().__init__(str(error))
+        self.error = error
+        self.retry_after = retry_after
+
+
+class PublishLog(SQLiteStore):
+    """
+    세션별 발행 시도 기록 (SQLite)
+
+    - 시도마다 slug / 상태(success | error) / URL / 오류를 남김
+    - 이미 성공한 세션은 다시 발행하지 않고 기록된 결과를 돌려주는 멱등성 키로도 사용
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS publish_attempts (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id  TEXT NOT NULL,
+            url_slug    TEXT NOT NULL,
+            status      TEXT NOT NULL,     -- success | error
+            result      TEXT,              -- 성공 시 발행 결과(JSON)
+            error       TEXT,
+            created_at  REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_publish_session ON publish_attempts(session_id);
+    """
+
+    def record(self, session_id: str, url_slug: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO publish_attempts (session_id, url_slug, status, result, error, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    session_id, url_slug, "error" if error else "success",
+                    json.dumps(result, ensure_ascii=False) if result else None, error, time.time(),
+                ),
+            )
+            conn.commit()
+
+    def succeeded(self, session_id: str) -> Optional[dict]:
+        """세션의 성공한 발행 결과 (없으면 None)"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result FROM publish_attempts WHERE session_id = ? AND status = 'success' "
+                "ORDER BY id DESC LIMIT 1",
+                (session_id,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def attempts(self, session_id: str) -> list[dict]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url_slug, status, error, created_at FROM publish_attempts "
+                "WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        return [
+            {"url_slug": slug, "status": status, "error": error, "created_at": created_at}
+            for slug, status, error, created_at in rows
+        ]
+
+
+class VelogPublisher:
+    """
+    비동기 Velog 발행 클라이언트
+
+    - httpx.AsyncClient 하나를 계속 재사용 (커넥션 풀 공유, 배치 발행 시 TLS 핸드셰이크 절약)
+    - 429 / 5xx / 네트워크 오류는 지수 백오프로 재시도 (429는 Retry-After 우선)
+    - 중복 발행 방지: 세션에 성공 기록이 있으면 그대로 반환하고,
+      쓰기 전(재시도 포함)마다 같은 url_slug 글이 이미 있는지 조회
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+        log: Optional[PublishLog] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.log = log
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._username: Optional[str] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # AsyncClient는 만들어진 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=transport)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    async def _send(self, query: str, variables: Optional[dict] = None) -> dict:
+        """GraphQL 요청 1건 (재시도 가능한 오류는 _RetryableError로)"""
+        if not settings.velog_access_token:
+            raise ValueError("VELOG_ACCESS_TOKEN이 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+        headers = {
+            "Content-Type":  "application/json",
+            "authorization": f"Bearer {settings.velog_access_token}",
+        }
+        try:
+            response = await self._get_client().post(
+                VELOG_GRAPHQL_URL,
+                json={"query": query, "variables": variables or {}},
+                headers=headers,
+            )
+        except httpx.TransportError as e:
+            raise _RetryableError(e) from e
+        if response.status_code in RETRYABLE_STATUS:
+            raise _RetryableError(
+                httpx.HTTPStatusError(f"Velog 응답 {response.status_code}", request=response.request, response=response),
+                response.headers.get("Retry-After"),
+            )
+        response.raise_for_status()
+        data = response.json()
+        if "errors" in data:
+            raise VelogAPIError(f"Velog API 오류: {data['errors']}")
+        return data["data"]
+
+    async def _wait_before_retry(self, attempt: int, retry_after: Optional[str]) -> None:
+        record_retry()
+        delay = self.backoff * 2 ** (attempt - 1)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), 60.0))
+        await asyncio.sleep(delay)
+
+    async def _graphql(self, query: str, variables: Optional[dict] = None) -> dict:
+        """
+        조회용 GraphQL 요청. 재시도 가능한 오류는 max_retries번까지 다시 보냅니다.
+        (writePost는 여기서 재시도하지 않음 → publish가 slug 조회 후 다시 씀)
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._send(query, variables)
+            except _RetryableError as e:
+                if attempt >= self.max_retries:
+                    raise e.error
+                attempt += 1
+                await self._wait_before_retry(attempt, e.retry_after)
+
+    async def username(self) -> str:
+        if self._username is None:
+            data = await self._graphql(CURRENT_USER_QUERY)
+            self._username = data["currentUser"]["username"]
+        return self._username
+
+    async def find_post(self, url_slug: str) -> Optional[dict]:
+        """내 계정에 url_slug 글이 이미 있으면 발행 결과 형식으로 반환합니다."""
+        username = await self.username()
+        try:
+            data = await self._graphql(POST_QUERY, {"username": username, "url_slug": url_slug})
+        except VelogAPIError:
+            return None     # 없는 글은 errors(NOT_FOUND)로 오기도 함
+        post = data.get("post")
+        if not post:
+            return None
+        return _post_result(post)
+
+    async def publish(
+        self,
+        title: str,
+        body: str,
+        tags: list[str],
+        meta_description: str = "",
+        is_private: bool = False,
+        is_temp: bool = False,
+        session_id: Optional[str] = None,
+    ) -> dict:
+        """
+        글을 발행합니다. 같은 세션 / 같은 url_slug로 다시 호출해도 글은 한 번만 만들어집니다.
+        반환: {"success": True, "url": ..., "post_id": ..., "username": ..., "existing": bool}
+        """
+        url_slug = _make_url_slug(title)
+
+        if session_id and self.log is not None:
+            previous = await asyncio.to_thread(self.log.succeeded, session_id)
+            if previous:
+                return {**previous, "existing": True}
+
+        variables = {
+            "input": {
+                "title":        title,
+                "body":         body,
+                "tags":         tags[:5],           # Velog 최대 5개
+                "is_markdown":  True,
+                "is_temp":      is_temp,
+                "is_private":   is_private,
+                "url_slug":     url_slug,
+                "meta":         {"description": meta_description[:160]},
+                "series_id":    None,
+                "thumbnail":    None,
+            }
+        }
+
+        try:
+            attempt = 0
+            while True:
+                # 쓰기 전마다 조회: 앞선 writePost가 글을 만들고 5xx·끊김으로 끝났을 수 있음
+                existing = await self.find_post(url_slug)
+                if existing:
+                    result = {**existing, "existing": True}
+                    break
+                try:
+                    data = await self._send(WRITE_POST_MUTATION, variables)
+                except _RetryableError as e:
+                    if attempt >= self.max_retries:
+                        raise e.error
+                    attempt += 1
+                    await self._wait_before_retry(attempt, e.retry_after)
+                    continue
+                result = {**_post_result(data["writePost"]), "existing": False}
+                break
+        except Exception as e:
+            if session_id and self.log is not None:
+                await asyncio.to_thread(self.log.record, session_id, url_slug, None, str(e))
+            raise
+
+        if session_id and self.log is not None:
+            await asyncio.to_thread(self.log.record, session_id, url_slug, result)
+        return result
+
+
+def _post_result(post: dict) -> dict:
+    username = post["user"]["username"]
+    return {
+        "success":  True,
+        "url":      f"https://velog.io/@{username}/{post['url_slug']}",
+        "post_id":  post["id"],
+        "username": username,
+    }
+
+
+# 프로세스 전역 발행 클라이언트 (lifespan 종료 시 aclose)
+publisher = VelogPublisher(
+    max_retries=settings.velog_max_retries,
+    backoff=settings.velog_retry_backoff,
+    log=PublishLog(settings.publish_log_path),
+)
+
+
+async def publish_to_velog(
     title: str,
     body: str,
     tags: list[str],
     meta_description: str = "",
     is_private: bool = False,
     is_temp: bool = False,      # True면 임시저장
+    session_id: Optional[str] = None,
 ) -> dict:
     """
-    Velog GraphQL API로 글을 발행합니다.
+    Velog GraphQL API로 글을 발행합니다. (공용 VelogPublisher 사용)
     
     반환:
     {
@@ -36,65 +343,15 @@ def publish_to_velog(
     ※ VELOG_ACCESS_TOKEN 필요
       브라우저 DevTools → Application → Cookies → velog.io → access_token
     """
-    if not settings.velog_access_token:
-        raise ValueError("VELOG_ACCESS_TOKEN이 설정되지 않았습니다. .env 파일을 확인하세요.")
-
-    # Velog write post mutation
-    mutation = """
-    mutation WritePost($input: WritePostInput!) {
-      writePost(input: $input) {
-        id
-        title
-        url_slug
-        user {
-          username
-        }
-      }
-    }
-    """
-
-    variables = {
-        "input": {
-            "title":        title,
-            "body":         body,
-            "tags":         tags[:5],           # Velog 최대 5개
-            "is_markdown":  True,
-            "is_temp":      is_temp,
-            "is_private":   is_private,
-            "url_slug":     _make_url_slug(title),
-            "meta":         {"description": meta_description[:160]},
-            "series_id":    None,
-            "thumbnail":    None,
-        }
-    }
-
-    headers = {
-        "Content-Type":  "application/json",
-        "authorization": f"Bearer {settings.velog_access_token}",
-    }
-
-    with httpx.Client(timeout=30.0) as client:
-        response = client.post(
-            VELOG_GRAPHQL_URL,
-            json={"query": mutation, "variables": variables},
-            headers=headers,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    if "errors" in data:
-        raise Exception(f"Velog API 오류: {data['errors']}")
-
-    post = data["data"]["writePost"]
-    username = post["user"]["username"]
-    url_slug = post["url_slug"]
-
-    return {
-        "success":  True,
-        "url":      f"https://velog.io/@{username}/{url_slug}",
-        "post_id":  post["id"],
-        "username": username,
-    }
+    return await publisher.publish(
+        title=title,
+        body=body,
+        tags=tags,
+        meta_description=meta_description,
+        is_private=is_private,
+        is_temp=is_temp,
+        session_id=session_id,
+    )
 
 
 def save_draft_to_file(
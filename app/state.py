@@ -1,24 +1,60 @@
-from typing import TypedDict, Annotated, Optional
+from typing import TypedDict, Annotated, Optional, Union
 import operator
 
 
+def merge_sections(existing: list, updates: list) -> list:
+    """
+    sections 리듀서 (섹션 레코드는 app/document.py 참고)
+    - 문자열    → 뒤에 추가 (이전 형식)
+    - {"index", ...} → 해당 위치의 레코드를 갱신
+                       (병렬 작성 시 완료 순서와 무관하게 목차 순서 유지,
+                        이미 있는 섹션이면 version +1, 직전 본문만 history로)
+    """
+    merged = list(existing or [])
+    for update in updates or []:
+        if not isinstance(update, dict):
+            merged.append(update)
+            continue
+        index = update["index"]
+        if index >= len(merged):
+            merged.extend([""] * (index + 1 - len(merged)))
+        previous = merged[index]
+        record = {key: value for key, value in update.items() if key != "index"}
+        if isinstance(previous, dict) and previous.get("body"):
+            record = {
+                **previous,
+                **record,
+                "version": previous.get("version", 1) + 1,
+                # /history diff에는 직전 버전만 필요 → 본문 사본이 체크포인트마다 쌓이지 않도록 1개만 보관
+                "history": [previous["body"]],
+            }
+        elif previous:
+            # 이전 형식(문자열) 섹션을 고친 경우
+            record = {**record, "version": 2, "history": [previous]}
+        else:
+            record = {**record, "version": 1, "history": []}
+        merged[index] = record
+    return merged
+
+
 class BlogState(TypedDict):
     # ── 1. RSS 수집 결과 ───────────────────────────────────────────
-    rss_items: list[dict]           # 수집된 RSS 아이템 원본
+    rss_items: Union[list[dict], str]  # 수집된 RSS 아이템 원본 (STATE_BLOB_MODE면 블롭 핸들)
     topic: str                      # 최종 선정된 주제
     topic_reason: str               # 이 주제를 선택한 이유
+    source_item: Optional[dict]     # 주제의 원본 RSS 아이템 (발행 후 "다룬 이야기"로 기록)
 
     # ── 2. 리서치 결과 ────────────────────────────────────────────
     research_results: Annotated[list, operator.add]  # 웹 검색 결과 누적
     references: list[str]           # 참고 URL 목록
+    search_hits: Union[list[dict], str]  # 원본 검색 결과 (SPECULATIVE_PLAN=true일 때만, 블롭 모드면 핸들)
 
     # ── 3. 기획 결과 ──────────────────────────────────────────────
     outline: list[str]              # 목차
     seo_keywords: list[str]         # SEO 핵심 키워드
 
     # ── 4. 작성 결과 ──────────────────────────────────────────────
-    sections: Annotated[list, operator.add]  # 작성된 섹션 누적
-    draft: Optional[str]            # 조합된 전체 초안
+    sections: Annotated[list, merge_sections]  # 섹션 레코드 (목차 순서, 마크다운은 publish에서 렌더링)
 
     # ── 5. SEO 최적화 결과 ────────────────────────────────────────
     seo_title: Optional[str]        # SEO 최적화된 제목
@@ -27,13 +63,16 @@ class BlogState(TypedDict):
 
     # ── 6. 품질 관리 ──────────────────────────────────────────────
     critique: Optional[str]         # 검토 피드백
+    section_feedback: list[dict]    # 수정이 필요한 섹션별 피드백 [{"index", "feedback"}]
     quality_score: Optional[int]    # 품질 점수 (1~10)
     revision_count: int             # 수정 횟수
 
     # ── 7. 발행 결과 ──────────────────────────────────────────────
-    final_draft: Optional[str]      # 최종 초안 (마크다운)
+    final_draft: Optional[str]      # 최종 마크다운 (sections를 publish에서 렌더링)
     velog_url: Optional[str]        # 발행된 Velog URL
     is_published: bool              # 발행 여부
+    outbox_id: Optional[str]        # 아웃박스 전송 대기 id (PUBLISH_OUTBOX=true)
 
     # ── 메타 ──────────────────────────────────────────────────────
     logs: Annotated[list, operator.add]  # 실행 로그
+    spans: Annotated[list, operator.add]  # 노드별 실행 시간 / LLM 호출 / 토큰 / 캐시 / 재시도 기록
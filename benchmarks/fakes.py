@@ -0,0 +1,170 @@
+"""
+오프라인 벤치마크용 로컬 대역(stand-in)
+
+- FakeChatModel:   프롬프트 종류별로 고정된 응답을 돌려주는 ChatGoogleGenerativeAI 대역
+- FakeSearchTool:  TavilySearchResults 대역
+- rss_transport:   RSS_FEEDS 주소에 로컬 RSS XML로 응답하는 httpx 트랜스포트
+- velog_transport: Velog GraphQL(currentUser / post / writePost)에 응답하는 httpx 트랜스포트
+
+모든 대역은 latency(초)만큼 지연한 뒤 응답합니다.
+"""
+import asyncio
+import json
+import re
+import time
+from typing import Any, Optional
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+def _section_body(heading: str) -> str:
+    return (
+        f"## {heading}\n\n"
+        "파이썬으로 AI 에이전트 워크플로우를 구성할 때 LangGraph 에이전트는 상태 그래프로 LLM 호출 흐름을 관리합니다. "
+        "체크포인트와 조건 분기를 활용하면 실패한 단계만 다시 실행할 수 있어 비용을 줄일 수 있습니다. "
+        "아래 예시는 가장 작은 그래프 구성입니다.\n\n"
+        "```python\n"
+        "graph = StateGraph(State)\n"
+        "graph.add_node(\"write\", write)\n"
+        "```\n\n"
+        "실제 서비스에서는 노드별 지연 시간을 측정해 병목을 찾는 것이 중요합니다. " * 2
+    )
+
+
+def fake_response(prompt: str, critique_score: int = 8) -> str:
+    """프롬프트 종류를 보고 노드가 기대하는 형식의 결정적 응답을 만듭니다."""
+    if '"topics"' in prompt:
+        return json.dumps({"topics": [
+            {"topic": f"LangGraph 실전 {i + 1}: 에이전트 설계", "reason": "벤치마크", "source_index": i + 1}
+            for i in range(10)
+        ]}, ensure_ascii=False)
+    if '"source_index"' in prompt:
+        return json.dumps({"topic": "LangGraph로 만드는 AI 에이전트", "reason": "벤치마크", "source_index": 1},
+                          ensure_ascii=False)
+    if '"queries"' in prompt:
+        return json.dumps({"queries": ["langgraph overview", "langgraph examples", "langgraph trends"]})
+    if '"outline"' in prompt:
+        return json.dumps({
+            "seo_keywords": ["LangGraph", "AI 에이전트", "LLM", "파이썬", "워크플로우"],
+            "outline": ["들어가며", "LangGraph란", "상태와 노드", "체크포인트", "실전 예제", "마치며"],
+        }, ensure_ascii=False)
+    if '"seo_title"' in prompt:
+        return json.dumps({
+            "seo_title": "2025년 LangGraph AI 에이전트 완전 정복",
+            "meta_description": "LangGraph로 AI 에이전트를 만드는 방법을 정리했습니다.",
+            "velog_tags": ["LangGraph", "AI", "LLM", "Python", "Agent"],
+        }, ensure_ascii=False)
+    if '"score"' in prompt:
+        return json.dumps({
+            "score": critique_score,
+            "strengths": ["구조가 명확함"],
+            "improvements": ["예시 코드 보강"],
+            "sections": [{"section": 2, "feedback": "예시 코드 보강"}] if critique_score < 7 else [],
+            "feedback": "예시 코드 보강" if critique_score < 7 else "",
+            "summary": "전반적으로 좋음",
+        }, ensure_ascii=False)
+    if "지금 작성할 섹션" in prompt or "수정할 섹션" in prompt:
+        heading = re.search(r"\*\*(.+?)\*\*", prompt)
+        return _section_body(heading.group(1) if heading else "섹션")
+    return "LangGraph는 LLM 워크플로우를 그래프로 표현하는 라이브러리입니다. " * 5
+
+
+class FakeChatModel(BaseChatModel):
+    """ChatGoogleGenerativeAI 대역. latency초 뒤 fake_response를 돌려줍니다."""
+
+    latency: float = 0.0
+    temperature: float = 0.0
+    critique_score: int = 8
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-gemini"
+
+    def _result(self, messages: list[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        content = fake_response(prompt, self.critique_score)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens":  len(prompt) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens":  (len(prompt) + len(content)) // 4,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+class FakeSearchTool:
+    """TavilySearchResults 대역"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def ainvoke(self, query: str) -> list[dict]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        slug = re.sub(r"\W+", "-", query.lower()).strip("-")
+        return [
+            {
+                "title":   f"{query} - result {i}",
+                "content": f"{query}에 대한 검색 결과 본문입니다. " * 10,
+                "url":     f"https://example.com/{slug}/{i}",
+            }
+            for i in range(3)
+        ]
+
+
+def _rss_xml(name: str, count: int = 10) -> str:
+    items = "".join(
+        f"<item><title>{name} story {i}: LLM agents in production</title>"
+        f"<link>https://example.com/{abs(hash(name)) % 1000}/{i}</link>"
+        f"<description>Summary of story {i}</description>"
+        f"<pubDate>Mon, 17 Feb 2025 0{i % 10}:00:00 GMT</pubDate></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>{items}</channel></rss>'
+
+
+def rss_transport(latency: float = 0.0) -> httpx.AsyncBaseTransport:
+    """모든 피드 요청에 로컬 RSS로 응답하는 비동기 트랜스포트"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, text=_rss_xml(request.url.host))
+
+    return httpx.MockTransport(handler)
+
+
+def velog_transport(latency: float = 0.0) -> httpx.AsyncBaseTransport:
+    """Velog GraphQL(currentUser / post 조회 / writePost)에 응답하는 비동기 트랜스포트"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        body = json.loads(request.content)
+        if "currentUser" in body["query"]:
+            return httpx.Response(200, json={"data": {"currentUser": {"username": "bench"}}})
+        if "writePost" not in body["query"]:
+            return httpx.Response(200, json={"data": {"post": None}})
+        post = body["variables"]["input"]
+        return httpx.Response(200, json={"data": {"writePost": {
+            "id":       "post-id",
+            "title":    post["title"],
+            "url_slug": post["url_slug"],
+            "user":     {"username": "bench"},
+        }}})
+
+    return httpx.MockTransport(handler)
@@ -0,0 +1,229 @@
+"""
+오프라인 파이프라인 벤치마크
+
+네트워크 없이 전체 agent_app 그래프를 로컬 대역(benchmarks/fakes.py)으로 실행하고
+end-to-end / 노드별 시간, 동시 세션 처리량, 최대 메모리를 측정합니다.
+
+실행:
+    python -m benchmarks.run_pipeline --sessions 8 --llm-latency 0.5
+    python -m benchmarks.run_pipeline --sessions 8 --parallel-write --json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from app import llm as llm_registry
+from app.config import settings
+from app.graph import build_graph
+from app.main import get_initial_state
+from app.ratelimit import LLMRateLimiter
+from app.services import blobs, dedup, rss, search, velog
+from langgraph.checkpoint.memory import MemorySaver
+
+from .fakes import FakeChatModel, FakeSearchTool, rss_transport, velog_transport
+
+
+@contextmanager
+def _patched(obj, attr: str, value) -> Iterator[None]:
+    original = getattr(obj, attr)
+    setattr(obj, attr, value)
+    try:
+        yield
+    finally:
+        setattr(obj, attr, original)
+
+
+@contextmanager
+def offline_environment(
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    http_latency: float = 0.0,
+    critique_score: int = 8,
+    critique_mode: str | None = None,
+    requests_per_minute: float | None = None,
+    blob_mode: bool = False,
+    critique_gate: bool = False,
+) -> Iterator[None]:
+    """
+    LLM / Tavily / RSS / Velog를 로컬 대역으로 바꾸고 영속 캐시·다룬 이야기 인덱스를 끕니다.
+    (캐시가 켜져 있으면 두 번째 실행부터 측정값이 달라지므로)
+    """
+    with ExitStack() as stack:
+        llm_registry.set_llm_factory(
+            lambda model: FakeChatModel(latency=llm_latency, critique_score=critique_score)
+        )
+        stack.callback(llm_registry.set_llm_factory, None)
+        search.set_search_tool(FakeSearchTool(latency=search_latency))
+        stack.callback(search.set_search_tool, None)
+
+        stack.enter_context(_patched(rss, "transport", rss_transport(http_latency)))
+        stack.enter_context(_patched(velog, "transport", velog_transport(http_latency)))
+        stack.enter_context(_patched(rss, "feed_cache", None))
+        stack.enter_context(_patched(search, "search_cache", None))
+        stack.enter_context(_patched(llm_registry, "llm_cache", None))
+        stack.enter_context(_patched(dedup, "covered_index", None))
+        stack.enter_context(_patched(velog.publisher, "log", None))
+        stack.enter_context(_patched(settings, "publish_outbox", False))   # 발행까지 포함해 측정
+        stack.enter_context(_patched(settings, "auto_publish", True))
+        stack.enter_context(_patched(settings, "velog_access_token", "offline-benchmark"))
+        if critique_mode:
+            stack.enter_context(_patched(settings, "critique_mode", critique_mode))
+        stack.enter_context(_patched(settings, "critique_gate", critique_gate))
+        # 쿼터를 주지 않으면 호출 조율기 없이 파이프라인 자체 속도만 측정
+        limiter = LLMRateLimiter(requests_per_minute, tokens_per_minute=1e12) if requests_per_minute else None
+        stack.enter_context(_patched(llm_registry, "rate_limiter", limiter))
+        # 블롭 모드는 임시 디렉터리에만 저장 (끝나면 삭제)
+        stack.enter_context(_patched(settings, "state_blob_mode", blob_mode))
+        if blob_mode:
+            root = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-blobs-"))
+            stack.enter_context(_patched(blobs, "blob_store", blobs.BlobStore(root)))
+        yield
+
+
+async def _run_session(agent_app, topic: str | None) -> dict:
+    config = {"configurable": {"thread_id": f"bench-{uuid.uuid4()}"}}
+    started = time.perf_counter()
+    result = await agent_app.ainvoke(get_initial_state(topic), config=config)
+    return {"elapsed": time.perf_counter() - started, "state": result}
+
+
+async def run_benchmark(
+    sessions: int = 4,
+    concurrency: int | None = None,
+    topic: str | None = None,
+    parallel_write: bool = False,
+    speculative: bool = False,
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    http_latency: float = 0.0,
+    critique_score: int = 8,
+    critique_mode: str | None = None,
+    requests_per_minute: float | None = None,
+    blob_mode: bool = False,
+    critique_gate: bool = False,
+) -> dict:
+    """
+    sessions개의 파이프라인을 최대 concurrency개씩 동시에 실행하고 결과를 요약합니다.
+    concurrency를 생략하면 전부 동시에 실행합니다.
+    """
+    concurrency = concurrency or sessions
+    agent_app = build_graph(parallel_write=parallel_write, speculative=speculative).compile(checkpointer=MemorySaver()).with_config(
+        max_concurrency=settings.write_concurrency,
+    )
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> dict:
+        async with limiter:
+            return await _run_session(agent_app, topic)
+
+    with offline_environment(llm_latency, search_latency, http_latency, critique_score, critique_mode,
+                             requests_per_minute, blob_mode, critique_gate):
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            runs = await asyncio.gather(*(bounded() for _ in range(sessions)))
+            wall = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    node_times: dict[str, list[float]] = defaultdict(list)
+    node_calls: dict[str, int] = defaultdict(int)
+    for run in runs:
+        for span in run["state"].get("spans") or []:
+            node_times[span["node"]].append(span["wall_time"])
+            node_calls[span["node"]] += span["llm_calls"]
+
+    elapsed = [run["elapsed"] for run in runs]
+    return {
+        "sessions":        sessions,
+        "concurrency":     concurrency,
+        "parallel_write":  parallel_write,
+        "speculative":     speculative,
+        "blob_mode":       blob_mode,
+        "critique_gate":   critique_gate,
+        "wall_time":       round(wall, 4),
+        "throughput":      round(sessions / wall, 4) if wall else 0.0,   # 세션/초
+        "end_to_end": {
+            "mean": round(statistics.mean(elapsed), 4),
+            "p50":  round(statistics.median(elapsed), 4),
+            "max":  round(max(elapsed), 4),
+        },
+        "nodes": {
+            node: {
+                "runs":      len(times),
+                "mean":      round(statistics.mean(times), 4),
+                "total":     round(sum(times), 4),
+                "llm_calls": node_calls[node],
+            }
+            for node, times in sorted(node_times.items())
+        },
+        "peak_memory_mb":  round(peak / 1024 / 1024, 2),
+        "published":       sum(1 for run in runs if run["state"].get("is_published")),
+    }
+
+
+def _print_report(report: dict) -> None:
+    e2e = report["end_to_end"]
+    print(f"세션 {report['sessions']}개 (동시 {report['concurrency']}) | "
+          f"parallel_write={report['parallel_write']} | speculative={report['speculative']}")
+    print(f"전체 {report['wall_time']:.2f}s | 처리량 {report['throughput']:.2f} 세션/s | "
+          f"최대 메모리 {report['peak_memory_mb']:.1f}MB")
+    print(f"end-to-end mean {e2e['mean']:.2f}s / p50 {e2e['p50']:.2f}s / max {e2e['max']:.2f}s")
+    print(f"{'node':<15}{'runs':>6}{'mean(s)':>10}{'total(s)':>10}{'llm':>6}")
+    for node, stats in report["nodes"].items():
+        print(f"{node:<15}{stats['runs']:>6}{stats['mean']:>10.3f}{stats['total']:>10.3f}{stats['llm_calls']:>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오프라인 파이프라인 벤치마크")
+    parser.add_argument("--sessions", type=int, default=4, help="실행할 세션 수")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시 실행 세션 수 (기본: 전부)")
+    parser.add_argument("--topic", default=None, help="주제 (생략 시 RSS 대역에서 선정)")
+    parser.add_argument("--parallel-write", action="store_true", help="섹션 병렬 작성 모드")
+    parser.add_argument("--speculative", action="store_true", help="리서치 요약과 plan 동시 실행 (SPECULATIVE_PLAN)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="LLM 호출당 지연(초)")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="검색 1회 지연(초)")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="RSS / Velog 요청 지연(초)")
+    parser.add_argument("--critique-score", type=int, default=8, help="critique 대역 점수 (7 미만이면 revise 루프)")
+    parser.add_argument("--critique-mode", choices=["single", "sectioned"], default=None,
+                        help="검토 방식 (기본: CRITIQUE_MODE 설정)")
+    parser.add_argument("--critique-gate", action="store_true",
+                        help="LLM 검토 전 로컬 규칙 채점 (CRITIQUE_GATE)")
+    parser.add_argument("--rpm", type=float, default=None,
+                        help="LLM 분당 요청 쿼터 (지정하면 호출 조율기 적용)")
+    parser.add_argument("--blob-mode", action="store_true", help="State 블롭 저장 모드 (STATE_BLOB_MODE)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        topic=args.topic,
+        parallel_write=args.parallel_write,
+        speculative=args.speculative,
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        http_latency=args.http_latency,
+        critique_score=args.critique_score,
+        critique_mode=args.critique_mode,
+        requests_per_minute=args.rpm,
+        blob_mode=args.blob_mode,
+        critique_gate=args.critique_gate,
+    ))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
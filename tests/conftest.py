@@ -0,0 +1,33 @@
+import inspect
+import pytest
+from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    registry.get_llm을 가짜 LLM으로 바꾸고 LLM 응답 캐시를 끕니다.
+
+    사용: calls = fake_llm(respond)
+    - respond(prompt)는 문자열(→ content) 또는 응답 객체를 반환 (async 함수도 가능, 예외를 던지면 호출 실패)
+    - calls에는 받은 프롬프트가 호출 순서대로 쌓임
+    """
+    from app import llm as registry
+
+    def install(respond):
+        calls = []
+
+        class FakeLLM:
+            async def ainvoke(self, messages, config=None):
+                prompt = messages[0].content
+                calls.append(prompt)
+                result = respond(prompt)
+                if inspect.isawaitable(result):
+                    result = await result
+                return MagicMock(content=result) if isinstance(result, str) else result
+
+        monkeypatch.setattr(registry, "get_llm", lambda temperature, model=None: FakeLLM())
+        monkeypatch.setattr(registry, "llm_cache", None)
+        return calls
+
+    return install
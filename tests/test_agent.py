@@ -26,6 +26,630 @@ def test_all_nodes_registered():
         assert node in node_names, f"'{node}' 노드 누락"
 
 
+def test_nodes_are_async():
+    """이벤트 루프를 막지 않도록 모든 노드가 코루틴 함수인지 확인"""
+    import inspect
+    from app import nodes
+    for name in ["collect_and_select_topic", "research", "plan", "write", "write_section",
+                 "seo_optimize", "critique", "revise", "publish"]:
+        assert inspect.iscoroutinefunction(getattr(nodes, name)), f"'{name}' 노드가 동기 함수"
+
+
+def test_llm_registry_is_lazy_and_shared(monkeypatch):
+    """import 시점에는 클라이언트를 만들지 않고, 같은 모델은 커넥션 풀을 공유하는지 확인"""
+    import os
+    import subprocess
+    import sys
+    from app import llm as registry
+
+    # 다른 테스트가 만든 클라이언트와 섞이지 않도록 새 인터프리터에서 그래프만 import
+    subprocess.run(
+        [sys.executable, "-c", "import app.graph, app.llm as r; assert r._clients == {}, r._clients"],
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    a = registry.get_llm(temperature=0.3)
+    b = registry.get_llm(temperature=0.3)
+    c = registry.get_llm(temperature=0.7)
+    assert a is b
+    assert a is not c and c.temperature == 0.7
+    assert a.client is c.client
+    registry.reset_llms()
+
+
+def test_llm_response_cache(monkeypatch, tmp_path, fake_llm):
+    """캐시 가능한 호출은 두 번째부터 LLM을 건너뛰고, 높은 온도는 항상 호출하는지 확인"""
+    import asyncio
+    from app import llm as registry
+    from app.services.cache import SQLiteCache
+
+    calls = fake_llm(lambda prompt: f"응답{len(calls)}")
+    cache = SQLiteCache(str(tmp_path / "llm.sqlite"), ttl=60, max_entries=10)
+    monkeypatch.setattr(registry, "llm_cache", cache)
+
+    async def run():
+        first = await registry.complete("plan 프롬프트", temperature=0.4, cache=True)
+        second = await registry.complete("plan 프롬프트", temperature=0.4, cache=True)
+        creative = await registry.complete("plan 프롬프트", temperature=0.9, cache=True)
+        return first, second, creative
+
+    first, second, creative = asyncio.run(run())
+    assert first == second == "응답1"
+    assert creative == "응답2"
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_rate_limiter_queues_callers_and_backs_off_on_429(monkeypatch, fake_llm):
+    """동시 호출은 상한만큼만 나가고, 429·5xx는 재시도되며 상한은 429에서만 절반으로 줄어드는지 확인"""
+    import asyncio
+    from app import llm as registry
+    from app.config import settings
+    from app.ratelimit import LLMRateLimiter, TokenBucket
+
+    limiter = LLMRateLimiter(requests_per_minute=10_000, tokens_per_minute=10_000_000, initial_concurrency=2)
+    monkeypatch.setattr(registry, "rate_limiter", limiter)
+    monkeypatch.setattr(settings, "llm_retry_backoff", 0)
+
+    running, peak = 0, 0
+
+    class QuotaError(Exception):
+        code = 429
+
+    class ServerError(Exception):
+        code = 503
+
+    async def respond(prompt):
+        nonlocal running, peak
+        if prompt == "p0" and calls.count("p0") == 1:
+            raise QuotaError("RESOURCE_EXHAUSTED")
+        if prompt == "p1" and calls.count("p1") == 1:
+            raise ServerError("503 UNAVAILABLE")
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return MagicMock(content=f"ok-{prompt}", usage_metadata={"total_tokens": 10})
+
+    calls = fake_llm(respond)
+
+    async def run():
+        return await asyncio.gather(*(registry.complete(f"p{i}", temperature=0.7) for i in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [f"ok-p{i}" for i in range(5)]
+    assert calls.count("p0") == 2 and calls.count("p1") == 2
+    assert peak <= 2
+    assert limiter.throttled == 1         # 503은 쿼터 신호로 세지 않음
+    assert 1 < limiter.limit < 4          # 429로 2 → 1로 줄었다가 성공마다 +1/limit씩 회복
+
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+    assert abs(bucket.wait_time(1, now=bucket._updated) - 1.0) < 1e-6   # 분당 60 → 초당 1개
+
+
+def test_llm_error_classification_ignores_incidental_text():
+    """429·5xx는 상태 코드·gRPC 상태 이름·예외 타입으로만 판별하고, 메시지 속 숫자·단어에는 걸리지 않는지 확인"""
+    from app.ratelimit import is_rate_limited, is_transient
+
+    class APIError(Exception):
+        def __init__(self, code, status):
+            super().__init__(f"{code} {status}")
+            self.code, self.status = code, status
+
+    class ModelRateLimitError(Exception):
+        pass
+
+    assert is_rate_limited(APIError(429, "RESOURCE_EXHAUSTED"))
+    assert is_rate_limited(ModelRateLimitError("Error calling model (RESOURCE_EXHAUSTED)"))
+    assert is_rate_limited(ValueError("HTTP 429 Too Many Requests"))
+    assert not is_rate_limited(ValueError("prompt has 14290 tokens"))
+
+    assert is_transient(APIError(503, "UNAVAILABLE")) and is_transient(TimeoutError())
+    assert not is_transient(APIError(400, "INVALID_ARGUMENT"))
+    assert not is_transient(ValueError("INTERNAL consistency check failed"))
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    """max_entries를 넘으면 가장 오래 사용되지 않은 항목이 삭제되는지 확인"""
+    from app.services.cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "c.sqlite"), ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # a를 최근 사용으로 갱신
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_search_cache_shares_normalized_queries(monkeypatch, tmp_path):
+    """단어 순서·대소문자만 다른 쿼리는 Tavily를 다시 호출하지 않는지 확인"""
+    import asyncio
+    from app.services import search as search_service
+    from app.services.cache import SQLiteCache
+
+    calls = []
+
+    class FakeTool:
+        async def ainvoke(self, query):
+            calls.append(query)
+            return [{"title": "t", "content": "c", "url": "https://example.com"}]
+
+    monkeypatch.setattr(search_service, "_get_search_tool", lambda: FakeTool())
+    cache = SQLiteCache(str(tmp_path / "search.sqlite"), ttl=60, max_entries=10)
+
+    async def run():
+        await search_service.search("LangGraph Tutorial", cache=cache)
+        return await search_service.search("tutorial,  langgraph", cache=cache)
+
+    results = asyncio.run(run())
+    assert calls == ["LangGraph Tutorial"]
+    assert results[0]["url"] == "https://example.com"
+
+
+def test_concurrent_identical_searches_share_one_call(monkeypatch):
+    """캐시가 없어도 동시에 들어온 같은 쿼리는 Tavily를 한 번만 호출하는지 확인"""
+    import asyncio
+    from app.services import search as search_service
+
+    calls = []
+
+    class FakeTool:
+        async def ainvoke(self, query):
+            calls.append(query)
+            await asyncio.sleep(0.05)
+            return [{"title": "t", "content": "c", "url": "https://example.com"}]
+
+    monkeypatch.setattr(search_service, "_get_search_tool", lambda: FakeTool())
+    monkeypatch.setattr(search_service, "search_cache", None)
+
+    async def run():
+        return await asyncio.gather(
+            search_service.search("LangGraph Tutorial"),
+            search_service.search("tutorial langgraph"),
+            search_service.search("다른 쿼리"),
+        )
+
+    first, second, other = asyncio.run(run())
+    assert sorted(calls) == sorted(["LangGraph Tutorial", "다른 쿼리"])
+    assert first == second
+    assert search_service._inflight == {}
+
+
+def test_research_runs_queries_concurrently(monkeypatch):
+    """검색 쿼리 3개가 순차가 아니라 동시에 실행되는지 확인"""
+    import asyncio
+    import time
+    from app.nodes import n2_research
+
+    async def fake_complete(prompt, temperature, cache=False):
+        if "queries" in prompt:
+            return '{"queries": ["q1", "q2", "q3"]}'
+        return "요약"
+
+    async def fake_search(query):
+        await asyncio.sleep(0.2)
+        return [{"title": query, "content": "내용", "url": f"https://example.com/{query}"}]
+
+    monkeypatch.setattr(n2_research, "complete", fake_complete)
+    monkeypatch.setattr(n2_research, "search", fake_search)
+
+    started = time.perf_counter()
+    result = asyncio.run(n2_research.research({"topic": "테스트"}))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert sorted(result["references"]) == [f"https://example.com/q{i}" for i in (1, 2, 3)]
+
+
+def test_covered_index_filters_seen_stories(tmp_path):
+    """발행한 이야기는 URL(추적 파라미터 무시)이나 비슷한 제목으로 다시 걸러지는지 확인"""
+    import time
+    from app.services.dedup import CoveredIndex
+
+    index = CoveredIndex(str(tmp_path / "covered.sqlite"), max_distance=8, retention_days=30)
+    index.record("GPT-5 추론 성능 분석", {
+        "title": "OpenAI releases GPT-5 with improved reasoning",
+        "url": "https://www.example.com/gpt5/",
+    })
+
+    items = [
+        {"title": "완전히 다른 제목", "url": "https://example.com/gpt5?utm_source=hn"},
+        {"title": "OpenAI Releases GPT-5 with Improved Reasoning!", "url": "https://other.com/a"},
+        {"title": "Google announces Gemini 3", "url": "https://other.com/b"},
+    ]
+    fresh, covered = index.filter_new(items)
+    assert fresh == [items[2]]
+    assert covered == items[:2]
+
+    # 보존 기간이 지나면 다시 후보가 됨
+    index.retention = 0
+    time.sleep(0.01)
+    assert index.filter_new(items)[0] == items
+
+
+def test_collect_skips_covered_items_before_prompt(monkeypatch, tmp_path):
+    """이미 다룬 아이템은 주제 선정 프롬프트에 들어가지 않는지 확인"""
+    import asyncio
+    from app.services import dedup
+    from app.services.dedup import CoveredIndex
+    from app.nodes import n1_collect
+
+    index = CoveredIndex(str(tmp_path / "covered.sqlite"))
+    index.record("이전 주제", {"title": "Old story about LangGraph agents", "url": "https://example.com/old"})
+    monkeypatch.setattr(dedup, "covered_index", index)
+
+    async def fake_fetch(max_per_feed):
+        return [
+            {"title": "Old story about LangGraph agents", "url": "https://example.com/old", "source": "HN"},
+            {"title": "New vector database release", "url": "https://example.com/new", "source": "HN"},
+        ], []
+
+    prompts = []
+
+    async def fake_complete(prompt, temperature, **kwargs):
+        prompts.append(prompt)
+        return '{"topic": "벡터 DB", "reason": "새 소식", "source_index": 1}'
+
+    monkeypatch.setattr(n1_collect, "fetch_rss_items_async", fake_fetch)
+    monkeypatch.setattr(n1_collect, "complete", fake_complete)
+
+    result = asyncio.run(n1_collect.collect_and_select_topic({"topic": ""}))
+    assert "Old story" not in prompts[0]
+    assert result["source_item"]["url"] == "https://example.com/new"
+    assert any("이미 다룬 이야기 1개" in log for log in result["logs"])
+
+
+def test_rank_items_prefers_fresh_relevant_cross_feed_stories():
+    """최신·관심사 관련·여러 피드에 실린 이야기가 위로 오고, 같은 이야기는 하나로 묶이는지 확인"""
+    from datetime import datetime, timedelta, timezone
+    from app.services.ranking import rank_items
+
+    now = datetime(2025, 2, 19, 9, tzinfo=timezone.utc)
+
+    def item(title, source, hours_ago, summary=""):
+        return {"title": title, "summary": summary, "source": source, "url": f"https://x/{title}",
+                "published": (now - timedelta(hours=hours_ago)).isoformat()}
+
+    items = [
+        item("Quarterly earnings of a shoe company", "HN", 1),
+        item("Building LLM agents with LangGraph", "Dev.to", 30, "LangGraph agent tutorial"),
+        item("Building LLM Agents with LangGraph!", "HN", 28),
+        item("New RAG evaluation toolkit for LLM apps", "TDS", 2),
+        item("Old LLM agent retrospective", "HN", 24 * 30),
+    ]
+
+    ranked = rank_items(items, top_k=3, interests=["LLM", "agent", "LangGraph", "RAG"], now=now)
+    titles = [r["title"] for r in ranked]
+    assert len(ranked) == 3
+    assert titles[0] == "Building LLM agents with LangGraph"     # 두 피드에 실린 같은 이야기는 하나로
+    assert ranked[0]["also_in"] == ["HN"]
+    assert titles[1] == "New RAG evaluation toolkit for LLM apps"
+    assert "Old LLM agent retrospective" not in titles
+
+    boosted = rank_items(items, top_k=1, interests=["LLM"], source_weights={"HN": 10.0}, now=now)
+    assert boosted[0]["source"] == "HN"
+
+
+def test_velog_publisher_retries_and_is_idempotent(monkeypatch, tmp_path):
+    """쓰기가 글을 만든 뒤 5xx로 끝나도, 재시도 전 slug 조회로 글은 한 번만 만들어지는지 확인"""
+    import asyncio
+    import json
+    import httpx
+    from app.config import settings
+    from app.services import velog
+
+    posts, requests = {}, []
+
+    async def handler(request):
+        body = json.loads(request.content)
+        if "currentUser" in body["query"]:
+            requests.append("user")
+            return httpx.Response(200, json={"data": {"currentUser": {"username": "me"}}})
+        if "writePost" in body["query"]:
+            requests.append("write")
+            slug = body["variables"]["input"]["url_slug"]
+            posts[slug] = {"id": f"id-{slug}", "url_slug": slug, "user": {"username": "me"}}
+            if requests.count("write") == 1:
+                return httpx.Response(502)                  # 글은 만들어졌지만 응답은 게이트웨이 오류
+            return httpx.Response(200, json={"data": {"writePost": posts[slug]}})
+        requests.append("lookup")
+        slug = body["variables"]["url_slug"]
+        return httpx.Response(200, json={"data": {"post": posts.get(slug)}})
+
+    monkeypatch.setattr(velog, "transport", httpx.MockTransport(handler))
+    monkeypatch.setattr(settings, "velog_access_token", "token")
+    log = velog.PublishLog(str(tmp_path / "publish.sqlite"))
+    publisher = velog.VelogPublisher(max_retries=2, backoff=0, log=log)
+
+    async def run():
+        first = await publisher.publish("Hello World", "본문", ["t"], session_id="s1")
+        again = await publisher.publish("Hello World", "본문", ["t"], session_id="s1")
+        other = await publisher.publish("Hello World", "본문", ["t"], session_id="s2")
+        await publisher.aclose()
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert requests[:4] == ["user", "lookup", "write", "lookup"]   # 재시도 전에 slug 조회
+    assert requests.count("write") == 1 and len(posts) == 1
+    assert first["url"] == "https://velog.io/@me/hello-world" and first["existing"] is True
+    assert again["existing"] is True and again["post_id"] == first["post_id"]
+    assert other["existing"] is True                       # slug 조회로 중복 발행 방지
+    assert [a["status"] for a in log.attempts("s1")] == ["success"]
+
+
+def test_outbox_delivery_retries_fails_and_requeues(monkeypatch, tmp_path):
+    """아웃박스 전송 실패는 백오프 후 재시도되고, 한도를 넘으면 failed → requeue로 다시 보내지는지 확인"""
+    import asyncio
+    from app.services import dedup
+    from app.services.outbox import Outbox, OutboxDelivery
+
+    index = dedup.CoveredIndex(str(tmp_path / "covered.sqlite"))
+    monkeypatch.setattr(dedup, "covered_index", index)
+
+    class FlakyPublisher:
+        def __init__(self):
+            self.calls = 0
+            self.down = True
+
+        async def publish(self, title, body, tags, meta_description, session_id):
+            self.calls += 1
+            if self.down:
+                raise RuntimeError("Velog 503")
+            return {"success": True, "url": f"https://velog.io/@me/{session_id}"}
+
+    box = Outbox(str(tmp_path / "outbox.sqlite"))
+    publisher = FlakyPublisher()
+    delivery = OutboxDelivery(box, publisher, rate_per_minute=0, max_attempts=2, backoff=0)
+
+    source = {"title": "Story", "url": "https://example.com/story"}
+    entry_id = box.enqueue("s1", "제목", "본문", ["t"], "설명", topic="주제", source_item=source)
+    assert box.enqueue("s1", "제목", "본문", ["t"], "설명") == entry_id     # 세션당 1건
+
+    async def run():
+        first = await delivery.deliver_once()
+        second = await delivery.deliver_once()
+        idle = await delivery.deliver_once()
+        assert index.stats() == {}                                      # 실패한 글은 기록하지 않음
+        publisher.down = False
+        box.requeue(entry_id)
+        third = await delivery.deliver_once()
+        return first, second, idle, third
+
+    first, second, idle, third = asyncio.run(run())
+    assert first["status"] == "queued" and first["last_error"] == "Velog 503"
+    assert second["status"] == "failed" and second["attempts"] == 2
+    assert idle is None
+    assert third["status"] == "delivered" and third["result"]["url"].endswith("/s1")
+    assert box.counts() == {"delivered": 1}
+    assert index.stats() == {"topic": 1, "item": 1}                     # 전달 완료 후에만 기록
+
+
+def test_read_endpoints_skip_outbox_when_disabled(monkeypatch, tmp_path):
+    """PUBLISH_OUTBOX=false면 /history·/metrics 조회가 아웃박스 파일을 만들지 않는지 확인"""
+    import asyncio
+    import os
+    from unittest.mock import AsyncMock
+    from app import main
+    from app.config import settings
+    from app.metrics import MetricsRegistry
+    from app.services.outbox import Outbox
+
+    path = tmp_path / "outbox.sqlite"
+    monkeypatch.setattr(main, "outbox", Outbox(str(path)))
+    monkeypatch.setattr(main, "metrics_registry", MetricsRegistry(window=10))
+    monkeypatch.setattr(settings, "publish_outbox", False)
+    agent_app = MagicMock()
+    agent_app.aget_state = AsyncMock(return_value=MagicMock(values={"topic": "t"}, next=()))
+    monkeypatch.setattr(main, "agent_app", agent_app)
+
+    history = asyncio.run(main.history("s1"))
+    metrics = asyncio.run(main.metrics())
+    assert history["delivery"] is None
+    assert "velog_outbox_entries" not in metrics.body.decode()
+    assert not os.path.exists(path)
+
+
+def test_publish_node_enqueues_to_outbox(monkeypatch, tmp_path):
+    """PUBLISH_OUTBOX 모드의 publish는 Velog를 호출하지 않고 아웃박스에만 적는지 확인"""
+    import asyncio
+    from app.config import settings
+    from app.nodes import n6_n7_n8
+    from app.services.outbox import Outbox
+
+    box = Outbox(str(tmp_path / "outbox.sqlite"))
+    monkeypatch.setattr(n6_n7_n8, "outbox", box)
+    index = n6_n7_n8.dedup.CoveredIndex(str(tmp_path / "covered.sqlite"))
+    monkeypatch.setattr(n6_n7_n8.dedup, "covered_index", index)
+    monkeypatch.setattr(settings, "auto_publish", True)
+    monkeypatch.setattr(settings, "publish_outbox", True)
+
+    async def no_network(**kwargs):
+        raise AssertionError("Velog를 직접 호출하면 안 됨")
+
+    monkeypatch.setattr(n6_n7_n8, "publish_to_velog", no_network)
+
+    result = asyncio.run(n6_n7_n8.publish({
+        "topic": "주제", "sections": ["## 본문"], "seo_title": "제목", "velog_tags": ["a"],
+        "source_item": {"title": "Story", "url": "https://example.com/story"},
+    }))
+    assert result["is_published"] is False and result["velog_url"] is None
+    entry = box.get(result["outbox_id"])
+    assert entry["status"] == "queued" and entry["title"] == "제목"
+    assert index.stats() == {}                   # 전달 전에는 "다룬 이야기"로 기록하지 않음
+
+
+def test_checkpoint_timestamp_from_uuid6():
+    """checkpoint_id(uuid6)에서 생성 시각을 복원하는지 확인"""
+    import time
+    from langgraph.checkpoint.base.id import uuid6
+    from app.checkpoint import checkpoint_timestamp
+    assert abs(checkpoint_timestamp(str(uuid6())) - time.time()) < 5
+
+
+def test_prune_checkpoints_applies_retention(tmp_path):
+    """세션 수 상한과 중간 체크포인트 정리가 적용되고, 남은 세션은 조회 가능한지 확인"""
+    import asyncio
+    from typing import TypedDict
+    from langgraph.graph import StateGraph, START, END
+    from app.checkpoint import open_sqlite_checkpointer, prune_checkpoints
+
+    class S(TypedDict):
+        n: int
+
+    graph = StateGraph(S)
+    graph.add_node("a", lambda s: {"n": s["n"] + 1})
+    graph.add_node("b", lambda s: {"n": s["n"] + 1})
+    graph.add_edge(START, "a")
+    graph.add_edge("a", "b")
+    graph.add_edge("b", END)
+
+    async def run():
+        async with open_sqlite_checkpointer(str(tmp_path / "cp.sqlite")) as saver:
+            app = graph.compile(checkpointer=saver)
+            for thread_id in ["t1", "t2", "t3"]:
+                await app.ainvoke({"n": 0}, {"configurable": {"thread_id": thread_id}})
+
+            result = await prune_checkpoints(
+                saver, max_age=3600, max_threads=2, keep_per_thread=1, compact_after=0,
+            )
+            async with saver.conn.execute(
+                "SELECT thread_id, COUNT(*) FROM checkpoints GROUP BY thread_id"
+            ) as cursor:
+                counts = dict(await cursor.fetchall())
+            state = await app.aget_state({"configurable": {"thread_id": "t3"}})
+            return result, counts, state.values
+
+    result, counts, values = asyncio.run(run())
+    assert result["deleted_threads"] == 1
+    assert counts == {"t2": 1, "t3": 1}       # 가장 오래된 t1 삭제, 나머지는 최신만 유지
+    assert values == {"n": 2}
+
+
+def test_blob_prune_keeps_blobs_referenced_by_checkpoints(tmp_path):
+    """오래된 블롭이라도 남은 체크포인트가 참조하면 유지하고, 참조가 없는 블롭만 삭제하는지 확인"""
+    import asyncio
+    import os
+    from typing import TypedDict
+    from langgraph.graph import StateGraph, START, END
+    from app.checkpoint import open_sqlite_checkpointer, prune_checkpoints, referenced_blobs
+    from app.services import blobs
+
+    store = blobs.BlobStore(str(tmp_path / "blobs"))
+    kept = store.put("세션 본문 " * 200)
+    orphan = store.put("삭제된 세션 본문 " * 200)
+    for handle in (kept, orphan):
+        os.utime(store._path(handle[len(blobs.HANDLE_PREFIX):]), (0, 0))    # 둘 다 오래 전에 저장
+
+    class S(TypedDict):
+        body: str
+
+    graph = StateGraph(S)
+    graph.add_node("write", lambda s: {"body": kept})
+    graph.add_edge(START, "write")
+    graph.add_edge("write", END)
+
+    async def run():
+        async with open_sqlite_checkpointer(str(tmp_path / "cp.sqlite")) as saver:
+            app = graph.compile(checkpointer=saver)
+            await app.ainvoke({"body": ""}, {"configurable": {"thread_id": "t1"}})
+            await prune_checkpoints(saver, max_age=3600, max_threads=10, keep_per_thread=1, compact_after=0)
+            return await referenced_blobs(saver)
+
+    referenced = asyncio.run(run())
+    assert referenced == {kept[len(blobs.HANDLE_PREFIX):]}
+    assert store.prune(referenced, grace=3600) == 1
+    assert os.path.exists(store._path(kept[len(blobs.HANDLE_PREFIX):]))
+    assert not os.path.exists(store._path(orphan[len(blobs.HANDLE_PREFIX):]))
+
+
+def test_blob_mode_keeps_handles_in_state(monkeypatch, tmp_path, fake_llm):
+    """블롭 모드에서 State에는 핸들만 남고, 수정·렌더링은 원문 기준으로 동작하는지 확인"""
+    import asyncio
+    import os
+    import threading
+    import time
+    from app import main
+    from app.config import settings
+    from app.document import render_markdown
+    from app.nodes import revise
+    from app.services import blobs
+    from app.state import merge_sections
+
+    fake_llm(lambda prompt: "## B\n" + "수정됨" * 300)
+
+    store = blobs.BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blobs, "blob_store", store)
+    monkeypatch.setattr(settings, "state_blob_mode", True)
+
+    long_a = "## A\n" + "가" * 2000
+    handle = blobs.store_text(long_a)
+    assert blobs.is_handle(handle) and store.put(long_a) == handle      # 같은 내용은 같은 핸들
+    assert blobs.store_text("## C\n짧음") == "## C\n짧음"              # 작은 값은 그대로
+
+    state = {
+        "topic": "테스트", "outline": ["A", "B", "C"], "seo_keywords": ["k"], "critique": "보통",
+        "sections": [handle, "## B\n원본", "## C\n짧음"], "revision_count": 0,
+        "section_feedback": [{"index": 1, "feedback": "보강"}],
+    }
+    # 노드 안의 블롭 읽기·쓰기는 이벤트 루프(메인 스레드)가 아닌 스레드에서 실행
+    on_loop = []
+    for name in ("put", "get"):
+        def spy(*args, _original=getattr(store, name)):
+            on_loop.append(threading.current_thread() is threading.main_thread())
+            return _original(*args)
+        monkeypatch.setattr(store, name, spy)
+
+    result = asyncio.run(revise(state))
+    assert len(on_loop) == 2 and not any(on_loop)                       # A 본문 읽기 + B 수정본 저장
+    sections = merge_sections(state["sections"], result["sections"])
+    assert blobs.is_handle(sections[1]["body"]) and sections[1]["history"] == ["## B\n원본"]
+    assert blobs.resolve_state({"sections": sections})["sections"][1]["body"].startswith("## B\n수정됨")
+    response = asyncio.run(main._to_response("s1", {"topic": "테스트", "final_draft": handle}))
+    assert response.final_draft == long_a                               # API 응답에는 원문
+
+    markdown = render_markdown("테스트", sections)
+    assert markdown.startswith("# 테스트") and long_a in markdown and "수정됨" in markdown
+
+    # 재개한 세션이 읽기만 하는 블롭도 prune되지 않아야 함
+    path = store._path(handle[len(blobs.HANDLE_PREFIX):])
+    os.utime(path, (0, 0))
+    assert store.get(handle) == long_a
+    assert store.prune(set(), grace=3600) == 0
+    assert store.prune(set(), grace=3600, now=time.time() + 7200) == 2
+
+
+def test_instrument_records_span_and_prometheus_metrics(monkeypatch, fake_llm):
+    """노드 span에 실행 시간·LLM 호출·토큰이 기록되고 /metrics 포맷으로 내보내지는지 확인"""
+    import asyncio
+    from app import llm as registry
+    from app.metrics import MetricsRegistry, instrument
+    from app import metrics
+
+    fake_llm(lambda prompt: MagicMock(content="ok", usage_metadata={"input_tokens": 12, "output_tokens": 5}))
+    monkeypatch.setattr(metrics, "registry", MetricsRegistry(window=10))
+
+    async def node(state):
+        await registry.complete("a", temperature=0.7)
+        await registry.complete("b", temperature=0.7)
+        return {"logs": ["done"]}
+
+    result = asyncio.run(instrument("write", node)({}))
+    span = result["spans"][0]
+    assert span["node"] == "write"
+    assert span["llm_calls"] == 2
+    assert span["prompt_tokens"] == 24 and span["completion_tokens"] == 10
+    assert result["logs"] == ["done"]
+
+    text = metrics.registry.render()
+    assert 'velog_node_duration_seconds_count{node="write"} 1' in text
+    assert 'velog_node_latency_seconds{node="write",quantile="0.95"}' in text
+    assert 'velog_llm_calls_total{node="write"} 2' in text
+
+
 def test_writing_router_loops():
     """섹션이 남아있으면 write_more 반환하는지 확인"""
     from app.graph import writing_router
@@ -67,6 +691,554 @@ def test_quality_router_max_revision():
     assert quality_router(state) == "publish"
 
 
+def test_parallel_write_graph_registers_fan_out():
+    """병렬 작성 모드에서 write_section 노드가 등록되는지 확인"""
+    from app.graph import build_graph
+    graph = build_graph(parallel_write=True)
+    assert "write_section" in graph.nodes
+    assert "write" in graph.nodes
+
+
+def test_parallel_sections_join_in_outline_order(fake_llm):
+    """섹션이 완료 순서와 무관하게 목차 순서의 섹션 레코드로 저장되는지 확인"""
+    import asyncio
+    from langgraph.graph import StateGraph, START, END
+    from app.state import BlogState
+    from app.nodes import n4_write
+
+    async def respond(prompt):
+        index = "ABC".index(prompt.split("**")[1])
+        await asyncio.sleep(0.05 * (3 - index))     # 뒤 섹션이 먼저 끝나도록
+        return f"## 섹션{index + 1}"
+
+    fake_llm(respond)
+
+    graph = StateGraph(BlogState)
+    graph.add_node("write_section", n4_write.write_section)
+    graph.add_node("write", n4_write.write)
+    graph.add_conditional_edges(START, n4_write.fan_out_sections, ["write_section", "write"])
+    graph.add_edge("write_section", "write")
+    graph.add_edge("write", END)
+
+    result = asyncio.run(graph.compile().ainvoke({
+        "topic": "테스트", "outline": ["A", "B", "C"], "sections": [], "logs": [],
+    }))
+    assert [s["body"] for s in result["sections"]] == ["## 섹션1", "## 섹션2", "## 섹션3"]
+    assert [s["heading"] for s in result["sections"]] == ["A", "B", "C"]
+    assert all(s["version"] == 1 and s["updated_by"] == "write_section" for s in result["sections"])
+
+
+def test_revise_rewrites_only_flagged_sections(fake_llm):
+    """critique가 지적한 섹션 레코드만 갱신하고, 렌더링·섹션 diff에 반영되는지 확인"""
+    import asyncio
+    import json
+    from app.document import render_markdown, section_diffs
+    from app.nodes import critique, revise
+    from app.state import merge_sections
+
+    def respond(prompt):
+        if '"score"' in prompt:
+            return json.dumps({
+                "score": 5, "improvements": ["예시 보강"], "summary": "보통",
+                "sections": [{"section": 2, "feedback": "코드 예시 추가"}, {"section": 9, "feedback": "범위 밖"}],
+            })
+        return "## B\n수정됨"
+
+    prompts = fake_llm(respond)
+
+    long_section = "## A\n" + "가" * 5000
+    state = {
+        "topic": "테스트", "outline": ["A", "B", "C"], "seo_keywords": ["k"],
+        "sections": [long_section, "## B\n원본", "## C\n원본"], "revision_count": 0,
+    }
+    state.update(asyncio.run(critique(state)))
+    assert state["section_feedback"] == [{"index": 1, "feedback": "코드 예시 추가"}]
+
+    result = asyncio.run(revise(state))
+    assert result["sections"] == [{
+        "index": 1, "heading": "B", "body": "## B\n수정됨", "updated_by": "revise", "feedback": "코드 예시 추가",
+    }]
+    assert len(prompts) == 2 and long_section not in prompts[1]   # 지적된 섹션만 전송
+    assert result["revision_count"] == 1
+
+    sections = merge_sections(state["sections"], result["sections"])
+    markdown = render_markdown("테스트", sections, references=["https://a.dev"])
+    assert long_section in markdown
+    assert markdown.index("수정됨") < markdown.index("## C\n원본") < markdown.index("https://a.dev")
+
+    diffs = section_diffs(sections)
+    assert diffs[1]["version"] == 2 and "-원본" in diffs[1]["diff"] and "+수정됨" in diffs[1]["diff"]
+    assert "diff" not in diffs[2]
+
+    # 다시 수정해도 history에는 직전 본문 하나만 남음 (체크포인트 크기 유지)
+    again = merge_sections(sections, [{"index": 1, "heading": "B", "body": "## B\n재수정", "updated_by": "revise"}])
+    assert again[1]["version"] == 3 and again[1]["history"] == ["## B\n수정됨"]
+
+
+def test_sectioned_critique_scores_every_section(monkeypatch, fake_llm):
+    """sectioned 모드는 모든 섹션을 동시에 채점하고 길이 가중 점수로 합치는지 확인"""
+    import asyncio
+    import json
+    from app.config import settings
+    from app.nodes import critique
+
+    running, peak = 0, 0
+
+    async def respond(prompt):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        score = 4 if "약한 섹션" in prompt else 9
+        return json.dumps({"score": score, "feedback": "보강 필요" if score < 7 else ""})
+
+    fake_llm(respond)
+    monkeypatch.setattr(settings, "critique_mode", "sectioned")
+    monkeypatch.setattr(settings, "critique_concurrency", 2)
+
+    sections = ["## 강한 섹션\n" + "가" * 3000 for _ in range(3)] + ["## 약한 섹션\n짧음"]
+    result = asyncio.run(critique({"topic": "t", "outline": list("ABCD"), "sections": sections}))
+
+    assert peak == 2
+    assert result["quality_score"] == 9                   # 짧은 약한 섹션은 가중치가 작음
+    assert result["section_feedback"] == [{"index": 3, "feedback": "보강 필요"}]
+    assert "[4] 4점" in result["critique"]
+
+    # single 모드라도 초안이 CRITIQUE_MAX_CHARS보다 길면 섹션별로 채점 (프롬프트 크기 상한)
+    monkeypatch.setattr(settings, "critique_mode", "single")
+    monkeypatch.setattr(settings, "critique_max_chars", 5000)
+    fallback = asyncio.run(critique({"topic": "t", "outline": list("ABCD"), "sections": sections}))
+    assert fallback["critique"] == result["critique"]
+
+
+def test_critique_gate_scores_locally_before_llm(monkeypatch, fake_llm):
+    """로컬 게이트: 확실히 부족하면 LLM 없이 revise 피드백, 확실히 괜찮으면 생략, 그 사이는 점수 합산"""
+    import asyncio
+    import json
+    from app.config import settings
+    from app.graph import quality_router
+    from app.nodes import critique
+    from app.quality import heuristic_check
+
+    calls = fake_llm(lambda prompt: json.dumps({
+        "score": 9, "improvements": [], "summary": "좋음",
+        "sections": [{"section": 1, "feedback": "도입 훅 강화"}],
+    }))
+    monkeypatch.setattr(settings, "critique_gate", True)
+    monkeypatch.setattr(settings, "critique_mode", "single")
+
+    good = "## 본문\n" + "LangGraph 설명 " * 40 + "\n```python\nprint(1)\n```"
+    gate = heuristic_check(["짧은 본문", good, "## 맺음말\n짧음"], ["LangGraph", "에이전트"])
+    assert gate["score"] == 10 - 1 - 2 - 1          # 헤딩 1, 짧은 섹션 2, 키워드 1
+    assert [f["index"] for f in gate["section_feedback"]] == [0, 2]
+    assert "에이전트" in gate["section_feedback"][0]["feedback"]
+
+    base = {"topic": "t", "seo_keywords": ["LangGraph"], "revision_count": 0}
+
+    # 1) 확실히 부족 → LLM 호출 없이 섹션 피드백과 함께 revise
+    bad = asyncio.run(critique({**base, "sections": ["짧음", "짧음", "짧음"]}))
+    assert calls == [] and bad["quality_score"] < settings.gate_fail_score
+    assert len(bad["section_feedback"]) == 3 and quality_router({**base, **bad}) == "revise"
+
+    # 2) 규칙을 모두 통과 → LLM 검토 생략
+    passed = asyncio.run(critique({**base, "sections": [good, good]}))
+    assert calls == [] and passed["quality_score"] == 10 and quality_router({**base, **passed}) == "publish"
+
+    # 3) 그 사이 → LLM 점수(9)와 로컬 점수(8, 코드 블록 없음)를 합산, 피드백도 합침
+    no_code = good.split("\n```")[0]
+    mixed = asyncio.run(critique({**base, "sections": [no_code, no_code, no_code]}))
+    assert len(calls) == 1
+    assert mixed["quality_score"] == round(0.7 * 9 + 0.3 * 8)
+    assert [f["index"] for f in mixed["section_feedback"]] == [0, 1]
+    assert "코드 블록" in mixed["section_feedback"][1]["feedback"]
+
+
+def test_job_queue_priority_and_backpressure():
+    """스케줄러 작업이 먼저 실행되고, 대기열이 가득 차면 QueueFull이 나는지 확인"""
+    import asyncio
+    from app.jobs import JobQueue, PRIORITY_ADHOC, PRIORITY_SCHEDULER
+
+    order = []
+
+    async def runner(job):
+        order.append(job.topic)
+        return {"topic": job.topic}
+
+    async def run():
+        queue = JobQueue(runner, workers=1, max_size=2)
+        adhoc = await queue.submit(topic="adhoc", priority=PRIORITY_ADHOC)
+        daily = await queue.submit(topic="daily", priority=PRIORITY_SCHEDULER)
+        with pytest.raises(asyncio.QueueFull):
+            await queue.submit(topic="overflow")
+
+        queue.start()
+        await queue.wait(adhoc)
+        await queue.stop()
+        events = [e async for e in queue.watch(daily)]
+        return adhoc, daily, events
+
+    adhoc, daily, events = asyncio.run(run())
+    assert order == ["daily", "adhoc"]
+    assert adhoc.status == "done" and adhoc.result == {"topic": "adhoc"}
+    assert daily.status == "done"
+    assert events == []
+
+
+def test_resume_rejects_session_with_active_job(monkeypatch):
+    """대기·실행 중인 세션은 /resume이 새 작업을 만들지 않고 409와 기존 작업을 돌려주는지 확인"""
+    import asyncio
+    from fastapi import HTTPException
+    from app import main
+    from app.jobs import JobQueue
+
+    async def run():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def runner(job):
+            started.set()
+            await release.wait()
+            return {}
+
+        queue = JobQueue(runner, workers=1, max_size=5)
+        monkeypatch.setattr(main, "job_queue", queue)
+        job = await queue.submit(session_id="s1")
+        assert queue.active("s1") is job                    # 대기 중
+
+        queue.start()
+        await started.wait()
+        with pytest.raises(HTTPException) as exc:           # 실행 중
+            await main.resume("s1")
+        assert exc.value.status_code == 409 and exc.value.detail["job_id"] == job.id
+        assert queue.pending == 0
+
+        release.set()
+        await queue.wait(job)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(run())
+    assert queue.active("s1") is None
+
+
+def test_submit_batch_collects_rss_once(monkeypatch):
+    """배치 생성은 RSS를 한 번 수집하고, 겹치지 않는 주제마다 작업을 제출하는지 확인"""
+    import asyncio
+    import json
+    from app import main
+    from app.jobs import JobQueue
+
+    collects, prompts, states = [], [], []
+
+    async def fake_gather():
+        collects.append(1)
+        return [{"source": "HN", "title": f"뉴스{i}", "link": "", "summary": "", "published": ""} for i in range(5)], []
+
+    async def fake_complete(prompt, temperature, **kwargs):
+        prompts.append(prompt)
+        return json.dumps({"topics": [
+            {"topic": "주제 A", "reason": "이유 A"},
+            {"topic": "주제 a", "reason": "중복"},
+            {"topic": "주제 B", "reason": "이유 B"},
+        ]}, ensure_ascii=False)
+
+    async def runner(job):
+        states.append({"topic": job.topic, "topic_reason": job.topic_reason})
+        return {}
+
+    from app.nodes import n1_collect
+    monkeypatch.setattr(main, "gather_rss_items", fake_gather)
+    monkeypatch.setattr(n1_collect, "complete", fake_complete)
+
+    async def run():
+        queue = JobQueue(runner, workers=2, max_size=10)
+        monkeypatch.setattr(main, "job_queue", queue)
+        jobs = await main.submit_batch(3)
+        queue.start()
+        for job in jobs:
+            await queue.wait(job)
+        await queue.stop()
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert len(collects) == 1 and len(prompts) == 1
+    assert "3개" in prompts[0]
+    assert [job.topic for job in jobs] == ["주제 A", "주제 B"]
+    assert sorted((s["topic"], s["topic_reason"]) for s in states) == [("주제 A", "이유 A"), ("주제 B", "이유 B")]
+
+
+def test_select_topics_skips_malformed_candidates(fake_llm):
+    """dict가 아닌 후보는 건너뛰고, 쓸 수 있는 주제가 없으면 상위 아이템 제목으로 채우는지 확인"""
+    import asyncio
+    import json
+    from app.nodes.n1_collect import select_topics
+
+    items = [{"source": "s", "title": f"Story {i}", "link": f"https://example.com/{i}"} for i in range(3)]
+    replies = iter([
+        json.dumps({"topics": ["a", {"topic": "주제 B", "reason": "이유", "source_index": 2}, None]}),
+        json.dumps({"topics": ["a", "b"]}),
+    ])
+    fake_llm(lambda prompt: next(replies))
+
+    mixed = asyncio.run(select_topics(items, 2))
+    assert [t["topic"] for t in mixed] == ["주제 B"] and mixed[0]["source"]["title"] == "Story 1"
+
+    fallback = asyncio.run(select_topics(items, 2))
+    assert [t["topic"] for t in fallback] == ["Story 0", "Story 1"]
+
+
+def test_run_pipeline_resumes_from_last_checkpoint(monkeypatch):
+    """늦은 노드가 실패하면 앞 노드는 다시 실행하지 않고 실패 노드부터 재개하는지 확인"""
+    import asyncio
+    from typing import TypedDict, Annotated
+    import operator
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.checkpoint.memory import MemorySaver
+    from app import main
+    from app.jobs import Job
+
+    calls = {"research": 0, "publish": 0}
+
+    class S(TypedDict):
+        logs: Annotated[list, operator.add]
+
+    async def research_node(state):
+        calls["research"] += 1
+        return {"logs": ["research"]}
+
+    async def publish_node(state):
+        calls["publish"] += 1
+        if calls["publish"] == 1:
+            raise RuntimeError("network blip")
+        return {"logs": ["publish"]}
+
+    graph = StateGraph(S)
+    graph.add_node("research", research_node)
+    graph.add_node("publish", publish_node)
+    graph.add_edge(START, "research")
+    graph.add_edge("research", "publish")
+    graph.add_edge("publish", END)
+
+    monkeypatch.setattr(main, "agent_app", graph.compile(checkpointer=MemorySaver()))
+    monkeypatch.setattr(main, "get_initial_state", lambda topic=None: {"logs": []})
+    monkeypatch.setattr(main.settings, "resume_backoff", 0)
+
+    job = Job(id="j1", session_id="s1", topic=None, priority=0, max_retries=1)
+    result = asyncio.run(main.run_pipeline(job))
+
+    assert calls == {"research": 1, "publish": 2}
+    assert result["logs"] == ["research", "publish"]
+    assert [e["event"] for e in job.events] == ["node_complete", "resume", "node_complete"]
+    assert job.events[1]["next"] == ["publish"]
+
+
+def test_run_pipeline_passes_source_item_without_topic_reason(monkeypatch):
+    """선정 이유가 없는 작업도 원본 RSS 아이템은 그래프 입력으로 전달되는지 확인"""
+    import asyncio
+    from typing import Optional, TypedDict
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.checkpoint.memory import MemorySaver
+    from app import main
+    from app.jobs import Job
+
+    class S(TypedDict, total=False):
+        topic_reason: Optional[str]
+        source_item: Optional[dict]
+        seen: dict
+
+    async def node(state):
+        return {"seen": {"topic_reason": state.get("topic_reason"), "source_item": state.get("source_item")}}
+
+    graph = StateGraph(S)
+    graph.add_node("collect", node)
+    graph.add_edge(START, "collect")
+    graph.add_edge("collect", END)
+    monkeypatch.setattr(main, "agent_app", graph.compile(checkpointer=MemorySaver()))
+    monkeypatch.setattr(main, "get_initial_state", lambda topic=None: {})
+
+    item = {"title": "Story", "url": "https://example.com/story"}
+    job = Job(id="j1", session_id="s1", topic="주제", priority=0, source_item=item)
+    result = asyncio.run(main.run_pipeline(job))
+    assert result["seen"] == {"topic_reason": None, "source_item": item}
+
+
+def test_run_pipeline_streams_section_tokens(monkeypatch):
+    """write 노드의 LLM 토큰이 section_index와 함께 구독자에게만 전달되는지 확인"""
+    import asyncio
+    from typing import TypedDict
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.checkpoint.memory import MemorySaver
+    from app import main, llm as registry
+    from app.jobs import JobQueue
+
+    fake = GenericFakeChatModel(messages=iter([AIMessage(content="## 도입 본문 내용")]))
+    monkeypatch.setattr(registry, "get_llm", lambda temperature, model=None: fake)
+
+    class S(TypedDict):
+        draft: str
+
+    async def write_node(state):
+        text = await registry.complete("섹션", temperature=0.7, metadata={"section_index": 0})
+        return {"draft": text}
+
+    graph = StateGraph(S)
+    graph.add_node("write", write_node)
+    graph.add_edge(START, "write")
+    graph.add_edge("write", END)
+    monkeypatch.setattr(main, "agent_app", graph.compile(checkpointer=MemorySaver()))
+    monkeypatch.setattr(main, "get_initial_state", lambda topic=None: {"draft": ""})
+
+    async def run():
+        queue = JobQueue(main.run_pipeline, workers=1, max_size=1)
+        job = await queue.submit(topic="t")
+        received = []
+
+        async def consume():
+            async for event in queue.watch(job):
+                received.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        queue.start()
+        await consumer
+        await queue.stop()
+        return job, received
+
+    job, received = asyncio.run(run())
+    tokens = [e for e in received if e["event"] == "token"]
+    assert "".join(t["content"] for t in tokens) == "## 도입 본문 내용"
+    assert all(t["section_index"] == 0 and t["node"] == "write" for t in tokens)
+    assert [e["event"] for e in job.events] == ["node_complete"]
+
+
+def test_fetch_rss_items_async_drops_late_feeds():
+    """마감 시간을 넘긴 피드는 제외되고 이름이 보고되는지 확인"""
+    import asyncio
+    import httpx
+    from app.services.rss import fetch_rss_items_async
+
+    rss = """<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>Fast Item</title><link>https://example.com/fast</link></item>
+</channel></rss>"""
+
+    async def handler(request):
+        if "slow" in str(request.url):
+            await asyncio.sleep(2)
+        return httpx.Response(200, text=rss)
+
+    feeds = [
+        {"name": "Fast", "url": "https://example.com/fast.xml"},
+        {"name": "Slow", "url": "https://example.com/slow.xml"},
+    ]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_rss_items_async(
+                max_per_feed=5, deadline=0.3, feed_timeout=5, feeds=feeds, client=client,
+            )
+
+    items, late_feeds = asyncio.run(run())
+    assert [item["title"] for item in items] == ["Fast Item"]
+    assert late_feeds == ["Slow"]
+
+
+def test_feed_cache_reuses_items_on_304(tmp_path):
+    """ETag가 같으면 304 응답에서 캐시된 파싱 결과를 재사용하는지 확인"""
+    import asyncio
+    import httpx
+    from app.services.feed_cache import FeedCache
+    from app.services.rss import fetch_rss_items_async
+
+    rss = """<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>Cached Item</title><link>https://example.com/a</link></item>
+</channel></rss>"""
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=rss, headers={"ETag": '"v1"'})
+
+    feeds = [{"name": "Feed", "url": "https://example.com/feed.xml"}]
+    cache_path = str(tmp_path / "feeds.json")
+
+    async def run(cache):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            items, _ = await fetch_rss_items_async(feeds=feeds, client=client, cache=cache)
+            return items
+
+    first = asyncio.run(run(FeedCache(cache_path)))
+    second = asyncio.run(run(FeedCache(cache_path)))   # 디스크에서 다시 로드
+    assert seen_headers == [None, '"v1"']
+    assert first == second
+    assert second[0]["title"] == "Cached Item"
+
+
+def test_offline_benchmark_runs_full_pipeline():
+    """벤치마크 하니스는 네트워크 없이 전체 그래프를 돌리고, 끝나면 대역을 원래대로 돌려놓음"""
+    import asyncio
+    from app import llm as llm_registry
+    from app.services import rss, search
+    from benchmarks.run_pipeline import run_benchmark
+
+    feed_cache, factory = rss.feed_cache, llm_registry._factory
+    report = asyncio.run(run_benchmark(sessions=2, parallel_write=True, critique_score=5))
+
+    assert report["sessions"] == 2
+    assert report["published"] == 2
+    assert report["throughput"] > 0
+    assert report["end_to_end"]["max"] >= report["end_to_end"]["p50"]
+    assert {"collect", "research", "plan", "write_section", "critique", "revise", "publish"} <= set(report["nodes"])
+    assert report["nodes"]["revise"]["llm_calls"] == 2 * 2     # 점수 5 → 최대 수정 횟수까지 revise
+    assert rss.feed_cache is feed_cache and llm_registry._factory is factory
+    assert search._search_tool is None
+
+
+def test_speculative_plan_overlaps_research_summary():
+    """추측 실행 모드에서 plan이 요약 LLM 호출과 겹쳐 시작되고, write는 요약을 받아 작성하는지 확인"""
+    import asyncio
+    import uuid
+    from langgraph.checkpoint.memory import MemorySaver
+    from app import llm as llm_registry
+    from app.graph import build_graph
+    from app.main import get_initial_state
+    from benchmarks.fakes import FakeChatModel
+    from benchmarks.run_pipeline import offline_environment
+
+    events = []
+
+    class TrackingModel(FakeChatModel):
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            prompt = "\n".join(str(m.content) for m in messages)
+            kind = "summary" if "요약 (500자 이내)" in prompt else "plan" if '"outline"' in prompt else "other"
+            events.append((kind, "start", prompt))
+            result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+            events.append((kind, "end", prompt))
+            return result
+
+    graph = build_graph(parallel_write=False, speculative=True)
+    assert {"research", "summarize", "plan", "reconcile"} <= set(graph.nodes)
+    agent_app = graph.compile(checkpointer=MemorySaver())
+
+    with offline_environment():
+        llm_registry.set_llm_factory(lambda model: TrackingModel(latency=0.05))
+        result = asyncio.run(agent_app.ainvoke(
+            get_initial_state("LangGraph 에이전트"),
+            {"configurable": {"thread_id": str(uuid.uuid4())}},
+        ))
+
+    order = [(kind, phase) for kind, phase, _ in events if kind != "other"]
+    assert order.index(("plan", "start")) < order.index(("summary", "end"))     # 요약을 기다리지 않음
+    plan_prompt = next(p for kind, phase, p in events if kind == "plan")
+    assert "검색 결과 본문" in plan_prompt                                       # 원본 검색 결과로 기획
+    section_prompts = [p for _, phase, p in events if phase == "start" and "지금 작성할 섹션" in p]
+    assert section_prompts and all("LangGraph는 LLM 워크플로우" in p for p in section_prompts)
+    assert result["is_published"] and any("[Reconcile]" in log for log in result["logs"])
+
+
 # ── Integration Tests (Ollama 필요) ──────────────────────────────────────────
 
 @pytest.mark.integration
@@ -75,6 +1247,7 @@ def test_full_pipeline_with_topic():
     특정 주제로 전체 파이프라인 실행 테스트
     실행: pytest tests/ -v -m integration
     """
+    import asyncio
     import uuid
     from app.graph import agent_app
     from app.main import get_initial_state
@@ -82,10 +1255,10 @@ def test_full_pipeline_with_topic():
     session_id = str(uuid.uuid4())
     config = {"configurable": {"thread_id": session_id}}
 
-    result = agent_app.invoke(
+    result = asyncio.run(agent_app.ainvoke(
         get_initial_state(topic="FastAPI 비동기 프로그래밍"),
         config=config,
-    )
+    ))
 
     assert result["topic"] != ""
     assert result["outline"] and len(result["outline"]) > 0